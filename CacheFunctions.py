@@ -43,8 +43,10 @@ from PySide.QtWidgets import (
 from PySide.QtCore import Qt, SIGNAL, Signal, QObject, QThread, QSize, QEvent
 import sys
 import json
+import time
 from datetime import datetime
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 import Standard_Functions_Ribbon as StandardFunctions
 from Standard_Functions_Ribbon import CommandInfoCorrections
 import Standard_Functions_Ribbon as StandardFunctions
@@ -52,6 +54,8 @@ from Standard_Functions_Ribbon import CommandInfoCorrections
 import Parameters_Ribbon
 from Parameters_Ribbon import Parameters
 import Serialize_Ribbon
+import DataFile_Ribbon
+import IconStore_Ribbon
 import webbrowser
 import StyleMapping_Ribbon
 import requests
@@ -107,7 +111,14 @@ List_WorkBenchIcons = []
 # Create a tomporary list for newly added dropdown buttons
 newDDBList = []
 
-def CreateCache(RestartFreeCAD=False):
+def CreateCache(RestartFreeCAD=False, Incremental=False):
+    """Creates the data file with all workbenches, toolbars, commands and their icons.
+
+    Args:
+        RestartFreeCAD (bool, optional): Ask to restart FreeCAD afterwards. Defaults to False.
+        Incremental (bool, optional): Rescan only workbenches that are new or whose fingerprint changed.
+            The other workbenches are taken from the existing data file. Defaults to False.
+    """
     # Create a progressbar
     progressBar = QProgressBar(minimum=0, value=0)
     progressBar.setWindowFlags(
@@ -132,7 +143,42 @@ def CreateCache(RestartFreeCAD=False):
     progressBar.setMaximum(5)
     progressBar.setValue(0)
 
+    # Keep the duration of each phase for the debug output
+    PhaseTimes = {}
+    PhaseStart = time.perf_counter()
+
+    # get the system language
+    FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/General")
+    FCLanguage = FreeCAD_preferences.GetString("Language")
+
+    # For an incremental update, get the existing data and the workbenches that must be rescanned.
+    # The workbenches in "UnchangedWorkbenches" are taken from the existing data file.
+    OldData = None
+    if Incremental is True:
+        OldData = ReturnDataForUpdate()
+    OldFingerprints = {}
+    UnchangedWorkbenches = set()
+    if OldData is not None:
+        OldFingerprints = OldData.get("Fingerprints", {})
+        for WorkBenchName in Gui.listWorkbenches().keys():
+            if WorkBenchName in OldFingerprints and IsFingerprintChanged(
+                OldFingerprints[WorkBenchName],
+                ReturnWorkbenchFingerprint(WorkBenchName, FCLanguage),
+            ) is False:
+                UnchangedWorkbenches.add(WorkBenchName)
+
     # Load the workbenches
+    WorkbenchesToLoad = None
+    if OldData is not None:
+        WorkbenchesToLoad = [
+            WorkBenchName
+            for WorkBenchName in Gui.listWorkbenches().keys()
+            if WorkBenchName not in UnchangedWorkbenches
+        ]
+        print(
+            translate("FreeCAD Ribbon", "Ribbon UI: Workbenches to rescan: ")
+            + str(len(WorkbenchesToLoad))
+        )
     loadAllWorkbenches(
         AutoHide=False,
         FinishMessage=translate(
@@ -140,16 +186,34 @@ def CreateCache(RestartFreeCAD=False):
         ),
         progressBar=progressBar,
         maximum=progressBar.maximum(),
+        Workbenches=WorkbenchesToLoad,
     )
+    PhaseTimes["Load workbenches"] = time.perf_counter() - PhaseStart
+    PhaseStart = time.perf_counter()
+
+    # Create lookups for the data of the unchanged workbenches
+    OldWorkbenches = {}
+    OldToolbars = {}
+    OldCommands = []
+    if OldData is not None:
+        for WorkBenchItem in OldData["List_Workbenches"]:
+            OldWorkbenches[WorkBenchItem[0]] = WorkBenchItem
+        for ToolbarItem in OldData["StringList_Toolbars"]:
+            # Custom toolbars have a list of commands at this position and are always recreated
+            if isinstance(ToolbarItem[2], str):
+                OldToolbars.setdefault(ToolbarItem[2], []).append(ToolbarItem)
+        for CommandItem in OldData["List_Commands"]:
+            # The standard commands belong to FreeCAD itself. The fingerprint of every workbench contains
+            # the FreeCAD version and the language, so they are unchanged if any workbench is unchanged
+            if CommandItem[3] in UnchangedWorkbenches or (
+                CommandItem[3] == "Standard" and len(UnchangedWorkbenches) > 0
+            ):
+                OldCommands.append(CommandItem)
 
     # clear the lists first
     StringList_Toolbars.clear()
     List_Commands.clear()
 
-    # get the system language
-    FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/General")
-    FCLanguage = FreeCAD_preferences.GetString("Language")
-
     # --- Workbenches ----------------------------------------------------------------------------------------------
     #
     # Create a list of all workbenches with their icon
@@ -160,6 +224,9 @@ def CreateCache(RestartFreeCAD=False):
     for WorkBenchName in Gui.listWorkbenches().keys():
         try:
             if str(WorkBenchName) != "" or WorkBenchName is not None:
+                if WorkBenchName in UnchangedWorkbenches and WorkBenchName in OldWorkbenches:
+                    List_Workbenches.append(OldWorkbenches[WorkBenchName])
+                    continue
                 if str(WorkBenchName) != "NoneWorkbench":
                     # Gui.activateWorkbench(WorkBenchName)
                     WorkBench = Gui.getWorkbench(WorkBenchName)
@@ -188,6 +255,9 @@ def CreateCache(RestartFreeCAD=False):
         except Exception:
             pass
 
+    PhaseTimes["Workbenches"] = time.perf_counter() - PhaseStart
+    PhaseStart = time.perf_counter()
+
     # --- Toolbars ----------------------------------------------------------------------------------------------
     #
     # Go through the list of workbenches
@@ -202,6 +272,9 @@ def CreateCache(RestartFreeCAD=False):
             and WorkBench[0] != ""
             and WorkBench[0] is not None
         ):
+            if WorkBench[0] in UnchangedWorkbenches:
+                StringList_Toolbars.extend(OldToolbars.get(WorkBench[0], []))
+                continue
             # Gui.activateWorkbench(WorkBench[0])
             wbToolbars = Gui.getWorkbench(WorkBench[0]).listToolbars()
             # Go through the toolbars
@@ -221,6 +294,9 @@ def CreateCache(RestartFreeCAD=False):
     for Customtoolbar in CustomToolbars:
         StringList_Toolbars.append(Customtoolbar)
 
+    PhaseTimes["Toolbars"] = time.perf_counter() - PhaseStart
+    PhaseStart = time.perf_counter()
+
     # --- Commands ----------------------------------------------------------------------------------------------
     #
     # Create a list of all commands with their icon
@@ -228,9 +304,17 @@ def CreateCache(RestartFreeCAD=False):
     progressBar.setValue(progressBar.value() + 1)
     #
     List_Commands.clear()
-    # Create a list of command names
+    # The command info is requested several times per command. Get it only once in this run.
+    CommandInfoCache = {}
+    # Create a list of command names.
+    # "CommandNamesSet" and "CommandNamesIndex" are used to check fast if a command is already in the list
     CommandNames = []
+    CommandNamesSet = set()
+    CommandNamesIndex = set()
     for i in range(len(List_Workbenches)):
+        # The commands of unchanged workbenches are added from the existing data file below
+        if List_Workbenches[i][0] in UnchangedWorkbenches:
+            continue
         # Gui.activateWorkbench(List_Workbenches[i][0])
         WorkBench = Gui.getWorkbench(List_Workbenches[i][0])
         WorkBenchName = List_Workbenches[i][0]
@@ -247,63 +331,53 @@ def CreateCache(RestartFreeCAD=False):
                         Item = [CommandName, "Standard"]
                     else:
                         Item = [CommandName, WorkBenchName]
-                    IsInList = False
-                    for CommandNamesItem in CommandNames:
-                        if CommandNamesItem == Item:
-                            IsInList = True
-                            break
-                    if IsInList is False:
+                    if tuple(Item) not in CommandNamesSet:
                         CommandNames.append(Item)
-        # Add commands that are not in any toolbars
-        for commandNamesItem in Gui.listCommands():
-            CommandName_2 = GetCommand(commandNamesItem)          
-            if CommandName_2.lower().startswith("std_"):
-                inList = False
-                for CommandName in CommandNames:
-                    if CommandName[0] == CommandName_2:
-                        inList = True
-                
-                # Skip "Std_Workbench".
-                if commandNamesItem == "Std_Workbench":
-                    continue
-                
-                if inList is False:                    
-                    CommandNames.append([CommandName_2, "Standard"])
-            else:
-                inList = False
-                for CommandName in CommandNames:
-                    if CommandName[0] == commandNamesItem:
-                        inList = True
-                
-                if inList is False:
-                    WorkBench = ""
-                    for WorkBenchName in List_Workbenches:
-                        if CommandName_2.startswith(WorkBenchName[0]) or WorkBenchName[0].startswith(CommandName_2.split("_")[0]):
-                            WorkBench = WorkBenchName[0]
-                            break
-                    Icon = StandardFunctions.returnQiCons_Commands(CommandName_2)
-                    if Icon is not None or Icon.isNull() is False:
-                        CommandNames.append([CommandName_2, WorkBench])
+                        CommandNamesSet.add(tuple(Item))
+                        CommandNamesIndex.add(CommandName)
+
+    # Add commands that are not in any toolbars. This is done once, after the toolbars of all workbenches.
+    # Commands that are taken from the existing data file are skipped
+    OldCommandNames = set(CommandItem[0] for CommandItem in OldCommands)
+    for commandNamesItem in Gui.listCommands():
+        CommandName_2 = GetCommand(commandNamesItem)
+        if CommandName_2 in OldCommandNames:
+            continue
+        if CommandName_2.lower().startswith("std_"):
+            # Skip "Std_Workbench".
+            if commandNamesItem == "Std_Workbench":
+                continue
+
+            if CommandName_2 not in CommandNamesIndex:
+                CommandNames.append([CommandName_2, "Standard"])
+                CommandNamesSet.add((CommandName_2, "Standard"))
+                CommandNamesIndex.add(CommandName_2)
+        else:
+            if commandNamesItem not in CommandNamesIndex:
+                WorkBench = ""
+                for WorkBenchName in List_Workbenches:
+                    if CommandName_2.startswith(WorkBenchName[0]) or WorkBenchName[0].startswith(CommandName_2.split("_")[0]):
+                        WorkBench = WorkBenchName[0]
+                        break
+                Icon = StandardFunctions.returnQiCons_Commands(CommandName_2)
+                if Icon is not None or Icon.isNull() is False:
+                    CommandNames.append([CommandName_2, WorkBench])
+                    CommandNamesSet.add((CommandName_2, WorkBench))
+                    CommandNamesIndex.add(CommandName_2)
 
     # Go through the list
-    shadowList = []
+    shadowList = set()
     for CommandName in CommandNames:
         # get the command with this name
         command = Gui.Command.get(CommandName[0])
-        ChildCommands = returnDropDownCommands(CommandName[0])
         WorkBenchName = CommandName[1]
         if command is not None and WorkBenchName != "":
+            ChildCommands = returnDropDownCommands(CommandName[0], CommandInfoCache)
             # get the icon for this command
-            if CommandInfoCorrections(CommandName[0])["pixmap"] != "":
-                IconName = CommandInfoCorrections(CommandName[0])["pixmap"]
-            else:
-                IconName = ""
-            MenuName = CommandInfoCorrections(CommandName[0])["menuText"].replace(
-                "&", ""
-            )
-            MenuNameTranslated = CommandInfoCorrections(CommandName[0])[
-                "ActionText"
-            ].replace("&", "")
+            CommandInfo = ReturnCommandInfo(CommandName[0], CommandInfoCache)
+            IconName = CommandInfo["pixmap"]
+            MenuName = CommandInfo["menuText"].replace("&", "")
+            MenuNameTranslated = CommandInfo["ActionText"].replace("&", "")
             # Remove numbers from dropdown child commands
             if MenuName.split(" ")[0].isdigit() is True:
                 MenuName = MenuName.split(" ")[1]
@@ -325,7 +399,7 @@ def CreateCache(RestartFreeCAD=False):
                         MenuNameTranslated,
                     ]
                 )
-                shadowList.append(CommandName[0])
+                shadowList.add(CommandName[0])
             # Add children of the commands if there are any
             if len(ChildCommands) > 0:
                 for childCommand in ChildCommands:
@@ -339,7 +413,7 @@ def CreateCache(RestartFreeCAD=False):
                                 childCommand[3],
                             ]
                         )
-                        shadowList.append(childCommand[0])
+                        shadowList.add(childCommand[0])
 
     # add also custom commands
     Toolbars = List_ReturnCustomToolbars()
@@ -350,17 +424,10 @@ def CreateCache(RestartFreeCAD=False):
                 WorkBenchName = WorkBench[0]
                 for CustomCommand in Toolbar[2]:
                     if CustomCommand not in shadowList:
-                        command = Gui.Command.get(CustomCommand)
-                        if CommandInfoCorrections(CustomCommand)["pixmap"] != "":
-                            IconName = CommandInfoCorrections(CustomCommand)["pixmap"]
-                        else:
-                            IconName = ""
-                        MenuName = CommandInfoCorrections(CustomCommand)[
-                            "menuText"
-                        ].replace("&", "")
-                        MenuNameTranslated = CommandInfoCorrections(CustomCommand)[
-                            "ActionText"
-                        ].replace("&", "")
+                        CommandInfo = ReturnCommandInfo(CustomCommand, CommandInfoCache)
+                        IconName = CommandInfo["pixmap"]
+                        MenuName = CommandInfo["menuText"].replace("&", "")
+                        MenuNameTranslated = CommandInfo["ActionText"].replace("&", "")
                         List_Commands.append(
                             [
                                 CustomCommand,
@@ -370,27 +437,23 @@ def CreateCache(RestartFreeCAD=False):
                                 MenuNameTranslated,
                             ]
                         )
-                        shadowList.append(CustomCommand)
+                        shadowList.add(CustomCommand)
                         
     Toolbars = List_ReturnCustomToolbars_Global()
     for Toolbar in Toolbars:
         for CustomCommand in Toolbar[2]:
             if CustomCommand not in shadowList:
-                command = Gui.Command.get(CustomCommand)
-                if CommandInfoCorrections(CustomCommand)["pixmap"] != "":
-                    IconName = CommandInfoCorrections(CustomCommand)["pixmap"]
+                CommandInfo = ReturnCommandInfo(CustomCommand, CommandInfoCache)
+                if CommandInfo["pixmap"] != "":
+                    IconName = CommandInfo["pixmap"]
                 else:
                     IconName = None
-                MenuName = CommandInfoCorrections(CustomCommand)["menuText"].replace(
-                    "&", ""
-                )
-                MenuNameTranslated = CommandInfoCorrections(CustomCommand)[
-                    "ActionText"
-                ].replace("&", "")
+                MenuName = CommandInfo["menuText"].replace("&", "")
+                MenuNameTranslated = CommandInfo["ActionText"].replace("&", "")
                 List_Commands.append(
                     [CustomCommand, IconName, MenuName, Toolbar[1], MenuNameTranslated]
                 )
-                shadowList.append(CustomCommand)
+                shadowList.add(CustomCommand)
     # Add general commands
     if int(App.Version()[0]) > 0:
         ListCommands = [
@@ -406,39 +469,52 @@ def CreateCache(RestartFreeCAD=False):
         ]
         for CommandName in ListCommands:
             if CommandName not in shadowList:
-                command = Gui.Command.get(CommandName)
-                if CommandInfoCorrections(CommandName)["pixmap"] != "":
-                    IconName = CommandInfoCorrections(CommandName)["pixmap"]
-                else:
-                    IconName = ""
-                MenuName = CommandInfoCorrections(CommandName)["menuText"].replace(
-                    "&", ""
-                )
-                MenuNameTranslated = CommandInfoCorrections(CommandName)[
-                    "ActionText"
-                ].replace("&", "")
+                CommandInfo = ReturnCommandInfo(CommandName, CommandInfoCache)
+                IconName = CommandInfo["pixmap"]
+                MenuName = CommandInfo["menuText"].replace("&", "")
+                MenuNameTranslated = CommandInfo["ActionText"].replace("&", "")
                 List_Commands.append(
                     [CommandName, IconName, MenuName, "Standard", MenuNameTranslated]
                 )
-                shadowList.append(CommandName)
+                shadowList.add(CommandName)
+
+    # Add the commands of the unchanged workbenches
+    CachedCommands = set()
+    for CommandItem in OldCommands:
+        if CommandItem[0] not in shadowList:
+            List_Commands.append(CommandItem)
+            shadowList.add(CommandItem[0])
+            CachedCommands.add(CommandItem[0])
 
     # # re-activate the workbench that was stored.
     # Gui.activateWorkbench(ActiveWB)
 
+    PhaseTimes["Commands"] = time.perf_counter() - PhaseStart
+    PhaseStart = time.perf_counter()
+
     # --- Serialize Icons ------------------------------------------------------------------------------------------
     #
     progressBar.setFormat(translate("FreeCAD Ribbon", "Serialize icons"))
     progressBar.setValue(progressBar.value() + 1)
     #
-    WorkbenchIcon = []
+    # The pixmaps are rendered as QImages on the GUI thread first.
+    # Encoding them as PNG and hashing them is done in parallel, because QImage is thread-safe.
+    # Icons of unchanged workbenches and their commands are copied from the existing data file.
+    IconJobs = []
     for WorkBenchItem in List_Workbenches:
         WorkBenchName = WorkBenchItem[0]
+        if WorkBenchName in UnchangedWorkbenches and OldData.HasIcon("WorkBench_Icons", WorkBenchName):
+            IconJobs.append(
+                ["WorkBench_Icons", WorkBenchName, None, OldData.ReturnIconCopy("WorkBench_Icons", WorkBenchName)]
+            )
+            continue
         Icon = Gui.getIcon(WorkBenchItem[1])
         if Icon is not None and Icon.isNull() is False:
             try:
-                SerializedIcon = Serialize_Ribbon.serializeIcon(Icon)
-
-                WorkbenchIcon.append([WorkBenchName, SerializedIcon])
+                Images = Serialize_Ribbon.iconToImages(
+                    Icon, compact=Parameters.COMPACT_ICON_DATA
+                )
+                IconJobs.append(["WorkBench_Icons", WorkBenchName, Images, None])
                 # add the icons also to the deserialized list
                 List_WorkBenchIcons.append([WorkBenchName, Icon])
             except Exception as e:
@@ -447,15 +523,35 @@ def CreateCache(RestartFreeCAD=False):
                         f"{e.with_traceback(e.__traceback__)}", "Warning"
                     )
 
-    CommandIcons = []
+    # Flags per command icon (valid, thumbnail hash), so that the dialogs can filter without rendering icons.
+    # They are made from the icon that the dialogs show, which can also be an icon file of the addon.
+    # Dropdown buttons get the icon of their first command in the dialogs, so they are checked there.
+    # The flags of commands from the existing data file are reused
+    CommandIconFlags = {}
+    OldIconFlags = {}
+    if OldData is not None:
+        OldIconFlags = OldData.get("Command_IconFlags", {})
     for CommandItem in List_Commands:
         CommandName = CommandItem[0]
+        if CommandName.endswith("_ddb") is False:
+            if CommandName in CachedCommands and CommandName in OldIconFlags:
+                CommandIconFlags[CommandName] = OldIconFlags[CommandName]
+            else:
+                CommandIconFlags[CommandName] = Serialize_Ribbon.iconFlags(
+                    IconStore_Ribbon.ResolveCommandIcon(CommandName, CommandItem[1])
+                )
+        if CommandName in CachedCommands and OldData.HasIcon("Command_Icons", CommandName):
+            IconJobs.append(
+                ["Command_Icons", CommandName, None, OldData.ReturnIconCopy("Command_Icons", CommandName)]
+            )
+            continue
         Icon = StandardFunctions.returnQiCons_Commands(CommandName, CommandItem[1])
         if Icon is not None and Icon.isNull() is False:
             try:
-                SerializedIcon = Serialize_Ribbon.serializeIcon(Icon)
-
-                CommandIcons.append([CommandName, SerializedIcon])
+                Images = Serialize_Ribbon.iconToImages(
+                    Icon, compact=Parameters.COMPACT_ICON_DATA
+                )
+                IconJobs.append(["Command_Icons", CommandName, Images, None])
                 # add the icons also to the deserialized list
                 List_CommandIcons.append([CommandName, Icon])
             except Exception as e:
@@ -464,15 +560,54 @@ def CreateCache(RestartFreeCAD=False):
                         f"{e.with_traceback(e.__traceback__)}", "Warning"
                     )
 
+    WorkbenchIcon = []
+    CommandIcons = []
+    SerializedIcons = {"WorkBench_Icons": WorkbenchIcon, "Command_Icons": CommandIcons}
+    FormatText = translate("FreeCAD Ribbon", "Serialize icons")
+    # With atlases, the rendered images are packed directly. They are not encoded per icon
+    UseAtlases = Parameters.ICON_ATLAS_DATA is True
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as Pool:
+        Futures = [
+            Pool.submit(Serialize_Ribbon.imagesToPixmaps, IconJob[2])
+            if IconJob[3] is None and UseAtlases is False
+            else None
+            for IconJob in IconJobs
+        ]
+        # Collect the results in order and update the progress bar
+        for i, Future in enumerate(Futures):
+            try:
+                if IconJobs[i][3] is None and UseAtlases is True:
+                    SerializedIcons[IconJobs[i][0]].append(
+                        [IconJobs[i][1], Serialize_Ribbon.imagesToDict(IconJobs[i][2])]
+                    )
+                elif Future is None:
+                    SerializedIcons[IconJobs[i][0]].append([IconJobs[i][1], IconJobs[i][3]])
+                else:
+                    SerializedIcons[IconJobs[i][0]].append([IconJobs[i][1], Future.result()])
+            except Exception as e:
+                if Parameters.DEBUG_MODE is True:
+                    StandardFunctions.Print(
+                        f"{e.with_traceback(e.__traceback__)}", "Warning"
+                    )
+            if i % 50 == 0 or i == len(Futures) - 1:
+                progressBar.setFormat(f"{FormatText} ({i + 1}/{len(Futures)})")
+                Gui.updateGui()
+    # Pack the pixmaps in atlases, one image per icon size instead of one per icon.
+    # Icons copied from an old data file with atlases, get their own pixmaps again if atlases are not used
+    IconAtlases = []
+    if UseAtlases is True:
+        progressBar.setFormat(translate("FreeCAD Ribbon", "Pack icons"))
+        Gui.updateGui()
+        IconAtlases = Serialize_Ribbon.packAtlases(SerializedIcons)
+    elif OldData is not None and OldData.AtlasCount() > 0:
+        Serialize_Ribbon.unpackAtlases(SerializedIcons)
+    PhaseTimes["Icons"] = time.perf_counter() - PhaseStart
+    PhaseStart = time.perf_counter()
+
     # Write the lists to a data file
     progressBar.setFormat(translate("FreeCAD Ribbon", "Write data files"))
     progressBar.setValue(progressBar.value() + 1)
     #
-    # clear the data file. If not exists, create it
-    DataFile = os.path.join(ConfigDirectory, "RibbonDataFile.dat")
-    open(DataFile, "w").close()
-
-    # Open de data file, load it as json and then close it again
     Data = {}
     # Update the data
     Data["dataVersion"] = DataFileVersion
@@ -482,11 +617,26 @@ def CreateCache(RestartFreeCAD=False):
     Data["List_Commands"] = List_Commands
     Data["WorkBench_Icons"] = WorkbenchIcon
     Data["Command_Icons"] = CommandIcons
-    # Write to the data file
+    Data["Icon_Atlases"] = IconAtlases
+    Data["Command_IconFlags"] = CommandIconFlags
+    # Store the fingerprints for the next incremental update
+    Fingerprints = {}
+    for WorkBenchItem in List_Workbenches:
+        WorkBenchName = WorkBenchItem[0]
+        if WorkBenchName in UnchangedWorkbenches:
+            Fingerprints[WorkBenchName] = OldFingerprints[WorkBenchName]
+        else:
+            Fingerprints[WorkBenchName] = ReturnWorkbenchFingerprint(WorkBenchName, FCLanguage)
+    Data["Fingerprints"] = Fingerprints
+    # Write to the binary data file
     DataFile = os.path.join(ConfigDirectory, "RibbonDataFile.dat")
-    with open(DataFile, "w") as outfile:
-        json.dump(Data, outfile, indent=4)
-    outfile.close()
+    SavedBytes = DataFile_Ribbon.WriteDataFile(DataFile, Data)
+    if Parameters.DEBUG_MODE is True:
+        StandardFunctions.Print(
+            f"Ribbon UI: data file written ({os.path.getsize(DataFile)} bytes, "
+            f"{SavedBytes} bytes saved by storing identical pixmaps once)",
+            "Log",
+        )
 
     # Write a second data file with the list of commands, Language and data version only
     Data2 = {}
@@ -498,6 +648,19 @@ def CreateCache(RestartFreeCAD=False):
     with open(DataFile2, "w") as outfile:
         json.dump(Data2, outfile, indent=4)
     outfile.close()
+    PhaseTimes["Write data files"] = time.perf_counter() - PhaseStart
+    # Icons resolved from the old data file are stale now.
+    # The raster cache is kept: its keys change with the icon files and the FreeCAD version,
+    # so changed icons are never taken from it and the old files are removed by its size limit
+    IconStore_Ribbon.Clear()
+
+    if Parameters.DEBUG_MODE is True:
+        StandardFunctions.Print(
+            "Ribbon UI: data file created in "
+            + ", ".join(f"{Phase}: {Duration:.3f} s" for Phase, Duration in PhaseTimes.items())
+            + f" ({len(List_Commands)} commands, {len(CommandInfoCache)} command infos requested)",
+            "Log",
+        )
 
     # Write a time stamp to preferences
     TimeStamp = datetime.now().strftime("%m-%d-%Y, %H:%M:%S")
@@ -739,18 +902,38 @@ def returnToolbarCommands(WorkBenchName):
         Toolbars = Gui.getWorkbench(WorkBenchName).getToolbarItems()
         return Toolbars
 
-def returnDropDownCommands(commandName):
+def ReturnCommandInfo(CommandName: str, CommandInfoCache: dict = None) -> dict:
+    """Returns the corrected command info. When a cache is given, the info is requested only once per command.
+
+    Args:
+        CommandName (str): the name of the command.
+        CommandInfoCache (dict, optional): a dict that is kept during one cache run. Defaults to None.
+
+    Returns:
+        dict: the command info from CommandInfoCorrections.
+    """
+    if CommandInfoCache is None:
+        return CommandInfoCorrections(CommandName)
+    CommandInfo = CommandInfoCache.get(CommandName)
+    if CommandInfo is None:
+        CommandInfo = CommandInfoCorrections(CommandName)
+        CommandInfoCache[CommandName] = CommandInfo
+    return CommandInfo
+
+
+def returnDropDownCommands(commandName, CommandInfoCache: dict = None):
     Commands = []
     if commandName is not None:
         command = Gui.Command.get(commandName)
         if command is not None:
-            if len(command.getAction()) > 1:
-                for i in range(len(command.getAction()) - 1):
-                    action = command.getAction()[i]
+            Actions = command.getAction()
+            if len(Actions) > 1:
+                for i in range(len(Actions) - 1):
+                    action = Actions[i]
                     if action is not None and (
                         action.icon() is not None and not action.icon().isNull()
                     ):
-                        IconName = StandardFunctions.CommandInfoCorrections(action.objectName())["pixmap"]
+                        IconName = ReturnCommandInfo(action.objectName(), CommandInfoCache)["pixmap"]
                         Commands.append(
                             [
                                 action.objectName(),
@@ -761,11 +944,14 @@ def returnDropDownCommands(commandName):
                         )
     return Commands
 
-def loadAllWorkbenches(AutoHide=True, HideOnly=False, FinishMessage="", progressBar: QProgressBar = None, maximum = 0):        
+def loadAllWorkbenches(AutoHide=True, HideOnly=False, FinishMessage="", progressBar: QProgressBar = None, maximum = 0, Workbenches: list = None):        
     if HideOnly is False:
         activeWorkbench = Gui.activeWorkbench().name()
         progressBar.show()
         lst = Gui.listWorkbenches()
+        # Load only the given workbenches, if any
+        if Workbenches is not None:
+            lst = Workbenches
         progressBar.setMaximum(len(lst) - 1 + maximum)
         for i, wb in enumerate(lst):
             try:
@@ -791,6 +977,78 @@ def loadAllWorkbenches(AutoHide=True, HideOnly=False, FinishMessage="", progress
         Gui.activateWorkbench(activeWorkbench)
   
         return
+
+def ReturnDataForUpdate():
+    """Returns the existing data file if it can be used for an incremental update, otherwise None."""
+    DataFile = os.path.join(ConfigDirectory, "RibbonDataFile.dat")
+    try:
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
+        if Data is None or Data.get("dataVersion") != DataFileVersion:
+            return None
+        if "Fingerprints" not in Data:
+            return None
+        return Data
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+    return None
+
+
+def ReturnWorkbenchFingerprint(WorkBenchName: str, Language: str) -> dict:
+    """Returns the values that are checked to decide if a workbench must be rescanned.
+
+    Args:
+        WorkBenchName (str): the internal name of the workbench.
+        Language (str): the FreeCAD language.
+
+    Returns:
+        dict: the module path and its modification time, the toolbars, the language and the FreeCAD version.
+    """
+    WorkBench = Gui.getWorkbench(WorkBenchName)
+
+    # Get the file that defines the workbench (mostly InitGui.py)
+    ModulePath = ""
+    try:
+        ModulePath = type(WorkBench).Initialize.__code__.co_filename
+    except Exception:
+        try:
+            ModulePath = sys.modules[type(WorkBench).__module__].__file__
+        except Exception:
+            pass
+    # Use the latest time of the module, its folder and its package.xml
+    ModuleTime = 0
+    if ModulePath != "":
+        ModuleDirectory = os.path.dirname(ModulePath)
+        for path in [ModulePath, ModuleDirectory, os.path.join(ModuleDirectory, "package.xml")]:
+            try:
+                ModuleTime = max(ModuleTime, os.path.getmtime(path))
+            except OSError:
+                pass
+
+    Toolbars = []
+    try:
+        Toolbars = sorted(WorkBench.listToolbars())
+    except Exception:
+        pass
+
+    return {
+        "ModulePath": ModulePath,
+        "ModuleTime": ModuleTime,
+        "Toolbars": Toolbars,
+        "Language": Language,
+        "FreeCADVersion": App.Version()[:4],
+    }
+
+
+def IsFingerprintChanged(OldFingerprint: dict, NewFingerprint: dict) -> bool:
+    """Compares two fingerprints of a workbench.
+    A workbench that is not loaded yet has no toolbars. Its toolbars are not compared."""
+    for key in ["ModulePath", "ModuleTime", "Language", "FreeCADVersion"]:
+        if OldFingerprint.get(key) != NewFingerprint.get(key):
+            return True
+    if len(NewFingerprint["Toolbars"]) > 0 and OldFingerprint.get("Toolbars") != NewFingerprint["Toolbars"]:
+        return True
+    return False
 # endregion---------------------------------------------------------------------------------------
 
 def DownLoadIcons():
@@ -829,10 +1087,11 @@ def CheckDataFileVersion():
     # region - Load data------------------------------------------------------------------
     #
     Data = {}
-    # read ribbon structure from JSON file
-    with open(DataFile, "r") as file:
-        Data.update(json.load(file))
-    file.close()
+    # read the data file. An older JSON data file is converted first
+    try:
+        Data = DataFile_Ribbon.OpenDataFile(DataFile).Metadata()
+    except Exception:
+        pass
 
     DataUpdateNeeded = False
     try:
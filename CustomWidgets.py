@@ -79,6 +79,7 @@ import Parameters_Ribbon
 from Parameters_Ribbon import Parameters
 import Standard_Functions_Ribbon as StandardFunctions
 import StyleMapping_Ribbon
+from TextLayout_Ribbon import ReturnTextLayout
 
 
 # Get the resources
@@ -108,6 +109,38 @@ translate = App.Qt.translate
 
 mw: QMainWindow = Gui.getMainWindow()
 
+# region - Hover styling
+#
+# The command button, label and menu button of a custom button are highlighted together on hovering.
+# The highlight is defined once in their stylesheet with the dynamic property "Hover".
+# Entering or leaving only changes this property, so no stylesheet is parsed per mouse event.
+def ReturnHoverColor() -> str:
+    HoverColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
+    if Parameters.CUSTOM_COLORS_ENABLED:
+        HoverColor = Parameters.COLOR_BORDERS
+    if Parameters.BORDER_TRANSPARANT:
+        HoverColor = StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
+    return HoverColor
+
+
+def ReturnHoverStyleSheet() -> str:
+    return StyleMapping_Ribbon.ReturnStyleSheet(control="hover", HoverColor=ReturnHoverColor())
+
+
+def SetHoverState(Widget: QWidget, State: str):
+    """Sets the highlight of a control. Use "" to remove it, otherwise Full, Top, Bottom, Left or Right."""
+    if Widget.property("Hover") == State:
+        return
+    Widget.setProperty("Hover", State)
+    # Apply the stylesheet rules for the new value
+    Widget.style().unpolish(Widget)
+    Widget.style().polish(Widget)
+    return
+
+
+# endregion
+
+
 class CustomControls(RibbonToolButton):    
     def __init__(
         self,
@@ -324,18 +357,10 @@ class CustomControls(RibbonToolButton):
 
             # If there is no WordWrap, set the ElideMode and the max number of lines to 1.
             if setWordWrap is False:
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Text)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width():
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width():
-                        limit = maxLength - 3
-                        Text = Text[:limit].strip() + "..."
-                        break
+                # Elide the text to the width of the button
+                Text = ReturnTextLayout(
+                    Text, Font, ButtonSize.width(), 1, False
+                ).Lines[0]
                 # Set the text with a placeholder
                 Label_Text.setWordWrap(False)
                 Label_Text.setText(Text)
@@ -348,44 +373,16 @@ class CustomControls(RibbonToolButton):
             if setWordWrap is True:
                 # Set the wrap mode
                 Label_Text.setWordWrap(True)
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Font)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width():
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width():
-                        break
-                # maxLength = maxLength + 3 
-                maxLength = maxLength
-
-                # Get the first text line
-                line1 = StandardFunctions.ReturnWrappedText(
-                    Text, maxLength, MaxNumberOfLines, True
-                )[0]
+                # Wrap the text to the width of the button
+                TextLayout = ReturnTextLayout(
+                    Text, Font, ButtonSize.width(), MaxNumberOfLines, True
+                )
                 # Set the alignment
                 Label_Text.setAlignment(TextAlignment)
-                # Add the line
-                Label_Text.setText(line1)
+                # Add the first two lines
+                Label_Text.setText("\n".join(TextLayout.Lines[:2]))
                 # get the text width
-                TextWidth = FontMetrics.tightBoundingRect(line1).width()
-                # Try to get the second line if there is one
-                try:
-                    line2 = StandardFunctions.ReturnWrappedText(
-                        Text, maxLength, MaxNumberOfLines, True
-                    )[1]
-                    # Set the alignment
-                    Label_Text.setAlignment(TextAlignment)
-                    # Add the line
-                    Label_Text.setText(line1 + "\n" +line2)
-                    # Update the text width if neccesary
-                    if FontMetrics.tightBoundingRect(line2).width() > TextWidth:
-                        TextWidth = FontMetrics.tightBoundingRect(line2).width()
-                except Exception as e:
-                    # Label_Text.setText(line1 + "\n   ")
-                    pass
+                TextWidth = max(TextLayout.Widths[:2])
             
             Label_Text.setFixedWidth(TextWidth + 6)
 
@@ -424,108 +421,15 @@ class CustomControls(RibbonToolButton):
                 mouseClick
             )
 
-            # Change the background color for commandbutton and label on hovering (CSS)
-            def enterEventCustom(event):               
-                BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                if Parameters.CUSTOM_COLORS_ENABLED:
-                    BorderColor = Parameters.COLOR_BORDERS
-                if Parameters.BORDER_TRANSPARANT:
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                        "Background_Color_Hover"
-                    )
-
-                StyleSheet_Addition_Arrow= ""
-                StyleSheet_Addition_Label= ""
-                if showText is False:
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid "
-                        + BorderColor
-                        # + ";border-top: 0.5px solid "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator {
-                                margin: 0px;
-                                spacing: 0px;
-                                padding: 0px;
-                                image: none;
-                                subcontrol-origin: border;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid "
-                        + BorderColor
-                        # + ";border-bottom: 0.5px solid "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                    )
-                if showText is True:
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid "
-                        + BorderColor
-                        # + ";border-top: 0.5px solid "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator {
-                                margin: 0px;
-                                spacing: 0px;
-                                padding: 0px;
-                                image: none;
-                                subcontrol-origin: border;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid "
-                        + BorderColor
-                        # + ";border-bottom: 0.5px solid "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                    )
-                StyleSheet_Addition_Button = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";border: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";margin: 0px"
-                    + ";spacing: 0px"
-                    + ";}"
-                )
-                # btn.setStyleSheet(StyleSheet_Addition_Button)
-                if ArrowButton.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                if Label_Text.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
+            # Highlight the label and the menu button together on hovering.
+            # The highlight is part of their stylesheet and is switched on with a property
+            HoverStates = ["Top", "Bottom"]
+            if showText is False:
+                HoverStates = ["Full", "Full"]
+
+            def enterEventCustom(event):
+                SetHoverState(Label_Text, HoverStates[0])
+                SetHoverState(ArrowButton, HoverStates[1])
 
                 if parent is not None:
                     # Set the value in the parent for detecting that the menu is entered.
@@ -535,19 +439,10 @@ class CustomControls(RibbonToolButton):
             Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
             ArrowButton.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = """QToolButton::menu-indicator {
-                    image: none;
-                    subcontrol-origin: border;
-                    subcontrol-position: center top;
-                }"""
-                Label_Text.setStyleSheet(StyleSheet)
-                ArrowButton.setStyleSheet(StyleSheet_Addition + StyleSheet)
+                SetHoverState(Label_Text, "")
+                SetHoverState(ArrowButton, "")
 
                 # If the menu is hidden, set the value in the parent for detecting that the menu is entered to False.
                 if Menu.isHidden():
@@ -582,101 +477,15 @@ class CustomControls(RibbonToolButton):
                 mouseClick
             )
 
-            # Change the background color for commandbutton and label on hovering (CSS)
-            def enterEventCustom(event):                
-                BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                if Parameters.CUSTOM_COLORS_ENABLED:
-                    BorderColor = Parameters.COLOR_BORDERS
-                if Parameters.BORDER_TRANSPARANT:
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                        "Background_Color_Hover"
-                    )
-                    
-                StyleSheet_Addition_Command = ""
-                StyleSheet_Addition_Label = ""               
-                if showText is False:
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-top: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                        + "QToolButton:disabled, QLabel:disabled {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        # + ";border: 0.5px solid"
-                        # + BorderColor
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";border-bottom: 0px solid"
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                    )
-                if showText is True:
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-top: 0px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";padding: 0px"
-                        + ";}"
-                        + "QToolButton:disabled, QLabel:disabled {background-color: "
-                        + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                        # + ";border: 0.5px solid"
-                        # + BorderColor
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-bottom: 0px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                StyleSheet_Addition_Button = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    # + ";border: "
-                    # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";margin: 0px"
-                    + ";spacing: 0px"
-                    + ";}"
-                )
-                # btn.setStyleSheet(StyleSheet_Addition_Button)
-                if CommandButton.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                if Label_Text.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    CommandButton.setStyleSheet(StyleSheet_Addition_Command)
+            # Highlight the command button and the label together on hovering.
+            # The highlight is part of their stylesheet and is switched on with a property
+            HoverStates = ["Top", "Bottom"]
+            if showText is False:
+                HoverStates = ["Full", "Full"]
+
+            def enterEventCustom(event):
+                SetHoverState(CommandButton, HoverStates[0])
+                SetHoverState(Label_Text, HoverStates[1])
 
             Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
             CommandButton.enterEvent = lambda enterEvent: enterEventCustom(
@@ -688,21 +497,10 @@ class CustomControls(RibbonToolButton):
                 Label_Text.setHidden(True)
                 TextWidth = 0
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    # + ";border: 0.5px solid"
-                    # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";}"
-                )
-                Label_Text.setStyleSheet(StyleSheet_Addition + StyleSheet)
-                CommandButton.setStyleSheet(StyleSheet)
+                SetHoverState(CommandButton, "")
+                SetHoverState(Label_Text, "")
 
             Label_Text.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
             CommandButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
@@ -763,6 +561,8 @@ class CustomControls(RibbonToolButton):
                     subcontrol-position: center top;
                 }"""
         )
+        # Add the highlight for hovering
+        StyleSheet = StyleSheet + ReturnHoverStyleSheet()
         # CommandButton.setStyleSheet(StyleSheet_Addition_Command + StyleSheet)
         ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow + StyleSheet)
         CommandButton.setStyleSheet(StyleSheet)
@@ -863,45 +663,22 @@ class CustomControls(RibbonToolButton):
             FontMetrics = QFontMetrics(Font)
             if setWordWrap is True:
                 Label_Text.setWordWrap(True)
-                # Determine the maximum length per line
-                FontMetrics = QFontMetrics(Font)
-                maxWidth = 0
-                maxLength = 0
-                for c in Text:
-                    maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                    if maxWidth < ButtonSize.width() * 2:
-                        maxLength = maxLength + 1
-                    if maxWidth >= ButtonSize.width() * 2:
-                        break
-                # Get the first text line
-                line1 = StandardFunctions.ReturnWrappedText(
-                    Text, maxLength, MaxNumberOfLines, True
-                )[0]
-                # Add the line with a space to avoid te need to set spacing. (Spacing breaks the hover background)
-                Label_Text.setText(" " + line1)
-                # Try to get the second line if there is one
-                try:
-                    line2 = StandardFunctions.ReturnWrappedText(
-                        Text, maxLength, MaxNumberOfLines, True
-                    )[1]
-                    # Add the line with a space to avoid te need to set spacing. (Spacing breaks the hover background)
-                    Label_Text.setText(Label_Text.text() + "\n" +" " + line2)
-                    if (
-                        FontMetrics.tightBoundingRect(line1).width()
-                        > FontMetrics.tightBoundingRect(line2).width()
-                    ):
-                        # Update a parameter for the width
-                        TextWidth = FontMetrics.tightBoundingRect(line1).width()
-                    else:
-                        # Update a parameter for the width
-                        TextWidth = FontMetrics.tightBoundingRect(line2).width()
-                except Exception:
+                # Wrap the text to twice the width of the button
+                TextLayout = ReturnTextLayout(
+                    Text, Font, ButtonSize.width() * 2, MaxNumberOfLines, True
+                )
+                line1 = TextLayout.Lines[0]
+                # Add the lines with a space to avoid te need to set spacing. (Spacing breaks the hover background)
+                Label_Text.setText(
+                    "\n".join(" " + line for line in TextLayout.Lines[:2])
+                )
+                # Update a parameter for the width
+                TextWidth = max(TextLayout.Widths[:2])
+                if len(TextLayout.Lines) == 1:
                     # Correct the margin to set the arrow vertical center (bug in Qt)
                     marginCorrection = (
                         CommandButton.height() - FontMetrics.boundingRect(Text).height()
                     ) / 2
-                    # Update a parameter for the width
-                    TextWidth = FontMetrics.tightBoundingRect(line1).width()
 
                 # Adjust the size
                 Label_Text.setMaximumWidth(TextWidth + space)
@@ -916,7 +693,7 @@ class CustomControls(RibbonToolButton):
                     # reset the values
                     TextWidth = 0
                     Label_Text.setMaximumWidth(
-                        FontMetrics.tightBoundingRect(line1).width()
+                        TextLayout.Widths[0]
                     )  # set to a extra large value to avoid clipping
                     if Parameters.DEBUG_MODE is True:
                         StandardFunctions.Print(
@@ -927,18 +704,10 @@ class CustomControls(RibbonToolButton):
             if setWordWrap is False:
                 # if the text must be elided, return a updated text
                 if ElideMode is True:
-                    # Determine the maximum length per line
-                    FontMetrics = QFontMetrics(Text)
-                    maxWidth = 0
-                    maxLength = 0
-                    for c in Text:
-                        maxWidth = maxWidth + FontMetrics.horizontalAdvance(c, -1)
-                        if maxWidth < ButtonSize.width() * 3:
-                            maxLength = maxLength + 1
-                        if maxWidth >= ButtonSize.width() * 3:
-                            limit = maxLength - 3
-                            Text = Text[:limit].strip() + "..."
-                            break
+                    # Elide the text to three times the width of the button
+                    Text = ReturnTextLayout(
+                        Text, Font, ButtonSize.width() * 3, 1, False
+                    ).Lines[0]
                 # Set the number of lines to 1 and disable wrap
                 MaxNumberOfLines = 1
                 Label_Text.setWordWrap(False)
@@ -990,134 +759,29 @@ class CustomControls(RibbonToolButton):
                 mouseClick
             )
 
-            # Change the background color for commandbutton and label on hovering (CSS)
+            # Highlight the label and the menu button together on hovering.
+            # The highlight is part of their stylesheet and is switched on with a property
+            HoverStates = ["Left", "Right"]
+            if showText is False:
+                HoverStates = ["Full", "Full"]
+
             def enterEventCustom(event):
-                # if CommandButton.isEnabled() is False:
-                #     return
-                
-                BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                if Parameters.CUSTOM_COLORS_ENABLED:
-                    BorderColor = Parameters.COLOR_BORDERS
-                if Parameters.BORDER_TRANSPARANT:
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                        "Background_Color_Hover"
-                    )     
-                StyleSheet_Addition_Arrow = ""
-                StyleSheet_Addition_Label = ""   
-                if showText is False:        
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {"
-                        + "background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-left: 0.5 px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator, QToolButton::menu-button:hover {
-                                margin: 0px;
-                                spacing: 0px;
-                                image: none;
-                                subcontrol-origin: border;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-right: 0.5px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                if showText is True:        
-                    StyleSheet_Addition_Arrow = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-left: 0.5 px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                        + """QToolButton::menu-indicator, QToolButton::menu-button:hover {
-                                margin: 0px;
-                                spacing: 0px;
-                                image: none;
-                                subcontrol-origin: border;
-                                subcontrol-position: center top;
-                            }"""
-                    )
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-right: 0.5px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                StyleSheet_Addition_Button = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    # + ";border: "
-                    # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";margin: 0px"
-                    + ";spacing: 0px"
-                    + ";}"
-                )
-                btn.setStyleSheet(StyleSheet_Addition_Button)
-                if ArrowButton.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
-                if Label_Text.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow)
+                SetHoverState(Label_Text, HoverStates[0])
+                SetHoverState(ArrowButton, HoverStates[1])
 
                 if parent is not None:
                     # Set the value in the parent for detecting that the menu is entered.
                     # Needed for keeping the ribbon open while showing a dropdown menu
                     parent.MenuEntered = True
 
-                Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
-                ArrowButton.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
-
             Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
-            CommandButton.enterEvent = lambda enterEvent: enterEventCustom(
-                enterEvent
-            )
+            ArrowButton.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
+            CommandButton.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = """QToolButton, QToolButton:hover, QLabel, QLabel:hover, QToolButton::menu-indicator, QToolButton::menu-button:hover {
-                    margin: 0px;
-                    spacing: 0px;
-                    image: none;
-                    subcontrol-origin: border;
-                    subcontrol-position: center top;
-                }"""
-                Label_Text.setStyleSheet(StyleSheet)
-                ArrowButton.setStyleSheet(StyleSheet_Addition + StyleSheet)
+                SetHoverState(Label_Text, "")
+                SetHoverState(ArrowButton, "")
 
                 if parent is not None:
                     # If the menu is hidden, set the value in the parent for detecting that the menu is entered to False.
@@ -1126,6 +790,7 @@ class CustomControls(RibbonToolButton):
 
             Label_Text.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
             ArrowButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
+            CommandButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
 
             # Set MenuEntered to False. This allows the ribbon to fold after leaving the menu and the ribbon.
             def SetToFoldRibbon():
@@ -1149,112 +814,25 @@ class CustomControls(RibbonToolButton):
                 mouseClick
             )
 
-            # Change the background color for commandbutton and label on hovering (CSS)
+            # Highlight the command button and the label together on hovering.
+            # The highlight is part of their stylesheet and is switched on with a property
+            HoverStates = ["Left", "Right"]
+            if showText is False:
+                HoverStates = ["Full", "Full"]
+
             def enterEventCustom(event):
-                # if CommandButton.isEnabled() is False:
-                #     return
-                
-                BorderColor = StyleMapping_Ribbon.ReturnStyleItem("Border_Color")
-                if Parameters.CUSTOM_COLORS_ENABLED:
-                    BorderColor = Parameters.COLOR_BORDERS
-                if Parameters.BORDER_TRANSPARANT:
-                    BorderColor = StyleMapping_Ribbon.ReturnStyleItem(
-                        "Background_Color_Hover"
-                    )
-                
-                StyleSheet_Addition_Command= ""
-                StyleSheet_Addition_Label= ""
-                if showText is False:                    
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-left: 0.5px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-right: 0.5px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                if showText is True:
-                    StyleSheet_Addition_Label = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-left: 0px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 0px;border-bottom-left-radius: 0px;"
-                        + "border-top-right-radius: 2px;border-bottom-right-radius: 2px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                    StyleSheet_Addition_Command = (
-                        "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        # + ";border: 0.5px solid"
-                        + BorderColor
-                        # + ";border-right: 0px solid"
-                        # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                        + ";border-top-left-radius: 2px;border-bottom-left-radius: 2px;"
-                        + "border-top-right-radius: 0px;border-bottom-right-radius: 0px"
-                        + ";margin: 0px"
-                        + ";spacing: 0px"
-                        + ";}"
-                    )
-                StyleSheet_Addition_Button = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    # + ";border: "
-                    # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";margin: 0px"
-                    + ";spacing: 0px"
-                    + ";}"
-                )
-                btn.setStyleSheet(StyleSheet_Addition_Button)
-                if CommandButton.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    CommandButton.setStyleSheet(StyleSheet_Addition_Command)
-                if Label_Text.underMouse():
-                    Label_Text.setStyleSheet(StyleSheet_Addition_Label)
-                    CommandButton.setStyleSheet(StyleSheet_Addition_Command)
+                SetHoverState(CommandButton, HoverStates[0])
+                SetHoverState(Label_Text, HoverStates[1])
 
             Label_Text.enterEvent = lambda enterEvent: enterEventCustom(enterEvent)
             CommandButton.enterEvent = lambda enterEvent: enterEventCustom(
                 enterEvent
             )
                 
-            # restore the stylesheets on leaving
+            # remove the highlight on leaving
             def leaveEventCustom(event):
-                StyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
-                    control="toolbutton",
-                    radius="2px",
-                )
-                StyleSheet_Addition = (
-                    "QToolButton, QToolButton:hover, QLabel, QLabel:hover {background-color: "
-                    + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    # + ";border: 0.5px solid"
-                    # + StyleMapping_Ribbon.ReturnStyleItem("Background_Color")
-                    + ";}"
-                )
-                Label_Text.setStyleSheet(StyleSheet + StyleSheet_Addition)
-                CommandButton.setStyleSheet(StyleSheet + StyleSheet_Addition)
+                SetHoverState(CommandButton, "")
+                SetHoverState(Label_Text, "")
 
             Label_Text.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
             CommandButton.leaveEvent = lambda leaveEvent: leaveEventCustom(leaveEvent)
@@ -1309,6 +887,8 @@ class CustomControls(RibbonToolButton):
                     # + BorderColor
                     + """;}"""
         )
+        # Add the highlight for hovering
+        StyleSheet = StyleSheet + ReturnHoverStyleSheet()
         CommandButton.setStyleSheet(StyleSheet)
         ArrowButton.setStyleSheet(StyleSheet_Addition_Arrow + StyleSheet)
         Label_Text.setStyleSheet(StyleSheet)
@@ -0,0 +1,533 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Binary container for "RibbonDataFile.dat".
+#
+# Layout (all numbers little-endian):
+#   Header      magic (8 bytes), container version (uint16), reserved (uint16),
+#               metadata offset (uint64), metadata length (uint64),
+#               table offset (uint64), number of table entries (uint32)
+#   Metadata    utf-8 JSON with everything except the icons (dataVersion, Language, lists)
+#   Table       per icon: section (uint8), name length (uint16), name (utf-8), offset (uint64), length (uint32)
+#   Blobs       raw PNG/SVG data. Byte-identical pixmaps are stored once (version 2 and higher)
+#   Icons       per icon: number of pixmaps (uint16), then per pixmap:
+#               version 1: width (uint16), height (uint16), mode (uint8), state (uint8), length (uint32), data
+#               version 2: width (uint16), height (uint16), mode (uint8), state (uint8), blob offset (uint64), length (uint32)
+#               version 3: as version 2, followed by the number of atlas pixmaps (uint16), then per atlas pixmap:
+#                          width (uint16), height (uint16), mode (uint8), state (uint8), atlas (uint16),
+#                          x (uint16), y (uint16), pixel width (uint16), pixel height (uint16)
+#
+# Atlases (version 3) are PNG images that contain the pixmaps of many icons of the same size.
+# They are stored as blobs and listed in the table with section 2 and their number as name.
+# Version 3 is only written when the icons are packed in atlases, otherwise version 2 is written.
+# The file is opened with mmap. Only the header and the table are read on opening.
+# The metadata is parsed on first use and single icons are returned as memoryview slices of the mapping.
+# An older JSON data file is converted to this format the first time it is opened.
+import os
+import json
+import mmap
+import struct
+import base64
+import hashlib
+import typing
+import time
+
+# Set the container version. This is independent of the data version in CacheFunctions
+ContainerVersion = 3
+
+MAGIC = b"RIBBONDF"
+HEADER = struct.Struct("<8sHHQQQI")
+TABLE_ENTRY = struct.Struct("<BH")
+TABLE_POSITION = struct.Struct("<QI")
+ICON_COUNT = struct.Struct("<H")
+PIXMAP_HEADER = struct.Struct("<HHBBI")
+PIXMAP_REFERENCE = struct.Struct("<HHBBQI")
+PIXMAP_ATLAS = struct.Struct("<HHBBHHHHH")
+
+SECTIONS = ("WorkBench_Icons", "Command_Icons")
+# The atlases are listed in the table after the icons, with this section number
+ATLAS_SECTION = "Icon_Atlases"
+ATLAS_SECTION_INDEX = len(SECTIONS)
+MODES = ("normal", "disabled", "active", "selected")
+STATES = ("off", "on")
+
+# Opened data files. Key is the absolute path
+_OpenFiles = {}
+
+
+class AtlasPixmap(typing.NamedTuple):
+    """A pixmap that is part of an atlas. Serialize_Ribbon.deserializeIcon cuts it out of the atlas."""
+
+    # Identifies the atlas, so that it is decoded once: (file name, modification time, atlas number)
+    Key: tuple
+    # The PNG data of the whole atlas
+    Data: object
+    # x, y, width and height of the pixmap in the atlas
+    Rect: tuple
+
+
+class RibbonDataFile:
+    """
+    Read access to a binary ribbon data file.
+
+    Metadata values are available as Data["List_Commands"], Data["dataVersion"], etc.
+    Icons are returned with ReturnIcon(section, name) in the same nested dict form
+    as Serialize_Ribbon.serializeIcon, but with memoryviews of the raw image data as values.
+    """
+
+    def __init__(self, FileName: str):
+        self.FileName = FileName
+        self._Stat = os.stat(FileName)
+        self._File = open(FileName, "rb")
+        try:
+            self._Map = mmap.mmap(self._File.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._File.close()
+            raise
+        self._View = memoryview(self._Map)
+        # The memoryviews that are returned by ReturnIcon, per blob offset. They are reused for every call,
+        # so there is at most one per blob. They are released on close,
+        # otherwise the mapping stays open and the file cannot be replaced on Windows
+        self._ViewsByOffset = {}
+        self._Metadata = None
+
+        (
+            Magic,
+            self.Version,
+            Reserved,
+            self._MetadataOffset,
+            self._MetadataLength,
+            TableOffset,
+            TableCount,
+        ) = HEADER.unpack_from(self._Map, 0)
+        if Magic != MAGIC or self.Version > ContainerVersion:
+            self.close()
+            raise ValueError(f"{FileName} is not a supported ribbon data file")
+
+        # Read the table: section -> {name: (offset, length)}
+        self._Table = {Section: {} for Section in SECTIONS}
+        # Atlas number -> (offset, length)
+        self._Atlases = {}
+        # Atlas number -> bytes, for ReturnIconCopy
+        self._AtlasCopies = {}
+        position = TableOffset
+        for i in range(TableCount):
+            Section, NameLength = TABLE_ENTRY.unpack_from(self._Map, position)
+            position = position + TABLE_ENTRY.size
+            Name = self._Map[position : position + NameLength].decode("utf-8")
+            position = position + NameLength
+            Offset, Length = TABLE_POSITION.unpack_from(self._Map, position)
+            position = position + TABLE_POSITION.size
+            if Section == ATLAS_SECTION_INDEX:
+                self._Atlases[int(Name)] = (Offset, Length)
+                continue
+            self._Table[SECTIONS[Section]][Name] = (Offset, Length)
+        return
+
+    def Metadata(self) -> dict:
+        """Returns the metadata. It is parsed on first use."""
+        if self._Metadata is None:
+            start = self._MetadataOffset
+            end = start + self._MetadataLength
+            self._Metadata = json.loads(self._Map[start:end].decode("utf-8"))
+        return self._Metadata
+
+    def __getitem__(self, key):
+        return self.Metadata()[key]
+
+    def __contains__(self, key):
+        return key in self.Metadata()
+
+    def get(self, key, default=None):
+        return self.Metadata().get(key, default)
+
+    def IconNames(self, Section: str) -> list:
+        """Returns the names of all icons in a section ("WorkBench_Icons" or "Command_Icons")."""
+        return list(self._Table[Section].keys())
+
+    def HasIcon(self, Section: str, Name: str) -> bool:
+        return Name in self._Table[Section]
+
+    def ReturnIcon(self, Section: str, Name: str) -> dict:
+        """Returns the pixmaps of an icon without copying the image data.
+
+        Args:
+            Section (str): "WorkBench_Icons" or "Command_Icons"
+            Name (str): the workbench or command name
+
+        Returns:
+            dict: {width: {height: {mode: {state: memoryview}}}} or None if the icon is not present.
+        """
+        Position = self._Table[Section].get(Name)
+        if Position is None:
+            return None
+        position = Position[0]
+        iconPixmaps = {}
+        (Count,) = ICON_COUNT.unpack_from(self._Map, position)
+        position = position + ICON_COUNT.size
+        for i in range(Count):
+            if self.Version == 1:
+                Width, Height, Mode, State, Length = PIXMAP_HEADER.unpack_from(
+                    self._Map, position
+                )
+                position = position + PIXMAP_HEADER.size
+                Offset = position
+                position = position + Length
+            else:
+                Width, Height, Mode, State, Offset, Length = (
+                    PIXMAP_REFERENCE.unpack_from(self._Map, position)
+                )
+                position = position + PIXMAP_REFERENCE.size
+            View = self._ReturnView(Offset, Length)
+            strW = str(Width)
+            strH = str(Height)
+            iconPixmaps.setdefault(strW, {}).setdefault(strH, {}).setdefault(
+                MODES[Mode], {}
+            )[STATES[State]] = View
+
+        # Pixmaps in an atlas
+        if self.Version >= 3:
+            (Count,) = ICON_COUNT.unpack_from(self._Map, position)
+            position = position + ICON_COUNT.size
+            for i in range(Count):
+                Width, Height, Mode, State, Atlas, X, Y, PixelWidth, PixelHeight = (
+                    PIXMAP_ATLAS.unpack_from(self._Map, position)
+                )
+                position = position + PIXMAP_ATLAS.size
+                Offset, Length = self._Atlases[Atlas]
+                View = self._ReturnView(Offset, Length)
+                iconPixmaps.setdefault(str(Width), {}).setdefault(
+                    str(Height), {}
+                ).setdefault(MODES[Mode], {})[STATES[State]] = AtlasPixmap(
+                    (self.FileName, self._Stat.st_mtime_ns, Atlas),
+                    View,
+                    (X, Y, PixelWidth, PixelHeight),
+                )
+        return iconPixmaps
+
+    def _ReturnView(self, Offset: int, Length: int) -> memoryview:
+        """Returns the memoryview of a blob. Pixmaps that share a blob get the same memoryview."""
+        View = self._ViewsByOffset.get(Offset)
+        if View is None:
+            View = self._View[Offset : Offset + Length]
+            self._ViewsByOffset[Offset] = View
+        return View
+
+    def AtlasCount(self) -> int:
+        return len(self._Atlases)
+
+    def ReturnIconCopy(self, Section: str, Name: str) -> dict:
+        """Returns the pixmaps of an icon as bytes, so they stay valid after the file is closed.
+        Used to write the icon to a new data file without rendering it again."""
+        iconPixmaps = self.ReturnIcon(Section, Name)
+        if iconPixmaps is None:
+            return None
+        Copies = {}
+        for strW in iconPixmaps:
+            for strH in iconPixmaps[strW]:
+                for strMode in iconPixmaps[strW][strH]:
+                    for strState, View in iconPixmaps[strW][strH][strMode].items():
+                        if isinstance(View, AtlasPixmap):
+                            # The atlas is copied once for all icons
+                            Atlas = View.Key[2]
+                            if Atlas not in self._AtlasCopies:
+                                self._AtlasCopies[Atlas] = bytes(View.Data)
+                            iconPixmaps[strW][strH][strMode][strState] = View._replace(
+                                Data=self._AtlasCopies[Atlas]
+                            )
+                            continue
+                        Data = Copies.get(id(View))
+                        if Data is None:
+                            Data = bytes(View)
+                            Copies[id(View)] = Data
+                        iconPixmaps[strW][strH][strMode][strState] = Data
+        return iconPixmaps
+
+    def IsCurrent(self) -> bool:
+        """Returns False if the file on disk was replaced after it was opened."""
+        try:
+            Stat = os.stat(self.FileName)
+        except OSError:
+            return False
+        return (
+            Stat.st_mtime_ns == self._Stat.st_mtime_ns
+            and Stat.st_size == self._Stat.st_size
+        )
+
+    def close(self):
+        """Releases all returned memoryviews and closes the mapping.
+        Icons from ReturnIcon cannot be used after this. Use ReturnIconCopy to keep them."""
+        for View in self._ViewsByOffset.values():
+            View.release()
+        self._ViewsByOffset.clear()
+        try:
+            self._View.release()
+            self._Map.close()
+        except BufferError:
+            # A returned memoryview is exported to another buffer at this moment.
+            # WriteDataFile retries replacing the file
+            pass
+        self._File.close()
+        return
+
+
+# region - Writing
+def _PixmapToBytes(Pixmap) -> bytes:
+    # The JSON data file stores base64 strings, the binary file raw bytes
+    if isinstance(Pixmap, str):
+        return base64.b64decode(Pixmap)
+    if isinstance(Pixmap, bytes):
+        return Pixmap
+    return bytes(Pixmap)
+
+
+class _BlobStore:
+    """Collects the pixmap data for writing. Byte-identical pixmaps are stored once."""
+
+    def __init__(self, Offset: int):
+        self.Offset = Offset
+        self.Blobs = []
+        self.Hashes = {}
+        self.Size = 0
+        self.SavedBytes = 0
+
+    def Add(self, Data: bytes) -> tuple:
+        """Returns (offset, length) of the data in the file."""
+        # Use the hash if it is already calculated (Serialize_Ribbon.PixmapData)
+        Hash = getattr(Data, "Hash", b"")
+        if Hash == b"":
+            Hash = hashlib.sha1(Data).digest()
+        Position = self.Hashes.get(Hash)
+        if Position is not None:
+            self.SavedBytes = self.SavedBytes + len(Data)
+            return Position
+        Position = (self.Offset + self.Size, len(Data))
+        self.Hashes[Hash] = Position
+        self.Blobs.append(Data)
+        self.Size = self.Size + len(Data)
+        return Position
+
+
+def _IconToBytes(iconPixmaps: dict, Blobs: _BlobStore, AtlasPositions: list = None) -> bytes:
+    Pixmaps = []
+    AtlasPixmaps = []
+    for strW, wPixmaps in iconPixmaps.items():
+        for strH, hPixmaps in wPixmaps.items():
+            for strMode, modePixmaps in hPixmaps.items():
+                for strState, statePixmap in modePixmaps.items():
+                    if isinstance(statePixmap, AtlasPixmap):
+                        # The key of a new atlas pixmap is its atlas number
+                        X, Y, PixelWidth, PixelHeight = statePixmap.Rect
+                        AtlasPixmaps.append(
+                            PIXMAP_ATLAS.pack(
+                                int(strW),
+                                int(strH),
+                                MODES.index(strMode),
+                                STATES.index(strState),
+                                statePixmap.Key,
+                                X,
+                                Y,
+                                PixelWidth,
+                                PixelHeight,
+                            )
+                        )
+                        continue
+                    Offset, Length = Blobs.Add(_PixmapToBytes(statePixmap))
+                    Pixmaps.append(
+                        PIXMAP_REFERENCE.pack(
+                            int(strW),
+                            int(strH),
+                            MODES.index(strMode),
+                            STATES.index(strState),
+                            Offset,
+                            Length,
+                        )
+                    )
+    Record = ICON_COUNT.pack(len(Pixmaps)) + b"".join(Pixmaps)
+    if AtlasPositions is not None:
+        Record = Record + ICON_COUNT.pack(len(AtlasPixmaps)) + b"".join(AtlasPixmaps)
+    return Record
+
+
+def WriteDataFile(FileName: str, Data: dict):
+    """Writes the data to a binary data file.
+
+    Args:
+        FileName (str): the path of the data file.
+        Data (dict): the same dict that was written as JSON before.
+            "WorkBench_Icons" and "Command_Icons" are lists of [name, iconPixmaps].
+            The pixmaps can be base64 strings or raw bytes.
+            "Icon_Atlases" is an optional list with the PNG data of the atlases,
+            made by Serialize_Ribbon.packAtlases. The pixmaps in the atlases are AtlasPixmaps
+            with the atlas number as key.
+
+    Returns:
+        int: the number of bytes saved by storing identical pixmaps once.
+    """
+    Metadata = {}
+    for key, value in Data.items():
+        if key not in SECTIONS and key != ATLAS_SECTION:
+            Metadata[key] = value
+    MetadataBytes = json.dumps(Metadata).encode("utf-8")
+
+    # Collect the pixmaps first. The icon records are written after them
+    Blobs = _BlobStore(HEADER.size + len(MetadataBytes))
+    # Version 3 is only needed for atlases
+    AtlasPositions = None
+    Version = 2
+    if len(Data.get(ATLAS_SECTION, [])) > 0:
+        AtlasPositions = [Blobs.Add(Atlas) for Atlas in Data[ATLAS_SECTION]]
+        Version = 3
+    Records = []
+    for SectionIndex, Section in enumerate(SECTIONS):
+        for IconItem in Data.get(Section, []):
+            Records.append(
+                (
+                    SectionIndex,
+                    str(IconItem[0]),
+                    _IconToBytes(IconItem[1], Blobs, AtlasPositions),
+                )
+            )
+
+    # Create the icon records and the table
+    Icons = []
+    Table = []
+    Offset = Blobs.Offset + Blobs.Size
+    for SectionIndex, Name, Record in Records:
+        NameBytes = Name.encode("utf-8")
+        Table.append(TABLE_ENTRY.pack(SectionIndex, len(NameBytes)))
+        Table.append(NameBytes)
+        Table.append(TABLE_POSITION.pack(Offset, len(Record)))
+        Icons.append(Record)
+        Offset = Offset + len(Record)
+    TableCount = len(Records)
+    if AtlasPositions is not None:
+        for Atlas, Position in enumerate(AtlasPositions):
+            NameBytes = str(Atlas).encode("utf-8")
+            Table.append(TABLE_ENTRY.pack(ATLAS_SECTION_INDEX, len(NameBytes)))
+            Table.append(NameBytes)
+            Table.append(TABLE_POSITION.pack(Position[0], Position[1]))
+        TableCount = TableCount + len(AtlasPositions)
+
+    Header = HEADER.pack(
+        MAGIC,
+        Version,
+        0,
+        HEADER.size,
+        len(MetadataBytes),
+        Offset,
+        TableCount,
+    )
+
+    # Close the mapping of the old file. Otherwise it cannot be replaced on Windows
+    CloseDataFile(FileName)
+
+    # Write to a temporary file first and replace the data file with it.
+    TempFile = FileName + ".tmp"
+    with open(TempFile, "wb") as outfile:
+        outfile.write(Header)
+        outfile.write(MetadataBytes)
+        for Blob in Blobs.Blobs:
+            outfile.write(Blob)
+        for Icon in Icons:
+            outfile.write(Icon)
+        outfile.write(b"".join(Table))
+    outfile.close()
+    _ReplaceFile(TempFile, FileName)
+    return Blobs.SavedBytes
+
+
+def _ReplaceFile(TempFile: str, FileName: str, Attempts: int = 10):
+    """Replaces the data file with the temporary file.
+    On Windows this fails while the old file is still mapped or read, so it is tried again a few times."""
+    for Attempt in range(Attempts):
+        try:
+            os.replace(TempFile, FileName)
+            return
+        except PermissionError:
+            if Attempt == Attempts - 1:
+                # Keep the old data file. The temporary file is removed, so that the next attempt starts clean
+                try:
+                    os.remove(TempFile)
+                except OSError:
+                    pass
+                raise
+            time.sleep(0.1)
+    return
+
+
+# endregion
+
+
+# region - Opening
+def IsBinaryDataFile(FileName: str) -> bool:
+    with open(FileName, "rb") as file:
+        Magic = file.read(len(MAGIC))
+    file.close()
+    return Magic == MAGIC
+
+
+def MigrateDataFile(FileName: str):
+    """Converts a JSON data file to the binary format."""
+    Data = {}
+    with open(FileName, "r") as file:
+        Data.update(json.load(file))
+    file.close()
+    WriteDataFile(FileName, Data)
+    return
+
+
+def OpenDataFile(FileName: str) -> RibbonDataFile:
+    """Returns the opened data file. The file is opened once and reused until it changes on disk.
+    A JSON data file is converted to the binary format first.
+
+    Args:
+        FileName (str): the path of the data file.
+
+    Returns:
+        RibbonDataFile: the data file or None if the file does not exist or cannot be read.
+    """
+    key = os.path.abspath(FileName)
+    DataFile = _OpenFiles.get(key)
+    if DataFile is not None:
+        if DataFile.IsCurrent():
+            return DataFile
+        CloseDataFile(FileName)
+
+    if os.path.exists(FileName) is False or os.path.getsize(FileName) == 0:
+        return None
+    if IsBinaryDataFile(FileName) is False:
+        MigrateDataFile(FileName)
+
+    DataFile = RibbonDataFile(FileName)
+    _OpenFiles[key] = DataFile
+    return DataFile
+
+
+def CloseDataFile(FileName: str):
+    DataFile = _OpenFiles.pop(os.path.abspath(FileName), None)
+    if DataFile is not None:
+        DataFile.close()
+    return
+
+
+# endregion
@@ -141,9 +141,16 @@ import CacheFunctions
 import Standard_Functions_Ribbon as StandardFunctions
 from Standard_Functions_Ribbon import CommandInfoCorrections
 import Serialize_Ribbon
+import DataFile_Ribbon
 import Standard_Functions_Ribbon
 import StyleMapping_Ribbon
+import IconIndex_Ribbon
+import IconStore_Ribbon
+import StructureWriter_Ribbon
+import UpdateCheck_Ribbon
+from TextLayout_Ribbon import ReturnTextLayout
 import platform
+import time
 from datetime import datetime
 import shutil
 
@@ -260,10 +267,6 @@ class ModernMenu(RibbonBar):
     # Create the list for the commands
     List_Commands = []
 
-    # Create the lists for the deserialized icons
-    List_CommandIcons = []
-    List_WorkBenchIcons = []
-
     # Declare the custom overlay function states
     OverlayToggled = False
     OverlayToggled_Left = False
@@ -278,10 +281,21 @@ class ModernMenu(RibbonBar):
     SettingsMenu = QMenu()
     OverlayMenu = None
     AccessoriesMenu = None
+    # The stylesheets of the tabbar per tabbar style, tabbar size and theme
+    TabBarStyleSheets = {}
+    # The duration of each stage of a tab switch in seconds. None when no tab switch is measured
+    TabSwitchTimes = None
+    # The time in ms a tab switch should take at most. Longer tab switches are reported as a warning
+    TAB_SWITCH_BUDGET = 50
+
+    # The application menu and the actions from the menubar that are added to it
+    ApplicationMenu = None
+    ApplicationMenuActions = []
 
     # Define the versions for update and developments
     UpdateVersion = ""
     DeveloperVersion = ""
+    CurrentVersion = ""
 
     # Define a boolan to detect if an menu is entered.
     # used to keep the ribbon unfolded, when clicking on a dropdown menu
@@ -302,9 +316,20 @@ class ModernMenu(RibbonBar):
 
     # Define a indictor for wether the customize enviroment is enabled
     CustomizeEnabled = False
-    # a action list for the right click event in the customize enviroment.
-    # Used to store the button states
-    actionList = []
+    # The toolbars of the main window that are new or shown again since the last call of hideClassicToolbars
+    PendingToolbars = set()
+    # The toolbars of the main window that have the ClassicToolbarInspector installed
+    TrackedToolbars = set()
+    # Set to True after all toolbars are handled once
+    ClassicToolbarsScanned = False
+    # The widgets of the status bar area
+    StatusBarAreas = []
+
+    # The buttons of the ribbon per category. Used to activate the buttons of the current category only
+    ButtonRegistry = {}
+    # The original state of the activated buttons and their actions.
+    # Used to restore the buttons after the customize enviroment is closed
+    ButtonStates = {}
     
     # Create a dict for the active workbench only
     workBenchDict = {}
@@ -365,6 +390,9 @@ class ModernMenu(RibbonBar):
         self.setAcceptDrops(True)
         self.tabBar().setAcceptDrops(True)
         self._titleWidget.quickAccessToolBar().setAcceptDrops(True)
+
+        # Define the event filter that reports new toolbars for hideClassicToolbars
+        self.ToolbarInspector = ClassicToolbarInspector(self)
                         
         # connect the signals
         self.connectSignals()
@@ -563,10 +591,7 @@ class ModernMenu(RibbonBar):
         self.ribbonStructure["ignoredToolbars"] = ListIgnoredToolbars
 
         # write the change to the json file
-        # Writing to sample.json
-        with open(Parameters.RIBBON_STRUCTURE_JSON, "w") as outfile:
-            json.dump(self.ribbonStructure, outfile, indent=4)
-        outfile.close()
+        StructureWriter_Ribbon.MarkDirty(self.ribbonStructure)
 
         # Get the address of the repository address
         PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
@@ -634,52 +659,26 @@ class ModernMenu(RibbonBar):
             pass
 
         # Check if there is a new version
-        # Get the latest version
-        try:
-            # User = "apebbers"
-            User = "APEbbers"
-            Repo = "FreeCAD-Ribbon"
-            Branch = "main"
-            File = "package.xml"
-            ElementName = "version"
-            attribKey = ""
-            attribValue = ""
-            # host: str ="https://codeberg.org"
-            host = "https://github.com"
-            LatestVersion = StandardFunctions.ReturnXML_Value_Git(
-                User=User, Repository=Repo, Branch=Branch, File=File, ElementName=ElementName, attribKey=attribKey, attribValue=attribValue, host=host
-            )
-            print(translate("FreeCAD Ribbon", "Ribbon UI: Latest released version: ") + str(LatestVersion))
-            # Get the current version
-            PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
-            CurrentVersion = StandardFunctions.ReturnXML_Value(
-                PackageXML, "version"
-            )
-            # Check if you are on a developer version. If so set developer version
-            if CurrentVersion.lower().endswith("dev"):
-                self.DeveloperVersion = CurrentVersion
-                self.UpdateVersion = ""
-            # If you are not on a developer version, check if you have the latest version
-            if CurrentVersion.lower().endswith("dev") is False:
-                if LatestVersion is not None:
-                    # Create arrays from the versions
-                    LatestVersionArray = LatestVersion.split(".")
-                    CurrentVersionArray = CurrentVersion.split(".")
-
-                    # Set the length to the shortest lenght
-                    ArrayLenght = len(LatestVersionArray)
-                    if len(CurrentVersionArray) < ArrayLenght:
-                        ArrayLenght = len(CurrentVersionArray)
-
-                    # Check per level if the latest version has the highest number
-                    # if so set update version
-                    for i in range(ArrayLenght):
-                        if LatestVersionArray[i] > CurrentVersionArray[i]:
-                            self.UpdateVersion = LatestVersion
-        except Exception as e:
-            if Parameters.DEBUG_MODE:
-                print(e.with_traceback(e.__traceback__))
-            pass
+        # Get the current version
+        PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
+        self.CurrentVersion = StandardFunctions.ReturnXML_Value(
+            PackageXML, "version"
+        )
+        # Check if you are on a developer version. If so set developer version
+        if self.CurrentVersion.lower().endswith("dev"):
+            self.DeveloperVersion = self.CurrentVersion
+            self.UpdateVersion = ""
+        # If you are not on a developer version, get the latest version in the background.
+        # The button for the update is added when the result is available.
+        if self.CurrentVersion.lower().endswith("dev") is False:
+            try:
+                self.UpdateChecker = UpdateCheck_Ribbon.UpdateChecker()
+                self.UpdateChecker.Finished.connect(self.on_UpdateCheck_Finished)
+                self.UpdateChecker.Start()
+            except Exception as e:
+                if Parameters.DEBUG_MODE:
+                    print(e.with_traceback(e.__traceback__))
+                pass
 
         # Create the ribbon
         self.CreateMenus()  # Create the menus
@@ -1098,6 +1097,8 @@ class ModernMenu(RibbonBar):
 
         # Install an event filter to catch events from the main window and act on it.
         mw.installEventFilter(EventInspector(mw))
+        # Install an event filter to catch new toolbars
+        mw.installEventFilter(self.ToolbarInspector)
         # self.installEventFilter(RibbonEventInspector(self))
         
         # Set isLoaded to True, to show that the loading is finished
@@ -1163,6 +1164,8 @@ class ModernMenu(RibbonBar):
     
     def closeEvent(self, event):
         mw.menuBar().show()
+        # Write pending changes of the ribbon structure
+        StructureWriter_Ribbon.Flush()
         return True
 
     def eventFilter(self, obj, event):
@@ -1609,8 +1612,6 @@ class ModernMenu(RibbonBar):
                 pass
                 
         # Enable all buttons, so you can access them with a right click
-        self.actionList = []
-        # Activate all buttons
         self.activateButtons()
                                 
         # Create all order lists and commands, incase they are not all present
@@ -1794,11 +1795,7 @@ class ModernMenu(RibbonBar):
             )
 
             # Return the original state of the buttons
-            for item in self.actionList:
-                if item[1] is False:
-                    item[0].setDisabled(True)
-                else:
-                    item[0].setEnabled(True)
+            self.restoreButtons()
             Gui.updateGui()
 
         # Restore the original panel with the overflow menu
@@ -1958,9 +1955,7 @@ class ModernMenu(RibbonBar):
         #         self.ribbonStructure["workbenches"][WorkBench] == CopyDict["workbenches"][WorkBench]
         
         # Writing to ribbonStructure.json
-        JsonFile = Parameters.RIBBON_STRUCTURE_JSON
-        with open(JsonFile, "w") as outfile:
-            json.dump(self.ribbonStructure, outfile, indent=4)
+        StructureWriter_Ribbon.WriteNow(self.ribbonStructure)
                 
         # Close the temporary document
         try:
@@ -2031,6 +2026,7 @@ class ModernMenu(RibbonBar):
         )
         
         # read ribbon structure from JSON file
+        StructureWriter_Ribbon.Flush()
         Dict = {}
         with open(Parameters.RIBBON_STRUCTURE_JSON, "r") as file:
             Dict.update(json.load(file))
@@ -2661,8 +2657,6 @@ class ModernMenu(RibbonBar):
             self.dropPanelName = None
             
             # Enable all buttons, so you can access them with a right click
-            self.actionList = []
-            # Activate all buttons
             self.activateButtons()
         
         return
@@ -3408,7 +3402,8 @@ class ModernMenu(RibbonBar):
     def onUserChangedWorkbench(self, tabActivated=True):
         """
         Import selected workbench toolbars to ModernMenu section.
-        """                
+        """
+        TimingStarted = self.StartTabSwitchTiming()
         if len(mw.findChildren(QDockWidget, "Ribbon")) > 0:
             if Parameters.AUTOHIDE_RIBBON is False:
                 self.UnfoldRibbon()
@@ -3421,15 +3416,21 @@ class ModernMenu(RibbonBar):
         if tabName is not None and tabName != "" and tabName != "test":
             # activate selected workbench
             tabName = tabName.replace("&", "")
-            if self.wbNameMapping[tabName] is not None:                
+            if self.wbNameMapping[tabName] is not None:
+                StageStart = time.perf_counter()
                 Gui.activateWorkbench(self.wbNameMapping[tabName])
+                self.AddTabSwitchTime("Activate workbench", StageStart)
 
             if tabActivated is True:
                 self.onWbActivated()
-                self.ApplicationMenus()           
+                StageStart = time.perf_counter()
+                self.ApplicationMenus()
+                self.AddTabSwitchTime("Application menu", StageStart)
         
         # hide normal toolbars
+        StageStart = time.perf_counter()
         self.hideClassicToolbars()
+        self.AddTabSwitchTime("Hide toolbars", StageStart)
         
         if self.CustomizeEnabled:
             self.on_Customize_Clicked()
@@ -3438,58 +3439,23 @@ class ModernMenu(RibbonBar):
         
         # Emit a signal when switching to a new tab. Used to update the "addcommands" panel
         self.TabChanged.emit()
+        self.EndTabSwitchTiming(TimingStarted)
         return
 
-    def onWbActivated(self):        
+    def onWbActivated(self):
+        TimingStarted = self.StartTabSwitchTiming()
         if len(mw.findChildren(QDockWidget, "Ribbon")) > 0:
             if Parameters.AUTOHIDE_RIBBON is False:
                 self.UnfoldRibbon()
             # else:
             #     self.FoldRibbon(True)
 
-        # Set the text color depending in tabstyle
-        if Parameters.TABBAR_STYLE != 1:
-            self.tabBar().setStyleSheet(
-                "QTabBar::tab {color: "
-                + StyleMapping_Ribbon.ReturnStyleItem("FontColor")
-                + ";}"
-                # + """ QToolTip {
-                #     background-color: #FFFFE1;
-                #     color: black;
-                #     border: black solid 1px;
-                #     border-radius: 2px;
-                #     }"""
-            )
-        if Parameters.TABBAR_STYLE == 1:
-            self.tabBar().setStyleSheet(
-                "QTabBar::tab {background: "
-                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color", True, True)
-                + ";color: "
-                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color", True, True)
-                + ";min-width: "
-                + str(self.TabBar_Size-3)
-                + "px;max-width: "
-                + str(self.TabBar_Size-3)
-                + "px;"
-                + "padding-left: 6px;"
-                + "padding-right: 3px;"
-                + "margin: 3px"
-                + ";}"
-                + "QTabBar::tab:selected, QTabBar::tab:hover { "
-                + "background: "
-                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                + ";color: "
-                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                + ";}"
-            )
-        # Make sure that the tooltip has the correct color settings
-        styleSheet = self.tabBar().styleSheet()
-        self.tabBar().setStyleSheet(styleSheet + """\n QToolTip {
-                    background-color: #FFFFE1;
-                    color: black;
-                    border: black solid 1px;
-                    border-radius: 2px;
-                    }""")
+        # Set the stylesheet of the tabbar, only if it is changed
+        StageStart = time.perf_counter()
+        StyleSheet = self.ReturnTabBarStyleSheet()
+        if self.tabBar().styleSheet() != StyleSheet:
+            self.tabBar().setStyleSheet(StyleSheet)
+        self.AddTabSwitchTime("Restyle", StageStart)
 
         # ensure that workbench is already loaded
         workbench = Gui.activeWorkbench()
@@ -3502,23 +3468,32 @@ class ModernMenu(RibbonBar):
             timer.timeout.connect(self.onWbActivated)
             timer.setSingleShot(True)
             timer.start(1000)
+            self.EndTabSwitchTiming(TimingStarted)
             return
 
         # hide normal toolbars
+        StageStart = time.perf_counter()
         self.hideClassicToolbars()
+        self.AddTabSwitchTime("Hide toolbars", StageStart)
 
         # switch tab if necessary
+        StageStart = time.perf_counter()
         self.updateCurrentTab()
+        self.AddTabSwitchTime("Update tab", StageStart)
 
         # create panels. Do this after updateCurrentTab.
         # Otherwise, the sketcher workbench won;t be loaded properly the first time
+        StageStart = time.perf_counter()
         if self.CustomizeEnabled is False: 
             self.buildPanels()
         if self.CustomizeEnabled:
             self.buildPanels(Dict=self.workBenchDict, UpdateDict=False)
+        self.AddTabSwitchTime("Build panels", StageStart)
         
         # hide normal toolbars
+        StageStart = time.perf_counter()
         self.hideClassicToolbars()
+        self.AddTabSwitchTime("Hide toolbars", StageStart)
         
         if self.CustomizeEnabled:
             self.on_Customize_Clicked()
@@ -3532,6 +3507,81 @@ class ModernMenu(RibbonBar):
         #     self.applicationOptionButton().setDisabled(True)
         #     Gui.updateGui()
         
+        self.EndTabSwitchTiming(TimingStarted)
+        return
+
+    def ReturnTabBarStyleSheet(self) -> str:
+        """Returns the stylesheet for the tabbar. It is created once per tabbar style, tabbar size and theme."""
+        Key = (Parameters.TABBAR_STYLE, self.TabBar_Size, StyleMapping_Ribbon.ReturnStyleCache()["State"])
+        StyleSheet = self.TabBarStyleSheets.get(Key)
+        if StyleSheet is not None:
+            return StyleSheet
+
+        # Set the text color depending in tabstyle
+        if Parameters.TABBAR_STYLE != 1:
+            StyleSheet = (
+                "QTabBar::tab {color: "
+                + StyleMapping_Ribbon.ReturnStyleItem("FontColor")
+                + ";}"
+            )
+        if Parameters.TABBAR_STYLE == 1:
+            StyleSheet = (
+                "QTabBar::tab {background: "
+                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color", True, True)
+                + ";color: "
+                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color", True, True)
+                + ";min-width: "
+                + str(self.TabBar_Size-3)
+                + "px;max-width: "
+                + str(self.TabBar_Size-3)
+                + "px;"
+                + "padding-left: 6px;"
+                + "padding-right: 3px;"
+                + "margin: 3px"
+                + ";}"
+                + "QTabBar::tab:selected, QTabBar::tab:hover { "
+                + "background: "
+                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
+                + ";color: "
+                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
+                + ";}"
+            )
+        # Make sure that the tooltip has the correct color settings
+        StyleSheet = StyleSheet + """\n QToolTip {
+                    background-color: #FFFFE1;
+                    color: black;
+                    border: black solid 1px;
+                    border-radius: 2px;
+                    }"""
+        self.TabBarStyleSheets[Key] = StyleSheet
+        return StyleSheet
+
+    def StartTabSwitchTiming(self) -> bool:
+        """Starts measuring a tab switch in debug mode. Returns True if this call started the measurement."""
+        if Parameters.DEBUG_MODE is False or self.TabSwitchTimes is not None:
+            return False
+        self.TabSwitchTimes = {"Start": time.perf_counter()}
+        return True
+
+    def AddTabSwitchTime(self, Stage: str, StageStart: float):
+        """Adds the time since StageStart to the given stage of the tab switch that is measured."""
+        if self.TabSwitchTimes is not None:
+            self.TabSwitchTimes[Stage] = self.TabSwitchTimes.get(Stage, 0) + time.perf_counter() - StageStart
+        return
+
+    def EndTabSwitchTiming(self, Started: bool):
+        """Prints the duration of the stages of the tab switch, if the measurement was started by the caller."""
+        if Started is False or self.TabSwitchTimes is None:
+            return
+        Total = (time.perf_counter() - self.TabSwitchTimes.pop("Start")) * 1000
+        Message = f"Tab switch: {Total:.1f} ms (" + ", ".join(
+            f"{Stage}: {Duration * 1000:.1f} ms" for Stage, Duration in self.TabSwitchTimes.items()
+        ) + ")"
+        self.TabSwitchTimes = None
+        if Total > self.TAB_SWITCH_BUDGET:
+            StandardFunctions.Print(Message, "Warning")
+        else:
+            StandardFunctions.Print(Message, "Log")
         return
 
     def onTabBarClicked(self):
@@ -3580,6 +3630,9 @@ class ModernMenu(RibbonBar):
         Text.setText(translate("FreeCAD Ribbon", "Menu"))
         # Get its metrics
         FontMetrics = QFontMetrics(Text.font())
+        TextWidth = ReturnTextLayout(
+            Text.text(), Text.font(), self.maximumWidth(), 1, False
+        ).BoundingWidths[0]
         # Define a layout and add the label
         Layout = QHBoxLayout()
         Layout.addWidget(Text, 0, Qt.AlignmentFlag.AlignRight)
@@ -3590,7 +3643,7 @@ class ModernMenu(RibbonBar):
         # Set the size of the menu button
         self.applicationOptionButton().setFixedSize(
             self.QuickAccessButtonSize
-            + FontMetrics.boundingRect(Text.text()).width()
+            + TextWidth
             + 12,
             self.QuickAccessButtonSize,
         )
@@ -4030,8 +4083,20 @@ class ModernMenu(RibbonBar):
 
     # Function to create the application menu
     def ApplicationMenus(self):
-        # Add a file menu
-        ApplictionMenu = self.addFileMenu()
+        # Create the application menu once. After that, only the actions from the menubar are updated
+        IsNew = False
+        try:
+            if self.ApplicationMenu is not None:
+                self.ApplicationMenu.actions()
+        except RuntimeError:
+            # The menu is deleted
+            self.ApplicationMenu = None
+        if self.ApplicationMenu is None:
+            # Add a file menu
+            self.ApplicationMenu = self.addFileMenu()
+            self.ApplicationMenuActions = []
+            IsNew = True
+        ApplictionMenu = self.ApplicationMenu
 
         # add the menus from the menubar to the application button
         MenuBar = mw.menuBar()
@@ -4046,67 +4111,106 @@ class ModernMenu(RibbonBar):
                     border-radius: 2px;
                     }"""
         )
-        MenuBar.setStyleSheet(StyleSheet_MenuBar)
-        # # Add the actions of the menubar to the application menu
-        for child in MenuBar.actions():
-            if child.objectName() != "&Help" and child.objectName != "AccessoriesMenu":
-                ApplictionMenu.addAction(child)
-            if (
-                child.objectName == "AccessoriesMenu"
-                and self.AccessoriesMenu is not None
-            ):
-                ApplictionMenu.addMenu(self.AccessoriesMenu)
+        if MenuBar.styleSheet() != StyleSheet_MenuBar:
+            MenuBar.setStyleSheet(StyleSheet_MenuBar)
 
         # if you on macOS, add the ribbon menus to the menubar
+        RibbonMenuAction = None
         if platform.system().lower() == "darwin":
-            for action in MenuBar.actions():
-                if action.text() == translate("FreeCAD Ribbon", "Ribbon UI"):
-                    MenuBar.removeAction(action)
-                    break
+            RibbonMenuAction = self.RibbonMenu.menuAction()
+            if RibbonMenuAction not in MenuBar.actions():
+                for action in MenuBar.actions():
+                    if action.text() == translate("FreeCAD Ribbon", "Ribbon UI"):
+                        MenuBar.removeAction(action)
+                        break
 
+                for child in MenuBar.children():
+                    if child.objectName() == "&Windows":
+                        beforeAction = child.menuAction()
+                        Menu = self.RibbonMenu
+                        Menu.setTitle(translate("FreeCAD Ribbon", "Ribbon UI"))
+                        MenuBar.insertMenu(beforeAction, self.RibbonMenu)
+
+        # Get the actions of the menubar for the application menu.
+        # The ribbon menu is not added on macOS, because it is already in the menubar
+        MenuBarActions = []
+        for child in MenuBar.actions():
+            if child.objectName() != "&Help" and child != RibbonMenuAction:
+                MenuBarActions.append(child)
+
+        # Update the application menu only if the menubar is changed by the new workbench
+        if MenuBarActions != self.ApplicationMenuActions:
+            # Remove the actions that are no longer in the menubar
+            for action in self.ApplicationMenuActions:
+                if action not in MenuBarActions:
+                    ApplictionMenu.removeAction(action)
+            # Add the new actions at the position of the menubar, before the labels and buttons at the end
+            CurrentActions = set(self.ApplicationMenuActions)
             beforeAction = None
-            for child in MenuBar.children():
-                if child.objectName() == "&Windows":
-                    beforeAction = child.menuAction()
-                    Menu = self.RibbonMenu
-                    Menu.setTitle(translate("FreeCAD Ribbon", "Ribbon UI"))
-                    MenuBar.insertMenu(beforeAction, self.RibbonMenu)
-                    # Remove the menu from the Ribbon Application Menu
-                    for action in ApplictionMenu.actions():
-                        if action.text() == translate("FreeCAD Ribbon", "Ribbon UI"):
-                            ApplictionMenu.removeAction(action)
-                            break
+            for action in ApplictionMenu.actions():
+                if action not in CurrentActions:
+                    beforeAction = action
+                    break
+            for action in reversed(MenuBarActions):
+                if action not in CurrentActions:
+                    ApplictionMenu.insertAction(beforeAction, action)
+                beforeAction = action
+            self.ApplicationMenuActions = MenuBarActions
+
+        if IsNew is True:
+            # if you are on a developer version, add a label
+            if self.DeveloperVersion != "":
+                ApplictionMenu.addSeparator()
+                color = StyleMapping_Ribbon.ReturnStyleItem("DevelopColor")
+                Label = QLabel()
+                Label.setText("Development version")
+                Label.setStyleSheet(
+                    f"color: {color};border: 1px solid {color};border-radius: 2px;"
+                )
+                ApplictionMenu.addWidget(Label)
+            # if there is an update, add a button that opens the addon manager
+            if self.UpdateVersion != "" and self.DeveloperVersion == "":
+                self.AddUpdateButton(ApplictionMenu)
 
-        # if you are on a developer version, add a label
-        if self.DeveloperVersion != "":
-            ApplictionMenu.addSeparator()
-            color = StyleMapping_Ribbon.ReturnStyleItem("DevelopColor")
-            Label = QLabel()
-            Label.setText("Development version")
-            Label.setStyleSheet(
-                f"color: {color};border: 1px solid {color};border-radius: 2px;"
-            )
-            ApplictionMenu.addWidget(Label)
-        # if there is an update, add a button that opens the addon manager
-        if self.UpdateVersion != "" and self.DeveloperVersion == "":
-            ApplictionMenu.addSeparator()
-            color = StyleMapping_Ribbon.ReturnStyleItem("UpdateColor")
-            Button = QToolButton()
-            Button.setText(translate("FreeCAD Ribbon", "Update available"))
-            Button.setStyleSheet(
-                "QToolButton{"
-                + f"color: {color};border: 1px solid {color};border-radius: 2px;background: none"
-                + "}QToolButton:hover{background-color: "
-                + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
-                + ";}"
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(
+                f"Application menu: {len(self.applicationOptionButton().findChildren(QMenu))} menus, "
+                f"{len(ApplictionMenu.actions())} actions",
+                "Log",
             )
+        return
+
+    def AddUpdateButton(self, ApplictionMenu):
+        ApplictionMenu.addSeparator()
+        color = StyleMapping_Ribbon.ReturnStyleItem("UpdateColor")
+        Button = QToolButton()
+        Button.setText(translate("FreeCAD Ribbon", "Update available"))
+        Button.setStyleSheet(
+            "QToolButton{"
+            + f"color: {color};border: 1px solid {color};border-radius: 2px;background: none"
+            + "}QToolButton:hover{background-color: "
+            + StyleMapping_Ribbon.ReturnStyleItem("Background_Color_Hover")
+            + ";}"
+        )
 
-            def OpenAddOnManager():
-                Gui.runCommand("Std_AddonMgr", 0)
+        def OpenAddOnManager():
+            Gui.runCommand("Std_AddonMgr", 0)
 
-            Button.clicked.connect(OpenAddOnManager)
-            ApplictionMenu.addWidget(Button)
+        Button.clicked.connect(OpenAddOnManager)
+        ApplictionMenu.addWidget(Button)
+        return
 
+    def on_UpdateCheck_Finished(self, LatestVersion: str):
+        if LatestVersion == "":
+            return
+        print(translate("FreeCAD Ribbon", "Ribbon UI: Latest released version: ") + str(LatestVersion))
+        if self.UpdateVersion != "" or UpdateCheck_Ribbon.IsNewerVersion(LatestVersion, self.CurrentVersion) is False:
+            return
+        self.UpdateVersion = LatestVersion
+        # If the application menu is already created, add the button now
+        ApplictionMenu = self.applicationOptionButton().menu()
+        if ApplictionMenu is not None and self.DeveloperVersion == "":
+            self.AddUpdateButton(ApplictionMenu)
         return
 
     # Function to create the extra menus on the right toolbar
@@ -4297,7 +4401,7 @@ class ModernMenu(RibbonBar):
             QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
             
             # Get the form
-            Dialog = LoadDesign_Ribbon.LoadDialog(self.List_CommandIcons)
+            Dialog = LoadDesign_Ribbon.LoadDialog()
             if Parameters.DOCKED_DIALOGS is False:
                 # Show the form
                 Dialog.form.show()
@@ -4360,6 +4464,9 @@ class ModernMenu(RibbonBar):
         if tabName in self.isWbLoaded and (self.isWbLoaded[tabName] or tabName == ""):
             return
 
+        # The panels are created again, so start with an empty list of buttons for this category
+        self.ButtonRegistry[self.currentCategory().objectName()] = []
+
         workbench = Gui.getWorkbench(workbenchName)
         # Get the list of toolbars from the active workbench
         ListToolbars: list = workbench.listToolbars()
@@ -4468,12 +4575,10 @@ class ModernMenu(RibbonBar):
                             self.HiddenPanels.append(panel)
                             panel.hide()
                                    
-            # Writing to ribbonStructure.json
+            # Writing to ribbonStructure.json.
+            # The writes of all panels are combined into one write
             if UpdateDict is True:
-                JsonFile = Parameters.RIBBON_STRUCTURE_JSON
-                with open(JsonFile, "w") as outfile:
-                    json.dump(Dict, outfile, indent=4)
-                outfile.close()
+                StructureWriter_Ribbon.MarkDirty(Dict)
 
         self.isWbLoaded[tabName] = True
         
@@ -4706,6 +4811,7 @@ class ModernMenu(RibbonBar):
             #
             # get the path for the Json file
             JsonFile = Parameters.RIBBON_STRUCTURE_JSON
+            StructureWriter_Ribbon.Flush()
             # Create a suffix with the date
             Suffix = datetime.now().strftime("%Y%m%d_%H%M%S")
             # Create a backup name
@@ -4728,34 +4834,77 @@ class ModernMenu(RibbonBar):
 
     # region - helper functions
     def hideClassicToolbars(self):
-        for toolbar in mw.findChildren(QToolBar):
-            parentWidget = toolbar.parentWidget()
-            toolbar.setHidden(True)
-            # hide toolbars that are not in the statusBar and show toolbars that are in the statusbar.
-            if (
-                parentWidget.objectName() == "statusBar"
-                or parentWidget.objectName() == "StatusBarArea"
-            ):
-                toolbar.setEnabled(True)
-                toolbar.setVisible(True)
-            #
-            if (
-                mw.toolBarArea(toolbar) == Qt.ToolBarArea.LeftToolBarArea
-                or mw.toolBarArea(toolbar) == Qt.ToolBarArea.RightToolBarArea
-                or mw.toolBarArea(toolbar) == Qt.ToolBarArea.BottomToolBarArea
-            ):
-                toolbar.setEnabled(True)
-                toolbar.setVisible(True)
-            # # # Show specific toolbars and go to the next
-            if toolbar.objectName() != "" and toolbar.objectName() in [
-                self.quickAccessToolBar().objectName(),
-                self.rightToolBar().objectName(),
-            ]:
-                toolbar.setEnabled(True)
-                toolbar.setVisible(True)
-        StatusArea = mw.findChildren(QWidget, "StatusBarArea")
-        for Widget in StatusArea:
-            Widget.show()
+        # The first time, handle all toolbars. After that only the toolbars that are new or shown again.
+        # These are reported by the ClassicToolbarInspector
+        if self.ClassicToolbarsScanned is False:
+            Toolbars = mw.findChildren(QToolBar)
+            for toolbar in Toolbars:
+                self.TrackClassicToolbar(toolbar, Pending=False)
+            self.ClassicToolbarsScanned = True
+        else:
+            Toolbars = list(self.PendingToolbars)
+        self.PendingToolbars.clear()
+
+        for toolbar in Toolbars:
+            try:
+                self.hideClassicToolbar(toolbar)
+            except RuntimeError:
+                # The toolbar is already deleted
+                continue
+
+        if len(self.StatusBarAreas) == 0:
+            self.StatusBarAreas = mw.findChildren(QWidget, "StatusBarArea")
+        for Widget in self.StatusBarAreas:
+            try:
+                Widget.show()
+            except RuntimeError:
+                continue
+        return
+
+    def hideClassicToolbar(self, toolbar: QToolBar):
+        parentWidget = toolbar.parentWidget()
+        Visible = False
+        # hide toolbars that are not in the statusBar and show toolbars that are in the statusbar.
+        if parentWidget is not None and (
+            parentWidget.objectName() == "statusBar"
+            or parentWidget.objectName() == "StatusBarArea"
+        ):
+            Visible = True
+        #
+        if mw.toolBarArea(toolbar) in [
+            Qt.ToolBarArea.LeftToolBarArea,
+            Qt.ToolBarArea.RightToolBarArea,
+            Qt.ToolBarArea.BottomToolBarArea,
+        ]:
+            Visible = True
+        # # # Show specific toolbars
+        if toolbar.objectName() != "" and toolbar.objectName() in [
+            self.quickAccessToolBar().objectName(),
+            self.rightToolBar().objectName(),
+        ]:
+            Visible = True
+
+        if Visible is True:
+            toolbar.setEnabled(True)
+        toolbar.setVisible(Visible)
+        return
+
+    def TrackClassicToolbar(self, toolbar: QToolBar, Pending=True):
+        """Adds a new toolbar of the main window to the toolbars to handle in hideClassicToolbars.
+        A toolbar is tracked once. It is reported again on every polish, so later calls are ignored."""
+        if toolbar in self.TrackedToolbars:
+            return
+        self.TrackedToolbars.add(toolbar)
+        toolbar.installEventFilter(self.ToolbarInspector)
+        toolbar.destroyed.connect(lambda obj=None, toolbar=toolbar: self.ForgetClassicToolbar(toolbar))
+        if Pending is True:
+            self.PendingToolbars.add(toolbar)
+        return
+
+    def ForgetClassicToolbar(self, toolbar: QToolBar):
+        """Removes a deleted toolbar from the tracked and pending toolbars."""
+        self.TrackedToolbars.discard(toolbar)
+        self.PendingToolbars.discard(toolbar)
         return
 
     def UnfoldRibbon(self):
@@ -5040,8 +5189,6 @@ class ModernMenu(RibbonBar):
                 Gui.activateWorkbench(currentCategory.objectName())
                 
                 # Enable all buttons, so you can access them with a right click
-                self.actionList = []
-                # Activate all commands
                 self.activateButtons()
     
                 # Get the command
@@ -5049,11 +5196,8 @@ class ModernMenu(RibbonBar):
                 action = None            
                 Icon = QIcon()
                 if Command is not None:
-                    FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-                    for root, dirs, files in os.walk(FreeCAD_Icons):
-                        for fileName in files:
-                            if CommandName in fileName:
-                                Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
+                    for IconPath in IconIndex_Ribbon.FindContaining(CommandName):
+                        Icon.addPixmap(QPixmap(IconPath))
                     if Icon is not None and Icon.isNull():
                         Icon = Gui.getIcon(
                             CommandInfoCorrections(CommandName)[
@@ -5278,111 +5422,30 @@ class ModernMenu(RibbonBar):
         return ribbonHeight + offset
 
     def ReturnCommandIcon(self, CommandName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a command from the icon store.
 
         Args:
             CommandName (str): Name of the command
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the command icon or None if there is no icon.
         """
-        # Get the standard pixmap, if a pixmap is not provided
-        if pixmap == "":
-            pixmap = StandardFunctions.CommandInfoCorrections(CommandName)["pixmap"]
-        # Define an empty icon
-        Icon = QIcon()
-        # Try to get the icon from file
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-            for root, dirs, files in os.walk(FreeCAD_Icons):
-                for fileName in files:
-                    if CommandName in fileName:
-                        Icon = QIcon()
-                        Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-
-                    if (str(CommandName).endswith("_ddb") and "dropdownButtons" in self.ribbonStructure):
-                        for (DropDownCommand,Commands) in self.ribbonStructure["dropdownButtons"].items():
-                            for CommandItem in self.List_Commands:
-                                if Commands[0][0] == CommandItem[0]:
-                                    pixmap = StandardFunctions.CommandInfoCorrections(CommandItem[0])["pixmap"]
-                                    Icon = StandardFunctions.returnQiCons_Commands(CommandItem[0], pixmap)
-
-        # If the icon is still empty, try to get it from FreeCAD. This will only work with loaded workbenches.
-        # Therefore this is the last resort
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            Icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
-            if (str(CommandName).endswith("_ddb") and "dropdownButtons" in self.ribbonStructure):
-                    for (DropDownCommand,Commands) in self.ribbonStructure["dropdownButtons"].items():
-                        for CommandItem in self.List_Commands:
-                            if Commands[0][0] == CommandItem[0]:
-                                pixmap = StandardFunctions.CommandInfoCorrections(CommandItem[0])["pixmap"]
-                                Icon = StandardFunctions.returnQiCons_Commands(CommandItem[0], pixmap)
-
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            if Parameters.DEBUG_MODE is True:
-                StandardFunctions.Print(
-                    f"An icon retrieved from data file for '{CommandName}'"
-                )
-            DataFile = os.path.join(
-                ConfigDirectory, "RibbonDataFile.dat"
-            )
-
-            if os.path.exists(DataFile) is True:
-                Data = {}
-                # read ribbon structure from JSON file
-                with open(DataFile, "r") as file:
-                    Data.update(json.load(file))
-                file.close()
-                try:
-                    # Load the lists for the deserialized icons
-                    for IconItem in Data["Command_Icons"]:
-                        # This works only for FreeCAD Commands
-                        if CommandName == IconItem[0]:
-                            Icon: QIcon = (
-                                Serialize_Ribbon.deserializeIcon(
-                                    IconItem[1]
-                                )
-                            )
-                            # Add the icons to open the dialog faster a second time
-                            item = [IconItem[0], Icon]
-                            
-                            return Icon
-                except Exception as e:
-                    if Parameters.DEBUG_MODE is True:
-                        StandardFunctions.Print(
-                            f"Trying the get an icon for {CommandName}\n{e}",
-                            "Warning",
-                        )
-                    pass
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            Icon = None
-        return Icon
+        return IconStore_Ribbon.ReturnCommandIcon(
+            CommandName, pixmap, self.ribbonStructure.get("dropdownButtons")
+        )
 
     def ReturnWorkbenchIcon(self, WorkBenchName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a workbench from the icon store.
 
         Args:
-            CommandName (str): Name of the command
+            WorkBenchName (str): Name of the workbench
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the workbench icon.
         """
-        icon = QIcon()
-        for item in self.List_WorkBenchIcons:
-            if item[0] == WorkBenchName:
-                icon = item[1]
-                return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            workbench = Gui.getWorkbench(WorkBenchName)
-            icon = QIcon(workbench.Icon)
-            return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            if pixmap != "":
-                icon = Gui.getIcon(pixmap)
-                return icon
-        return icon
+        return IconStore_Ribbon.ReturnWorkbenchIcon(WorkBenchName, pixmap)
 
     def RunCommand(self, Command: str):
         try:
@@ -6131,13 +6194,10 @@ class ModernMenu(RibbonBar):
                             text = action.text()
                                                 
                         # Try to get the icon from the stored freecad icons                      
-                        FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-                        for root, dirs, files in os.walk(FreeCAD_Icons):
-                            for fileName in files:
-                                if CommandName in fileName:
-                                    Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                                    action.setIcon(Icon)
-                                    break
+                        IconPath = IconIndex_Ribbon.FindFirstContaining(CommandName)
+                        if IconPath != "":
+                            Icon.addPixmap(QPixmap(IconPath))
+                            action.setIcon(Icon)
                         
                         # If not get the Icon from FreeCAD or the data file
                         if Icon.isNull():
@@ -6159,11 +6219,6 @@ class ModernMenu(RibbonBar):
                         if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
                             Icon = Gui.getIcon("preferences-workbenches")
                             action.setIcon(Icon)
-                        
-                        # Add the icon to the iconList 
-                        newItem = [CommandName, Icon]
-                        if newItem not in self.List_CommandIcons:
-                            self.List_CommandIcons.append(newItem)
 
                         # get button size from ribbonStructure
                         try:
@@ -6433,8 +6488,8 @@ class ModernMenu(RibbonBar):
         spacer.setMinimumSize(0, panel.height() - panel._titleWidget.height())
         panel.addWidget(spacer, rowSpan=6)
 
-        # Enable all buttons, so you can access them with a right click
-        self.activateButtons()
+        # Register the buttons and enable them, so you can access them with a right click
+        self.activateButtons(panel)
 
         if panel._actionsLayout.count() > 1:            
             return panel
@@ -6899,17 +6954,55 @@ class ModernMenu(RibbonBar):
         except Exception:
             return False
         
-    def activateButtons(self):
-         # Enable all buttons, so you can access them with a right click
+    def activateButtons(self, Widget: QWidget = None):
+        """Enables the buttons of the current category and the quick access toolbar,
+        so you can access them with a right click.
+
+        Args:
+            Widget (QWidget, optional): a new panel. Its buttons are added to the registry of the current category
+            and only these buttons are enabled. Defaults to None.
+        """
+        if self.currentCategory() is None:
+            return
+        CategoryName = self.currentCategory().objectName()
+        if Widget is not None:
+            Buttons = Widget.findChildren(QToolButton)
+            # If the category is not registered yet, all its buttons are found on the first activation
+            if CategoryName in self.ButtonRegistry:
+                self.ButtonRegistry[CategoryName].extend(Buttons)
+        else:
+            if CategoryName not in self.ButtonRegistry:
+                self.ButtonRegistry[CategoryName] = self.currentCategory().findChildren(QToolButton)
+            Buttons = self.ButtonRegistry[CategoryName] + self.quickAccessToolBar().findChildren(QToolButton)
+
         if self.isLoaded:
-            for child in mw.findChildren(QToolButton):
+            for child in Buttons:
                 try:
+                    # Store the original state, the first time the button is activated in the customize enviroment
+                    if self.CustomizeEnabled is True and child not in self.ButtonStates:
+                        self.ButtonStates[child] = (
+                            child.isEnabled(),
+                            [(subAction, subAction.isEnabled()) for subAction in child.actions()],
+                        )
                     for subAction in child.actions():
-                        subAction.setEnabled(True)                
+                        subAction.setEnabled(True)
+                    child.setEnabled(True)
                 except Exception:
-                    pass
-                child.setEnabled(True)
-            # Gui.updateGui()
+                    # The button is already deleted
+                    continue
+        return
+
+    def restoreButtons(self):
+        """Restores the state of the buttons and their actions from before they were activated."""
+        for child, State in self.ButtonStates.items():
+            try:
+                for subAction, Enabled in State[1]:
+                    subAction.setEnabled(Enabled)
+                child.setEnabled(State[0])
+            except Exception:
+                # The button is already deleted
+                continue
+        self.ButtonStates.clear()
         return
     
     def BuildQuickToolbar(self, ButtonList = []):
@@ -7363,6 +7456,8 @@ class ModernMenu(RibbonBar):
         # Update the json file but make also an backup
         # get the path for the Json file
         JsonFile = Parameters.RIBBON_STRUCTURE_JSON
+        # Write pending changes first, so that the backup is up-to-date
+        StructureWriter_Ribbon.Flush()
 
         # create a copy and rename it as a backup if enabled
         if Parameters.ENABLE_BACKUP is True:
@@ -7374,10 +7469,7 @@ class ModernMenu(RibbonBar):
             shutil.copy(JsonFile, BackupFile)
 
         # Writing to sample.json
-        with open(JsonFile, "w") as outfile:
-            json.dump(self.ribbonStructure, outfile, indent=4)
-
-        outfile.close()
+        StructureWriter_Ribbon.WriteNow(self.ribbonStructure, JsonFile)
         
         if RestartFreeCAD is True:
             message = translate(
@@ -7392,6 +7484,27 @@ class ModernMenu(RibbonBar):
 
     # endregion
 
+class ClassicToolbarInspector(QObject):
+    """Reports new toolbars of the main window and toolbars that are shown again to the ribbon.
+    hideClassicToolbars then only needs to handle these toolbars.
+    """
+
+    def __init__(self, RibbonBar: ModernMenu):
+        super(ClassicToolbarInspector, self).__init__(RibbonBar)
+        self.RibbonBar = RibbonBar
+
+    def eventFilter(self, obj, event: QEvent):
+        # A new toolbar is reported when it is added to the main window and when it is fully created
+        if event.type() == QEvent.Type.ChildAdded or event.type() == QEvent.Type.ChildPolished:
+            child = event.child()
+            if isinstance(child, QToolBar):
+                self.RibbonBar.TrackClassicToolbar(child)
+        # A toolbar is shown again, for example by FreeCAD when switching workbenches
+        if event.type() == QEvent.Type.Show and isinstance(obj, QToolBar):
+            self.RibbonBar.PendingToolbars.add(obj)
+        return False
+
+
 class EventInspector(QObject):
     def __init__(self, parent):
         super(EventInspector, self).__init__(parent)
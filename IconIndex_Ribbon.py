@@ -0,0 +1,217 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Index for the icons in "Resources/FreeCAD Icons".
+# The ribbon and its dialogs used to walk the whole folder for every command.
+# This module builds the index once per addon version, stores it in the config directory
+# and loads it at import. After that each lookup is a dict lookup (exact name)
+# or a binary search in a sorted list of filename suffixes (substring match).
+import os
+import json
+from bisect import bisect_left
+import Standard_Functions_Ribbon as StandardFunctions
+from Parameters_Ribbon import Parameters
+
+# Set the index file version. Increasing this, results in a rebuild of the index
+IconIndexVersion = "1.0"
+
+ICON_DIRECTORY = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons")
+)
+INDEX_FILE = os.path.join(Parameters.CONFIG_DIR, "RibbonIconIndex.json")
+
+
+class IconIndex:
+    """
+    Lookup table for the bundled FreeCAD icons.
+
+    Files:          file name -> absolute path
+    Stems:          file name without extension -> list of file names
+    Suffixes:       sorted list of all suffixes of all file names, used for substring lookups.
+                    Created on the first substring lookup.
+    SuffixOwners:   file name that belongs to the suffix at the same position
+    """
+
+    def __init__(self, FileNames: dict, Key: dict = {}):
+        self.Key = Key
+        self.Files = {}
+        self.Stems = {}
+        for fileName, relativePath in FileNames.items():
+            self.Files[fileName] = os.path.join(ICON_DIRECTORY, relativePath)
+            # The name of an icon is the part of the file name before the first dot
+            self.Stems.setdefault(fileName.split(".")[0], []).append(fileName)
+
+        # The suffix array is created on the first substring lookup
+        self.Suffixes = None
+        self.SuffixOwners = None
+
+        # Cache for substring lookups that are repeated (e.g. when a dialog is opened twice)
+        self._ContainingCache = {}
+        return
+
+    def _BuildSuffixes(self):
+        # Create a suffix array of all file names.
+        # Every file that contains a name, has a suffix that starts with that name.
+        SuffixList = []
+        for fileName in self.Files:
+            for i in range(len(fileName)):
+                SuffixList.append((fileName[i:], fileName))
+        SuffixList.sort()
+        self.Suffixes = [item[0] for item in SuffixList]
+        self.SuffixOwners = [item[1] for item in SuffixList]
+        return
+
+    def FindExact(self, Name: str) -> str:
+        """Returns the path of the icon whose name without extension equals Name.
+
+        Args:
+            Name (str): Name of the icon, mostly the command name.
+
+        Returns:
+            str: the path of the icon or "" if there is none.
+        """
+        fileNames = self.Stems.get(Name)
+        if fileNames is None:
+            return ""
+        return self.Files[sorted(fileNames)[-1]]
+
+    def FindContaining(self, Name: str) -> list:
+        """Returns the paths of all icons whose file name contains Name.
+
+        Args:
+            Name (str): Part of the icon name, mostly the command name.
+
+        Returns:
+            list: sorted list of paths. Empty if there are none.
+        """
+        if Name == "":
+            return []
+        if Name in self._ContainingCache:
+            return self._ContainingCache[Name]
+
+        if self.Suffixes is None:
+            self._BuildSuffixes()
+
+        fileNames = set()
+        i = bisect_left(self.Suffixes, Name)
+        while i < len(self.Suffixes) and self.Suffixes[i].startswith(Name):
+            fileNames.add(self.SuffixOwners[i])
+            i = i + 1
+        result = [self.Files[fileName] for fileName in sorted(fileNames)]
+
+        self._ContainingCache[Name] = result
+        return result
+
+    def FindFirstContaining(self, Name: str) -> str:
+        """Returns the path of the first icon whose file name contains Name, or "" if there is none."""
+        result = self.FindContaining(Name)
+        if len(result) > 0:
+            return result[0]
+        return ""
+
+
+# region - helper functions
+def ReturnIndexKey() -> dict:
+    """Returns the values the stored index is checked against."""
+    PackageXML = os.path.join(os.path.dirname(__file__), "package.xml")
+    AddonVersion = ""
+    try:
+        AddonVersion = StandardFunctions.ReturnXML_Value(PackageXML, "version")
+    except Exception:
+        pass
+    DirectoryTime = 0
+    if os.path.isdir(ICON_DIRECTORY):
+        DirectoryTime = os.stat(ICON_DIRECTORY).st_mtime_ns
+    return {
+        "indexVersion": IconIndexVersion,
+        "addonVersion": AddonVersion,
+        "iconDirectory": ICON_DIRECTORY,
+        "directoryTime": DirectoryTime,
+    }
+
+
+def ScanIconDirectory() -> dict:
+    """Walks the icon directory once and returns a dict of file name -> path relative to the icon directory."""
+    FileNames = {}
+    for root, dirs, files in os.walk(ICON_DIRECTORY):
+        for fileName in files:
+            FileNames[fileName] = os.path.relpath(
+                os.path.join(root, fileName), ICON_DIRECTORY
+            )
+    return FileNames
+
+
+def BuildIndex(Key: dict = None) -> IconIndex:
+    """Scans the icon directory, writes the index file and returns the index."""
+    if Key is None:
+        Key = ReturnIndexKey()
+    FileNames = ScanIconDirectory()
+    Data = {}
+    Data["key"] = Key
+    Data["files"] = FileNames
+    try:
+        if os.path.isdir(os.path.dirname(INDEX_FILE)) is False:
+            os.makedirs(os.path.dirname(INDEX_FILE))
+        with open(INDEX_FILE, "w") as outfile:
+            json.dump(Data, outfile)
+        outfile.close()
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(
+                f"Ribbon UI: Icon index not written. {e}", "Warning"
+            )
+    return IconIndex(FileNames, Key)
+
+
+def LoadIndex() -> IconIndex:
+    """Loads the stored index. If it is missing or made for another addon version, it is rebuild."""
+    Key = ReturnIndexKey()
+    if os.path.exists(INDEX_FILE) is True:
+        try:
+            Data = {}
+            with open(INDEX_FILE, "r") as file:
+                Data.update(json.load(file))
+            file.close()
+            if Data["key"] == Key:
+                return IconIndex(Data["files"], Key)
+        except Exception:
+            pass
+    return BuildIndex(Key)
+
+
+# endregion
+
+
+# The index that is shared by the ribbon and its dialogs
+Index = LoadIndex()
+
+
+def FindExact(Name: str) -> str:
+    return Index.FindExact(Name)
+
+
+def FindContaining(Name: str) -> list:
+    return Index.FindContaining(Name)
+
+
+def FindFirstContaining(Name: str) -> str:
+    return Index.FindFirstContaining(Name)
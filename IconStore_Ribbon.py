@@ -0,0 +1,255 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# One store for the icons of commands and workbenches, used by the ribbon and its dialogs.
+#
+# An icon is looked up in this order: an icon file from the addon, FreeCAD (Gui.getIcon),
+# the action of the command and at last the data file. Found icons are kept by name,
+# so opening a dialog again does not need to look them up or decode them again.
+# Rendered icon files and icons from FreeCAD are taken from the raster cache on disk (RasterCache_Ribbon).
+# Only the most recently used icons are kept.
+import os
+from collections import OrderedDict
+
+import FreeCADGui as Gui
+from PySide.QtGui import QIcon, QPixmap
+
+from Parameters_Ribbon import Parameters
+import Standard_Functions_Ribbon as StandardFunctions
+import IconIndex_Ribbon
+import DataFile_Ribbon
+import Serialize_Ribbon
+import RasterCache_Ribbon
+
+# The maximum number of icons to keep
+ICON_STORE_SIZE = 4096
+
+# The sections used as keys
+COMMANDS = "Command_Icons"
+WORKBENCHES = "WorkBench_Icons"
+
+
+class IconStore:
+    """Keeps icons by section and name. When full, the least recently used icon is removed."""
+
+    def __init__(self, MaxSize: int = ICON_STORE_SIZE):
+        self.MaxSize = MaxSize
+        self.Icons = OrderedDict()
+        # Counters for checking the store
+        self.Hits = 0
+        self.Misses = 0
+
+    def __len__(self):
+        return len(self.Icons)
+
+    def Get(self, Section: str, Name: str) -> QIcon:
+        """Returns the stored icon or None if it is not stored."""
+        Icon = self.Icons.get((Section, Name))
+        if Icon is None:
+            self.Misses = self.Misses + 1
+            return None
+        self.Hits = self.Hits + 1
+        self.Icons.move_to_end((Section, Name))
+        return Icon
+
+    def Put(self, Section: str, Name: str, Icon: QIcon):
+        self.Icons[(Section, Name)] = Icon
+        self.Icons.move_to_end((Section, Name))
+        if len(self.Icons) > self.MaxSize:
+            self.Icons.popitem(last=False)
+        return
+
+    def Clear(self):
+        self.Icons.clear()
+        self.Hits = 0
+        self.Misses = 0
+        return
+
+
+Store = IconStore()
+
+# Command name -> True if the icon is not a placeholder. See IsValidCommandIcon
+IconValidity = {}
+
+
+def IsEmpty(Icon: QIcon) -> bool:
+    return Icon is None or Icon.isNull()
+
+
+def ReturnFileIcon(FilePath: str) -> QIcon:
+    """Returns the icon of an icon file. Vector files are rendered at the requested size."""
+    if FilePath.lower().endswith(RasterCache_Ribbon.VECTOR_EXTENSIONS):
+        return QIcon(FilePath)
+    Icon = QIcon()
+    Icon.addPixmap(QPixmap(FilePath))
+    return Icon
+
+
+def ReturnDataFileIcon(Section: str, Name: str) -> QIcon:
+    """Returns an icon from the data file, or None if it is not in there."""
+    DataFile = os.path.join(Parameters.CONFIG_DIR, "RibbonDataFile.dat")
+    try:
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
+        if Data is None:
+            return None
+        iconPixmaps = Data.ReturnIcon(Section, Name)
+        if iconPixmaps is None:
+            return None
+        return Serialize_Ribbon.deserializeIcon(iconPixmaps)
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"Trying the get an icon for {Name}\n{e}", "Warning")
+        return None
+
+
+def ResolveCommandIcon(CommandName: str, pixmap: str = "") -> QIcon:
+    """Looks up the icon of a command without the store. Returns None if there is no icon."""
+    # The icon files of the addon
+    Icon = None
+    IconPath = IconIndex_Ribbon.FindExact(CommandName)
+    if IconPath == "":
+        IconPaths = IconIndex_Ribbon.FindContaining(CommandName)
+        if len(IconPaths) > 0:
+            IconPath = IconPaths[-1]
+    if IconPath != "":
+        Icon = RasterCache_Ribbon.ReturnIcon(
+            RasterCache_Ribbon.ReturnSourceKey_File(IconPath),
+            lambda: ReturnFileIcon(IconPath),
+        )
+
+    # FreeCAD and the action of the command. This will only work with loaded workbenches
+    if IsEmpty(Icon):
+        if pixmap == "":
+            pixmap = StandardFunctions.CommandInfoCorrections(CommandName)["pixmap"]
+        # Icons that FreeCAD knows by name, are taken from the raster cache first.
+        # Subcommands ("Command, 1") get the icon of their action
+        if pixmap != "" and len(CommandName.split(", ")) == 1:
+            Icon = RasterCache_Ribbon.ReturnIcon(
+                RasterCache_Ribbon.ReturnSourceKey_Pixmap(pixmap),
+                lambda: Gui.getIcon(pixmap),
+            )
+    if IsEmpty(Icon):
+        Icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
+
+    # The data file. This works only for FreeCAD commands
+    if IsEmpty(Icon):
+        Icon = ReturnDataFileIcon(COMMANDS, CommandName)
+        if Parameters.DEBUG_MODE is True and IsEmpty(Icon) is False:
+            StandardFunctions.Print(f"An icon retrieved from data file for '{CommandName}'", "Log")
+
+    if IsEmpty(Icon):
+        return None
+    return Icon
+
+
+def ReturnCommandIcon(CommandName: str, pixmap: str = "", DropDownButtons: dict = None) -> QIcon:
+    """Returns the icon of a command.
+
+    Args:
+        CommandName (str): the name of the command.
+        pixmap (str, optional): the name of the icon in FreeCAD. Defaults to "", which uses the pixmap of the command.
+        DropDownButtons (dict, optional): the dropdown buttons of the ribbon structure.
+            A dropdown button gets the icon of its first command. Defaults to None.
+
+    Returns:
+        QIcon: the icon or None if there is no icon.
+    """
+    if str(CommandName).endswith("_ddb") and DropDownButtons is not None:
+        Commands = DropDownButtons.get(CommandName)
+        if Commands is not None and len(Commands) > 0:
+            CommandName = Commands[0][0]
+            pixmap = ""
+
+    Icon = Store.Get(COMMANDS, CommandName)
+    if Icon is None:
+        Icon = ResolveCommandIcon(CommandName, pixmap)
+        # Icons that are not found are not stored. They can be found after their workbench is loaded
+        if Icon is None:
+            return None
+        Store.Put(COMMANDS, CommandName, Icon)
+    # Return a copy, so that changes by the caller do not end up in the store
+    return QIcon(Icon)
+
+
+def ReturnWorkbenchIcon(WorkBenchName: str, pixmap: str = "") -> QIcon:
+    """Returns the icon of a workbench, or an empty icon if there is none.
+
+    Args:
+        WorkBenchName (str): the name of the workbench.
+        pixmap (str, optional): the name of the icon in FreeCAD, used as backup. Defaults to "".
+    """
+    Icon = Store.Get(WORKBENCHES, WorkBenchName)
+    if Icon is None:
+        try:
+            WorkbenchIcon = Gui.getWorkbench(WorkBenchName).Icon
+            Icon = RasterCache_Ribbon.ReturnIcon(
+                RasterCache_Ribbon.ReturnSourceKey_File(WorkbenchIcon),
+                lambda: QIcon(WorkbenchIcon),
+            )
+        except Exception:
+            Icon = None
+        if IsEmpty(Icon) and pixmap != "":
+            Icon = RasterCache_Ribbon.ReturnIcon(
+                RasterCache_Ribbon.ReturnSourceKey_Pixmap(pixmap),
+                lambda: Gui.getIcon(pixmap),
+            )
+        if IsEmpty(Icon):
+            Icon = ReturnDataFileIcon(WORKBENCHES, WorkBenchName)
+        if IsEmpty(Icon):
+            return QIcon()
+        Store.Put(WORKBENCHES, WorkBenchName, Icon)
+    return QIcon(Icon)
+
+
+def ReturnDataFileIconFlags() -> dict:
+    """Returns the flags of the command icons from the data file: {command name: [valid, thumbnail hash]}."""
+    DataFile = os.path.join(Parameters.CONFIG_DIR, "RibbonDataFile.dat")
+    try:
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
+        if Data is None:
+            return {}
+        return Data.get("Command_IconFlags", {})
+    except Exception:
+        return {}
+
+
+def IsValidCommandIcon(CommandName: str, Icon: QIcon) -> bool:
+    """Returns True if the icon of a command is a real icon and not a placeholder.
+
+    The flag is taken from the data file. Commands that are not in there, are checked once.
+    """
+    Valid = IconValidity.get(CommandName)
+    if Valid is None:
+        Flags = ReturnDataFileIconFlags().get(CommandName)
+        if Flags is not None:
+            Valid = Flags[0]
+        else:
+            Valid = IsEmpty(Icon) is False and Serialize_Ribbon.isValidIcon(Icon)
+        IconValidity[CommandName] = Valid
+    return Valid
+
+
+def Clear():
+    """Removes all icons, for example after the data file is created again."""
+    Store.Clear()
+    IconValidity.clear()
+    return
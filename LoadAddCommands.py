@@ -55,6 +55,10 @@ from Standard_Functions_Ribbon import CommandInfoCorrections
 import Parameters_Ribbon
 from Parameters_Ribbon import Parameters
 import Serialize_Ribbon
+import DataFile_Ribbon
+import IconIndex_Ribbon
+import IconStore_Ribbon
+import StructureWriter_Ribbon
 import CacheFunctions
 import FCBinding
 from CustomWidgets import QuickAccessToolButton, CustomControls
@@ -99,9 +103,6 @@ class LoadDialog(AddCommands_ui.Ui_Form):
     # Create a dict for the dropdownbuttons and newPanels
     Dict_DropDownButtons = {}
     Dict_NewPanels = {}
-    # Create the lists for the deserialized icons
-    List_CommandIcons = []
-    List_WorkBenchIcons = []
     
     # Create lists for the several list in the json file.
     List_IgnoredToolbars = []
@@ -135,7 +136,6 @@ class LoadDialog(AddCommands_ui.Ui_Form):
         
         RibbonBar: FCBinding.ModernMenu = mw.findChild(FCBinding.ModernMenu, "Ribbon") 
         
-        self.List_CommandIcons = RibbonBar.List_CommandIcons
         self.List_IgnoredWorkbenches = RibbonBar.ribbonStructure["ignoredWorkbenches"]
 
         # Set the wait cursor
@@ -199,11 +199,8 @@ class LoadDialog(AddCommands_ui.Ui_Form):
         
         # region - Load data------------------------------------------------------------------
         #
-        Data = {}
-        # read ribbon structure from JSON file
-        with open(DataFile, "r") as file:
-            Data.update(json.load(file))
-        file.close()
+        # Open the data file. An older JSON data file is converted first
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
 
         DataUpdateNeeded = False
         try:
@@ -250,7 +247,9 @@ class LoadDialog(AddCommands_ui.Ui_Form):
         except Exception:
             pass
 
-        # Load the standard lists for Workbenches, toolbars and commands
+        # Load the standard lists for Workbenches, toolbars and commands.
+        # Get the data file again, in case it was recreated above
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
         self.List_Workbenches = Data["List_Workbenches"]
         self.StringList_Toolbars = Data["StringList_Toolbars"]
         self.List_Commands = Data["List_Commands"]
@@ -273,63 +272,8 @@ class LoadDialog(AddCommands_ui.Ui_Form):
             if Answer == "yes":
                 CacheFunctions.CreateCache()
 
-        # Load icons for all workbenches
-        try:
-            for IconItem in Data["WorkBench_Icons"]:
-                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                item = [IconItem[0], Icon]
-                if item not in self.List_CommandIcons:
-                    self.List_WorkBenchIcons.append(item)
-        except Exception as e:
-            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
-            pass
-        
-        # Load icons for all commands
-        try:
-            for CommandItem in self.List_Commands:
-                isInList = False
-                for IconItem in self.List_CommandIcons:
-                    if CommandItem[0] == IconItem[0]:
-                        isInList = True
-                        if Parameters.DEBUG_MODE:
-                            print(f"{CommandItem[0]} already present in the list")
-                        break
-                    
-                if isInList is False:
-                    # Check first if the icon can be loaded quickly
-                    Icon = QIcon()                                  
-                    FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-                    for root, dirs, files in os.walk(FreeCAD_Icons):
-                        for fileName in files:
-                            if CommandItem[0] == fileName.split(".")[0]:
-                                Icon = QIcon()
-                                Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                                # Print a message when debug mode is enabled
-                                if Parameters.DEBUG_MODE:
-                                    print(f"{fileName} created from resources")
-                    
-                    if Icon is None or (Icon is not None and Icon.isNull()):
-                        IconName = StandardFunctions.CommandInfoCorrections(CommandItem[0])["pixmap"]      
-                        Icon = StandardFunctions.returnQiCons_Commands(CommandItem[0], IconName)
-                        # Print a message when debug mode is enabled
-                        if Parameters.DEBUG_MODE:
-                            print(f"Icon for {CommandItem[0]} retrieved from FreeCAD")
-                                    
-                    # If the Icon is still none or empty, get it from the datafile
-                    if Icon is None or (Icon is not None and Icon.isNull()):
-                        for IconItem in Data["Command_Icons"]:
-                            if IconItem[0] == CommandItem[0] and IconItem[0] != "" and CommandItem[0] != "":
-                                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                                # Print a message when debug mode is enabled
-                                if Parameters.DEBUG_MODE:
-                                    print(f"Icon for {CommandItem[0]} retrieved from data file")
-                    
-                    # Add the icon to the icon list
-                    item = [CommandItem[0], Icon]
-                    self.List_CommandIcons.append(item)
-        except Exception as e:
-            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
-            pass
+        # The icons for the workbenches and commands are loaded when needed from the icon store
+        # and kept there, so that the dialog opens faster the next time
 
         # check if the list with workbenches is up-to-date
         missingWB = []
@@ -724,7 +668,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
                                         
                     if Icon is not None and Icon.isNull() is False:
                         # Check if there is an Icon. if not add a replacement
-                        if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                        if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                             # Icon = Gui.getIcon("preferences-workbenches")
                             # ListWidgetItem.setIcon(Icon)
                             continue
@@ -1618,7 +1562,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
             self.form.hide()
         
         # Create the data file
-        CacheFunctions.CreateCache()
+        CacheFunctions.CreateCache(Incremental=True)
 
         # if RestartFreeCAD is False:
         #     # Show the dialog again
@@ -1724,7 +1668,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
                                             
                                         if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                             # Check if there is an Icon. if not add a replacement
-                                            if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                            if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                                 # Icon = Gui.getIcon("preferences-workbenches")
                                                 # ListWidgetItem.setIcon(Icon)
                                                 continue
@@ -1877,7 +1821,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
                                             
                                         if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                             # Check if there is an Icon. if not add a replacement
-                                            if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                            if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                                 # Icon = Gui.getIcon("preferences-workbenches")
                                                 # ListWidgetItem.setIcon(Icon)
                                                 continue
@@ -1918,7 +1862,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
                                     
                                 if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                     # Check if there is an Icon. if not add a replacement
-                                    if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                    if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                         # Icon = Gui.getIcon("preferences-workbenches")
                                         # ListWidgetItem.setIcon(Icon)
                                         continue
@@ -1953,7 +1897,7 @@ class LoadDialog(AddCommands_ui.Ui_Form):
                                     
                                 if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                     # Check if there is an Icon. if not add a replacement
-                                    if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                    if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                         # Icon = Gui.getIcon("preferences-workbenches")
                                         # ListWidgetItem.setIcon(Icon)
                                         continue
@@ -1995,148 +1939,28 @@ class LoadDialog(AddCommands_ui.Ui_Form):
         return
     
     def ReturnCommandIcon(self, CommandName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a command from the icon store.
 
         Args:
             CommandName (str): Name of the command
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the command icon or None if there is no icon.
         """
-        RibbonBar: FCBinding.ModernMenu = mw.findChild(FCBinding.ModernMenu, "Ribbon") 
-        
-        # Define an empty icon
-        Icon = QIcon()
-        # Try to get the icon from the icon list first. This list is created on load and is the fasted to read
-        for item in self.List_CommandIcons:
-            if CommandName in item[0]:
-                Icon = item[1]
-                return Icon
-            if (str(CommandName).endswith("_ddb") and "dropdownButtons" in RibbonBar.workBenchDict):
-                for (DropDownCommand, Commands) in RibbonBar.workBenchDict["dropdownButtons"].items():
-                    if DropDownCommand == CommandName and Commands[0][0] == item[0]:
-                        Icon = item[1]
-
-        # If the icon is still empty, try to get the icon from file
-        if Icon is None or (Icon is not None and Icon.isNull()):            
-            FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-            for root, dirs, files in os.walk(FreeCAD_Icons):
-                for fileName in files:
-                    if CommandName in fileName:
-                        Icon = QIcon()
-                        Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                        # Add the icons to open the dialog faster a second time
-                        item = [CommandName, Icon]
-                        self.List_CommandIcons.append(item)
-                        
-                        # Print a message when debug mode is enabled
-                        if Parameters.DEBUG_MODE:
-                            print(f"{fileName} created from resources")
-                        return Icon
-                    
-                    if (str(CommandName).endswith("_ddb") and "dropdownButtons" in RibbonBar.workBenchDict):
-                        for (DropDownCommand,Commands) in RibbonBar.workBenchDict["dropdownButtons"].items():
-                            if DropDownCommand == CommandName and Commands[0][0] in fileName:
-                                Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                                # Add the icons to open the dialog faster a second time
-                                item = [CommandName, Icon]
-                                self.List_CommandIcons.append(item)
-                                
-                                # Print a message when debug mode is enabled
-                                if Parameters.DEBUG_MODE:
-                                    print(f"{fileName} created from resources")
-                                return Icon
-                                   
-            # If the icon is still empty, try to get it from FreeCAD. This will only work with loaded workbenches.
-            # Therefore this is the last resort
-            if Icon is None or (Icon is not None and Icon.isNull()):
-                # Get the standard pixmap, if a pixmap is not provided
-                if pixmap == "":
-                    pixmap = StandardFunctions.CommandInfoCorrections(CommandName)["pixmap"]
-                Icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
-                if (str(CommandName).endswith("_ddb") and "dropdownButtons" in RibbonBar.workBenchDict):
-                        for (DropDownCommand,Commands) in RibbonBar.workBenchDict["dropdownButtons"].items():
-                            if DropDownCommand == CommandName:
-                                pixmap = StandardFunctions.CommandInfoCorrections(Commands[0][0])["pixmap"]
-                                Icon = StandardFunctions.returnQiCons_Commands(Commands[0][0], pixmap)
-                                # Add the icons to open the dialog faster a second time
-                                item = [Commands[0][0], Icon]
-                                self.List_CommandIcons.append(item)
-                                
-                                if Parameters.DEBUG_MODE:
-                                    print(f"Icon for {Commands[0][0]} retrieved from FreeCAD")
-                                return Icon
-
-                if Icon is None or (Icon is not None and Icon.isNull()):
-                    if Parameters.DEBUG_MODE is True:
-                        StandardFunctions.Print(
-                            f"An icon retrieved from data file for '{CommandName}'"
-                        )
-                    DataFile = os.path.join(
-                        ConfigDirectory, "RibbonDataFile.dat"
-                    )
-
-                    if os.path.exists(DataFile) is True:
-                        Data = {}
-                        # read ribbon structure from JSON file
-                        with open(DataFile, "r") as file:
-                            Data.update(json.load(file))
-                        file.close()
-                        try:
-                            # Load the lists for the deserialized icons
-                            for IconItem in Data["Command_Icons"]:
-                                # This works only for FreeCAD Commands
-                                if CommandName == IconItem[0]:
-                                    Icon: QIcon = (
-                                        Serialize_Ribbon.deserializeIcon(
-                                            IconItem[1]
-                                        )
-                                    )
-                                    # Print a message when debug mode is enabled
-                                    if Parameters.DEBUG_MODE:
-                                        print(f"Icon for {CommandName} retrieved from data file")
-                                    
-                                    # Add the icons to open the dialog faster a second time
-                                    item = [IconItem[0], Icon]
-                                    self.List_CommandIcons.append(item)
-                                    
-                                    return Icon
-                        except Exception as e:
-                            if Parameters.DEBUG_MODE is True:
-                                StandardFunctions.Print(
-                                    f"Trying the get an icon for {CommandName}\n{e}",
-                                    "Warning",
-                                )
-                            pass
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            Icon = None
-        return Icon
+        return IconStore_Ribbon.ReturnCommandIcon(CommandName, pixmap, mw.findChild(FCBinding.ModernMenu, "Ribbon").workBenchDict.get("dropdownButtons"))
 
     def ReturnWorkbenchIcon(self, WorkBenchName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a workbench from the icon store.
 
         Args:
-            CommandName (str): Name of the command
+            WorkBenchName (str): Name of the workbench
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the workbench icon.
         """
-        icon = QIcon()
-        for item in self.List_WorkBenchIcons:
-            if item[0] == WorkBenchName:
-                icon = item[1]
-                return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            workbench = Gui.getWorkbench(WorkBenchName)
-            icon = QIcon(workbench.Icon)
-            return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            if pixmap != "":
-                icon = Gui.getIcon(pixmap)
-                return icon
-        return icon
+        return IconStore_Ribbon.ReturnWorkbenchIcon(WorkBenchName, pixmap)
 
     def returnWorkBenchToolbars(self, WorkBenchName):
         wbToolbars = []
@@ -2590,6 +2414,8 @@ class LoadDialog(AddCommands_ui.Ui_Form):
         return
     
     def ReadJson(self, Section="All", JsonFile=""):
+        # Write pending changes of the ribbon first
+        StructureWriter_Ribbon.Flush()
         # Open the JsonFile and load the data
         try:
             if JsonFile != "":
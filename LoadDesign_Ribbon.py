@@ -54,6 +54,10 @@ from Standard_Functions_Ribbon import CommandInfoCorrections
 import Parameters_Ribbon
 from Parameters_Ribbon import Parameters
 import Serialize_Ribbon
+import DataFile_Ribbon
+import IconIndex_Ribbon
+import IconStore_Ribbon
+import StructureWriter_Ribbon
 import webbrowser
 import StyleMapping_Ribbon
 import CacheFunctions
@@ -114,9 +118,6 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
 
     List_IgnoredToolbars_internal = []
 
-    # Create the lists for the deserialized icons
-    List_CommandIcons = []
-    List_WorkBenchIcons = []
 
     # Create a tomporary list for newly added dropdown buttons
     newDDBList = []
@@ -128,13 +129,10 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
     listWidgetItems = []
     listWidgetItems_DDB = []
 
-    def __init__(self, IconList):
+    def __init__(self):
 
         # Makes "self.on_CreateBOM_clicked" listen to the changed control values instead initial values
         super(LoadDialog, self).__init__()
-        
-        # Load the icons for the commands
-        self.List_CommandIcons = IconList
 
         # Set the wait cursor
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
@@ -218,74 +216,16 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
 
         # region - Load data------------------------------------------------------------------
         #
-        Data = {}
-        # read ribbon structure from JSON file
-        with open(DataFile, "r") as file:
-            Data.update(json.load(file))
-        file.close()
+        # Open the data file. An older JSON data file is converted first
+        Data = DataFile_Ribbon.OpenDataFile(DataFile)
 
         # Load the standard lists for Workbenches, toolbars and commands
         self.List_Workbenches = Data["List_Workbenches"]
         self.StringList_Toolbars = Data["StringList_Toolbars"]
         self.List_Commands = Data["List_Commands"]
 
-        # Load icons for all workbenches
-        try:
-            for IconItem in Data["WorkBench_Icons"]:
-                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                item = [IconItem[0], Icon]
-                if item not in self.List_CommandIcons:
-                    self.List_WorkBenchIcons.append(item)
-        except Exception as e:
-            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
-            pass
-        
-        # Load icons for all commands
-        try:
-            for CommandItem in self.List_Commands:
-                isInList = False
-                for IconItem in self.List_CommandIcons:
-                    if CommandItem[0] == IconItem[0]:
-                        isInList = True
-                        if Parameters.DEBUG_MODE:
-                            print(f"{CommandItem[0]} already present in the list")
-                        break
-                    
-                if isInList is False:
-                    # Check first if the icon can be loaded quickly
-                    Icon = QIcon()                                  
-                    FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-                    for root, dirs, files in os.walk(FreeCAD_Icons):
-                        for fileName in files:
-                            if CommandItem[0] == fileName.split(".")[0]:
-                                Icon = QIcon()
-                                Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                                # Print a message when debug mode is enabled
-                                if Parameters.DEBUG_MODE:
-                                    print(f"{fileName} created from resources")
-                    
-                    if Icon is None or (Icon is not None and Icon.isNull()):
-                        IconName = StandardFunctions.CommandInfoCorrections(CommandItem[0])["pixmap"]      
-                        Icon = StandardFunctions.returnQiCons_Commands(CommandItem[0], IconName)
-                        # Print a message when debug mode is enabled
-                        if Parameters.DEBUG_MODE:
-                            print(f"Icon for {CommandItem[0]} retrieved from FreeCAD")
-                                    
-                    # If the Icon is still none or empty, get it from the datafile
-                    if Icon is None or (Icon is not None and Icon.isNull()):
-                        for IconItem in Data["Command_Icons"]:
-                            if IconItem[0] == CommandItem[0] and IconItem[0] != "" and CommandItem[0] != "":
-                                Icon: QIcon = Serialize_Ribbon.deserializeIcon(IconItem[1])
-                                # Print a message when debug mode is enabled
-                                if Parameters.DEBUG_MODE:
-                                    print(f"Icon for {CommandItem[0]} retrieved from data file")
-                    
-                    # Add the icon to the icon list
-                    item = [CommandItem[0], Icon]
-                    self.List_CommandIcons.append(item)
-        except Exception as e:
-            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
-            pass
+        # The icons for the workbenches and commands are loaded when needed from the icon store
+        # and kept there, so that the dialog opens faster the next time
 
         # check if the list with workbenches is up-to-date
         missingWB = []
@@ -869,7 +809,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
         self.form.hide()
         
         # Create the data file
-        CacheFunctions.CreateCache()
+        CacheFunctions.CreateCache(Incremental=True)
 
         if RestartFreeCAD is False:
             # Show the dialog again
@@ -950,6 +890,8 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
             SaveAs=True,
         )
         if FileName != "":
+            # Write pending changes of the ribbon first
+            StructureWriter_Ribbon.Flush()
             shutil.copy(Parameters.RIBBON_STRUCTURE_JSON, FileName)
 
         return
@@ -3629,12 +3571,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
                 ListWidgetItem_IW = QListWidgetItem()
                 ListWidgetItem_IW.setText(WorkbenchTitle)
                 ListWidgetItem_IW.setData(Qt.ItemDataRole.UserRole, workbench)
-                Icon = QIcon()
-                for item in self.List_WorkBenchIcons:
-                    if item[0] == WorkbenchName:
-                        Icon = item[1]
-                if Icon is None:
-                    Icon = Gui.getIcon(workbench[1])
+                Icon = self.ReturnWorkbenchIcon(WorkbenchName, workbench[1])
 
                 if Icon is not None:
                     ListWidgetItem_IW.setIcon(Icon)
@@ -3797,7 +3734,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
                     
                     if Icon is not None and Icon.isNull() is False:
                         # Check if there is an Icon. if not add a replacement
-                        if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                        if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                             # Icon = Gui.getIcon("preferences-workbenches")
                             # ListWidgetItem.setIcon(Icon)
                             continue
@@ -4106,6 +4043,8 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
         return
 
     def ReadJson(self, Section="All", JsonFile=""):
+        # Write pending changes of the ribbon first
+        StructureWriter_Ribbon.Flush()
         # Open the JsonFile and load the data
         try:
             if JsonFile != "":
@@ -4224,6 +4163,8 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
 
         # get the path for the Json file
         JsonFile = Parameters.RIBBON_STRUCTURE_JSON
+        # Write pending changes of the ribbon first, so that the backup is up-to-date
+        StructureWriter_Ribbon.Flush()
 
         # create a copy and rename it as a backup if enabled
         if Parameters.ENABLE_BACKUP is True:
@@ -4235,10 +4176,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
             shutil.copy(JsonFile, BackupFile)
 
         # Writing to sample.json
-        with open(JsonFile, "w") as outfile:
-            json.dump(resultingDict, outfile, indent=4)
-
-        outfile.close()
+        StructureWriter_Ribbon.WriteNow(resultingDict, JsonFile)
         return
 
     def ListWidgetItems(self, ListWidget: QListWidget) -> list:
@@ -4863,147 +4801,28 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
         return Commands
 
     def ReturnCommandIcon(self, CommandName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a command from the icon store.
 
         Args:
             CommandName (str): Name of the command
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the command icon or None if there is no icon.
         """
-        # Define an empty icon
-        Icon = QIcon()
-        # Try to get the icon from the icon list first. This list is created on load and is the fasted to read
-        for item in self.List_CommandIcons:
-            if CommandName in item[0]:
-                Icon = item[1]
-                return Icon
-            if (str(CommandName).endswith("_ddb") and "dropdownButtons" in self.Dict_RibbonCommandPanel):
-                for (DropDownCommand, Commands) in self.Dict_RibbonCommandPanel["dropdownButtons"].items():
-                    if DropDownCommand == CommandName and Commands[0][0] == item[0]:
-                        Icon = item[1]
-
-        # If the icon is still empty, try to get the icon from file
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            FreeCAD_Icons = os.path.abspath(os.path.join(os.path.dirname(__file__), "Resources", "FreeCAD Icons"))
-            for root, dirs, files in os.walk(FreeCAD_Icons):
-                for fileName in files:
-                    if CommandName in fileName:
-                        Icon = QIcon()
-                        Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                        # Add the icons to open the dialog faster a second time
-                        item = [CommandName, Icon]
-                        self.List_CommandIcons.append(item)
-                        
-                        # Print a message when debug mode is enabled
-                        if Parameters.DEBUG_MODE:
-                            print(f"{fileName} created from resources")
-                        return Icon
-
-                    if (str(CommandName).endswith("_ddb") and "dropdownButtons" in self.Dict_RibbonCommandPanel):
-                        for (DropDownCommand,Commands) in self.Dict_RibbonCommandPanel["dropdownButtons"].items():
-                            for CommandItem in self.List_Commands:
-                                if DropDownCommand == CommandName and Commands[0][0] in fileName:
-                                    Icon.addPixmap(QPixmap(os.path.join(root, fileName)))
-                                    # Add the icons to open the dialog faster a second time
-                                    item = [CommandName, Icon]
-                                    self.List_CommandIcons.append(item)
-                                    
-                                    # Print a message when debug mode is enabled
-                                    if Parameters.DEBUG_MODE:
-                                        print(f"{fileName} created from resources")
-                                    return Icon
-                                   
-            # If the icon is still empty, try to get it from FreeCAD. This will only work with loaded workbenches.
-            # Therefore this is the last resort
-            if Icon is None or (Icon is not None and Icon.isNull()):
-                # Get the standard pixmap, if a pixmap is not provided
-                if pixmap == "":
-                    pixmap = StandardFunctions.CommandInfoCorrections(CommandName)["pixmap"]
-                Icon = StandardFunctions.returnQiCons_Commands(CommandName, pixmap)
-                if (str(CommandName).endswith("_ddb") and "dropdownButtons" in self.Dict_RibbonCommandPanel):
-                        for (DropDownCommand,Commands) in self.Dict_RibbonCommandPanel["dropdownButtons"].items():
-                            if DropDownCommand == CommandName:
-                                pixmap = StandardFunctions.CommandInfoCorrections(Commands[0][0])["pixmap"]
-                                Icon = StandardFunctions.returnQiCons_Commands(Commands[0][0], pixmap)
-                                # Add the icons to open the dialog faster a second time
-                                item = [Commands[0][0], Icon]
-                                self.List_CommandIcons.append(item)
-                                
-                                if Parameters.DEBUG_MODE:
-                                    print(f"Icon for {Commands[0][0]} retrieved from FreeCAD")
-                                return Icon
-
-                if Icon is None or (Icon is not None and Icon.isNull()):
-                    if Parameters.DEBUG_MODE is True:
-                        StandardFunctions.Print(
-                            f"An icon retrieved from data file for '{CommandName}'"
-                        )
-                    DataFile = os.path.join(
-                        ConfigDirectory, "RibbonDataFile.dat"
-                    )
-
-                    if os.path.exists(DataFile) is True:
-                        Data = {}
-                        # read ribbon structure from JSON file
-                        with open(DataFile, "r") as file:
-                            Data.update(json.load(file))
-                        file.close()
-                        try:
-                            # Load the lists for the deserialized icons
-                            for IconItem in Data["Command_Icons"]:
-                                # This works only for FreeCAD Commands
-                                if CommandName == IconItem[0]:
-                                    Icon: QIcon = (
-                                        Serialize_Ribbon.deserializeIcon(
-                                            IconItem[1]
-                                        )
-                                    )
-                                    # Print a message when debug mode is enabled
-                                    if Parameters.DEBUG_MODE:
-                                        print(f"Icon for {CommandName} retrieved from data file")
-                                    
-                                    # Add the icons to open the dialog faster a second time
-                                    item = [IconItem[0], Icon]
-                                    self.List_CommandIcons.append(item)
-                                    
-                                    return Icon
-                        except Exception as e:
-                            if Parameters.DEBUG_MODE is True:
-                                StandardFunctions.Print(
-                                    f"Trying the get an icon for {CommandName}\n{e}",
-                                    "Warning",
-                                )
-                            pass
-        if Icon is None or (Icon is not None and Icon.isNull()):
-            Icon = None
-        return Icon
+        return IconStore_Ribbon.ReturnCommandIcon(CommandName, pixmap, self.Dict_RibbonCommandPanel.get("dropdownButtons"))
 
     def ReturnWorkbenchIcon(self, WorkBenchName: str, pixmap: str = "") -> QIcon:
-        """_summary_
+        """Returns the icon of a workbench from the icon store.
 
         Args:
-            CommandName (str): Name of the command
+            WorkBenchName (str): Name of the workbench
             pixmap (str, optional): Add a pixmap as backup. Defaults to "".
 
         Returns:
-            QIcon: the command icon.
+            QIcon: the workbench icon.
         """
-        icon = QIcon()
-        for item in self.List_WorkBenchIcons:
-            if item[0] == WorkBenchName:
-                icon = item[1]
-                return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            workbench = Gui.getWorkbench(WorkBenchName)
-            icon = QIcon(workbench.Icon)
-            return icon
-        if icon is None or (icon is not None and icon.isNull()):
-            if pixmap != "":
-                icon = Gui.getIcon(pixmap)
-                return icon
-        return icon
+        return IconStore_Ribbon.ReturnWorkbenchIcon(WorkBenchName, pixmap)
 
     def FilterCommands_SearchBar(
         self,
@@ -5095,7 +4914,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
                                             
                                         if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                             # Check if there is an Icon. if not add a replacement
-                                            if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                            if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                                 # Icon = Gui.getIcon("preferences-workbenches")
                                                 # ListWidgetItem.setIcon(Icon)
                                                 continue
@@ -5257,7 +5076,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
                                             
                                         if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                             # Check if there is an Icon. if not add a replacement
-                                            if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                            if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                                 # Icon = Gui.getIcon("preferences-workbenches")
                                                 # ListWidgetItem.setIcon(Icon)      
                                                 continue  
@@ -5298,7 +5117,7 @@ class LoadDialog(Design_ui.Ui_Form, QObject):
                                     
                                 if SingleCommandsOnly is False or (SingleCommandsOnly is True and Allow is True):
                                     # Check if there is an Icon. if not add a replacement
-                                    if Icon.pixmap(64,64).toImage().bytesPerLine() < 256:
+                                    if IconStore_Ribbon.IsValidCommandIcon(CommandName, Icon) is False:
                                         # Icon = Gui.getIcon("preferences-workbenches")
                                         # ListWidgetItem.setIcon(Icon)
                                         continue
@@ -25,6 +25,7 @@ import FreeCADGui as Gui
 from PySide.QtGui import QColor
 import os
 import sys
+from contextlib import contextmanager
 import Standard_Functions_Ribbon as StandardFunctions
 
 # Set the AdvancesSizeSettingsReset version number
@@ -80,6 +81,10 @@ DefaultSettings = {
     "OverlayState": int(0),
     "StoredOverlayState": "",
     "UseButtonBackGround": bool(False),
+    "CompactIconData": bool(True),
+    "IconAtlasData": bool(False),
+    "UpdateCheckTimeout": int(5),
+    "UpdateCheckInterval": int(24),
     "CustomColors": bool(False),
     "BorderTransparant": bool(True),
     "Color_Borders": "",
@@ -113,40 +118,106 @@ DefaultSettings = {
     "ButtonSpacing": int(3),
 }
 
+# Writing user.cfg is done by App.saveParameter().
+# During a batch, the save is done once when the outer batch ends.
+BatchDepth = 0
+BatchChanged = False
+
+
+def SaveParameter():
+    global BatchChanged
+    if BatchDepth > 0:
+        BatchChanged = True
+        return
+    App.saveParameter()
+    return
+
+
+# In-memory copy of the Ribbon preferences, per type: {"String": {name: value}, ...}.
+# It is filled on the first read. When a parameter changes, FreeCAD notifies "SettingsObserver"
+# and the parameter is removed from the copy, so that it is read again on the next request.
+SettingsSnapshot = {}
+
+
+def LoadSnapshot():
+    SettingsSnapshot.clear()
+    for Type in ["String", "Integer", "Float", "Boolean"]:
+        SettingsSnapshot[Type] = {}
+    settings = preferences.GetContents()
+    if settings is not None:
+        for setting in settings:
+            if setting[0] in SettingsSnapshot:
+                SettingsSnapshot[setting[0]][setting[1]] = setting[2]
+    return
+
+
+def InvalidateSetting(settingName: str):
+    for Values in SettingsSnapshot.values():
+        Values.pop(settingName, None)
+    return
+
+
+class SettingsObserver:
+    """Observer for the Ribbon preferences. Attached with ParameterGrp.Attach."""
+
+    def OnChange(self, grp, reason):
+        InvalidateSetting(reason)
+        return
+
+
+Observer = SettingsObserver()
+try:
+    preferences.Attach(Observer)
+except Exception:
+    # Without an observer, the snapshot is not used
+    Observer = None
+
+
 class Settings:
     # region -- Functions to read the settings from the FreeCAD Parameters
     # and make sure that a None type result is ""
+    # The values are taken from the snapshot when possible.
+    def ReadSetting(Type: str, settingName: str, Read):
+        if Observer is None:
+            return Read(settingName)
+        if len(SettingsSnapshot) == 0:
+            LoadSnapshot()
+        Values = SettingsSnapshot[Type]
+        result = Values.get(settingName)
+        if result is None:
+            result = Read(settingName)
+            Values[settingName] = result
+        return result
+
     def GetStringSetting(settingName) -> str:
-        result = preferences.GetString(settingName)
+        result = Settings.ReadSetting("String", settingName, preferences.GetString)
 
         if result.lower() == "none":
             result = ""
         return result
 
     def GetIntSetting(settingName) -> int:
-        result = preferences.GetInt(settingName)
+        result = Settings.ReadSetting("Integer", settingName, preferences.GetInt)
         if result == "":
             result = None
         return result
 
     def GetFloatSetting(settingName) -> float:
-        result = preferences.GetFloat(settingName)
+        result = Settings.ReadSetting("Float", settingName, preferences.GetFloat)
         if result == "":
             result = None
         return result
 
     def GetBoolSetting(settingName) -> bool:
-        result = None
-        settings = preferences.GetContents()
-        exists = False
-        if settings is not None:
-            for setting in settings:
-                if setting[0] == "Boolean" and setting[1] == settingName:
-                    exists = True
-                    break
-            if exists is True:
+        # Returns None if the setting does not exist.
+        # A stored boolean returns the same value for both defaults
+        def Read(settingName):
+            result = None
+            if preferences.GetBool(settingName, True) == preferences.GetBool(settingName, False):
                 result = preferences.GetBool(settingName)
-        return result
+            return result
+
+        return Settings.ReadSetting("Boolean", settingName, Read)
 
     def GetColorSetting(self, settingName: str) -> object:
         # Create a tuple from the int value of the color
@@ -170,12 +241,12 @@ class Settings:
                 settingName
             ]  # pyright: ignore[reportAssignmentType]
         preferences.SetString(settingName, value)
-        App.saveParameter()
+        SaveParameter()
         return
 
     def SetBoolSetting(settingName, value: bool):
         preferences.SetBool(settingName, value)
-        App.saveParameter()
+        SaveParameter()
         return
 
     def SetIntSetting(settingName, value: int):
@@ -183,7 +254,7 @@ class Settings:
             # value = int(DefaultSettings[settingName])
         # if str(value).lower() != "":
         preferences.SetInt(settingName, value)
-        App.saveParameter()
+        SaveParameter()
         return
     
     def SetFloatSetting(settingName, value: float):
@@ -191,34 +262,66 @@ class Settings:
         #     value = float(DefaultSettings[settingName])
         # if str(value).lower() != "":
         preferences.SetFloat(settingName, value)
-        App.saveParameter()
+        SaveParameter()
         return
 
     # endregion
 
+    # region - Functions to combine writes to the FreeCAD Parameters
+    #
+    # Use "with Settings.batch():" to set several settings with one save of user.cfg.
+    # BeginBatch() and EndBatch() can be used when a with statement is not possible.
+    def BeginBatch():
+        global BatchDepth
+        BatchDepth = BatchDepth + 1
+        return
+
+    def EndBatch():
+        global BatchDepth, BatchChanged
+        if BatchDepth > 0:
+            BatchDepth = BatchDepth - 1
+        if BatchDepth == 0 and BatchChanged is True:
+            BatchChanged = False
+            App.saveParameter()
+        return
+
+    @contextmanager
+    def batch():
+        Settings.BeginBatch()
+        try:
+            yield
+        finally:
+            Settings.EndBatch()
+
+    # endregion
+
     def WriteMissingSettings(self):
-        if self.GetStringSetting("AdvancedSizeReset") == "" or self.GetStringSetting("AdvancedSizeReset") != AdvancedSizeReset:
-            self.SetStringSetting("AdvancedSizeReset", AdvancedSizeReset)
-
-        for DefaultSetting_Name, DefaultSetting_Value in DefaultSettings.items():
-            # for o in getmembers(Parameters):
-            #     if o.lower() == DefaultSetting_Name:
-            #         print(o)
-            if type(DefaultSetting_Value) is str:
-                if Settings.GetStringSetting(DefaultSetting_Name) == "":
-                    Settings.SetStringSetting(DefaultSetting_Name, DefaultSetting_Value)
-            if type(DefaultSetting_Value) is bool:
-                if Settings.GetBoolSetting(DefaultSetting_Name) is None:
-                    Settings.SetBoolSetting(DefaultSetting_Name, DefaultSetting_Value)
-            if type(DefaultSetting_Value) is int:
-                if Settings.GetIntSetting(DefaultSetting_Name) is None:
-                    Settings.SetIntSetting(DefaultSetting_Name, DefaultSetting_Value)
-            if type(DefaultSetting_Value) is float:
-                if Settings.GetFloatSetting(DefaultSetting_Name) is None:
-                    Settings.SetFloatSetting(DefaultSetting_Name, DefaultSetting_Value)
-        App.saveParameter()
+        with Settings.batch():
+            if self.GetStringSetting("AdvancedSizeReset") == "" or self.GetStringSetting("AdvancedSizeReset") != AdvancedSizeReset:
+                self.SetStringSetting("AdvancedSizeReset", AdvancedSizeReset)
+
+            for DefaultSetting_Name, DefaultSetting_Value in DefaultSettings.items():
+                # for o in getmembers(Parameters):
+                #     if o.lower() == DefaultSetting_Name:
+                #         print(o)
+                if type(DefaultSetting_Value) is str:
+                    if Settings.GetStringSetting(DefaultSetting_Name) == "":
+                        Settings.SetStringSetting(DefaultSetting_Name, DefaultSetting_Value)
+                if type(DefaultSetting_Value) is bool:
+                    if Settings.GetBoolSetting(DefaultSetting_Name) is None:
+                        Settings.SetBoolSetting(DefaultSetting_Name, DefaultSetting_Value)
+                if type(DefaultSetting_Value) is int:
+                    if Settings.GetIntSetting(DefaultSetting_Name) is None:
+                        Settings.SetIntSetting(DefaultSetting_Name, DefaultSetting_Value)
+                if type(DefaultSetting_Value) is float:
+                    if Settings.GetFloatSetting(DefaultSetting_Name) is None:
+                        Settings.SetFloatSetting(DefaultSetting_Name, DefaultSetting_Value)
         return
 
+# The defaults below are written with one save of user.cfg, at the end of the class "Parameters"
+Settings.BeginBatch()
+
+
 class Parameters:
     # region - The FreeCAD version to check
     FreeCAD_Version = {
@@ -554,6 +657,29 @@ class Parameters:
         BUTTON_BACKGROUND_ENABLED = bool(DefaultSettings["UseButtonBackGround"])
         Settings.SetBoolSetting("UseButtonBackGround", BUTTON_BACKGROUND_ENABLED)
     BUTTON_BACKGROUND_ENABLED = Settings.GetBoolSetting("UseButtonBackGround")
+
+    # Store only the normal pixmap per icon size in the data file
+    if Settings.GetBoolSetting("CompactIconData") is None:
+        COMPACT_ICON_DATA = bool(DefaultSettings["CompactIconData"])
+        Settings.SetBoolSetting("CompactIconData", COMPACT_ICON_DATA)
+    COMPACT_ICON_DATA = Settings.GetBoolSetting("CompactIconData")
+
+    # Store the pixmaps of all icons in one atlas image per icon size in the data file
+    if Settings.GetBoolSetting("IconAtlasData") is None:
+        ICON_ATLAS_DATA = bool(DefaultSettings["IconAtlasData"])
+        Settings.SetBoolSetting("IconAtlasData", ICON_ATLAS_DATA)
+    ICON_ATLAS_DATA = Settings.GetBoolSetting("IconAtlasData")
+
+    # The timeout in seconds for the check for a new version and the time in hours the result is kept
+    if Settings.GetIntSetting("UpdateCheckTimeout") is None or Settings.GetIntSetting("UpdateCheckTimeout") == 0:
+        UPDATE_CHECK_TIMEOUT = int(DefaultSettings["UpdateCheckTimeout"])
+        Settings.SetIntSetting("UpdateCheckTimeout", UPDATE_CHECK_TIMEOUT)
+    UPDATE_CHECK_TIMEOUT = Settings.GetIntSetting("UpdateCheckTimeout")
+
+    if Settings.GetIntSetting("UpdateCheckInterval") is None or Settings.GetIntSetting("UpdateCheckInterval") == 0:
+        UPDATE_CHECK_INTERVAL = int(DefaultSettings["UpdateCheckInterval"])
+        Settings.SetIntSetting("UpdateCheckInterval", UPDATE_CHECK_INTERVAL)
+    UPDATE_CHECK_INTERVAL = Settings.GetIntSetting("UpdateCheckInterval")
     # endregion ------------------------------------------------------------------------------------------------------------
 
     # region - Color and icon settings -------------------------------------------------------------------------------------
@@ -676,3 +802,6 @@ class Parameters:
         Settings.SetIntSetting("ButtonSpacing", BUTTON_SPACING)
     BUTTON_SPACING = Settings.GetIntSetting("ButtonSpacing")
     # endregion
+
+
+Settings.EndBatch()
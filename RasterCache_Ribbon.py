@@ -0,0 +1,342 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Cache on disk for rasterized icons.
+#
+# Most icons are SVG files. Every new QIcon parses and renders the SVG again for every size
+# the ribbon asks for, at every start and in every dialog. This module stores the rendered pixmaps
+# as PNG files in the config directory, one file per source, pixel size, device pixel ratio and theme.
+# On the next start the icon is created from these files and the SVG is not rendered at all.
+# When the cache gets larger than its maximum, the least recently used files are removed.
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+import FreeCAD as App
+import FreeCADGui as Gui
+from PySide.QtGui import QIcon, QPixmap, QPainter
+from PySide.QtCore import Qt, QRect, QDir, QFile
+
+from Parameters_Ribbon import Parameters
+import Standard_Functions_Ribbon as StandardFunctions
+
+# Set the cache version. Increasing this, results in new files for all icons
+RasterCacheVersion = "1.0"
+
+CACHE_DIRECTORY = os.path.join(Parameters.CONFIG_DIR, "RibbonIconCache")
+# The maximum size of all files in the cache, in bytes
+RASTER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Only these files are rendered. Other files are already pixmaps
+VECTOR_EXTENSIONS = (".svg", ".svgz")
+# The extensions that are tried for icon names without extension, in the order of FreeCAD
+PIXMAP_EXTENSIONS = (".svg", ".png", ".xpm")
+# Sizes that are always rendered. A QIcon made of pixmaps does not scale up,
+# so 64 px is needed for the validity check of icons and 16, 20 and 32 px for the icons in the dialogs
+FIXED_ICON_SIZES = (16, 20, 32, 64)
+
+MainWindowPreferences = App.ParamGet("User parameter:BaseApp/Preferences/MainWindow")
+
+# File name -> file size, the least recently used first. Loaded on first use
+Entries = None
+TotalBytes = 0
+# Files of which the time stamp is already updated in this session
+Touched = set()
+# Counters for checking the cache
+Hits = 0
+Misses = 0
+
+
+# region - helper functions
+def ReturnIconSizes() -> list:
+    """Returns the icon sizes that are used by the ribbon, smallest first."""
+    Sizes = {
+        Parameters.ICON_SIZE_SMALL,
+        Parameters.ICON_SIZE_MEDIUM,
+        Parameters.ICON_SIZE_LARGE,
+        Parameters.QUICK_ICON_SIZE,
+        Parameters.RIGHT_ICON_SIZE,
+        Parameters.TABBAR_SIZE,
+    }
+    Sizes.update(FIXED_ICON_SIZES)
+    return sorted(Size for Size in Sizes if Size is not None and Size > 0)
+
+
+def ReturnDevicePixelRatio() -> float:
+    """Returns the device pixel ratio of the main window."""
+    try:
+        return float(Gui.getMainWindow().devicePixelRatioF())
+    except Exception:
+        return 1.0
+
+
+def ReturnTheme() -> str:
+    """Returns the stylesheet and theme of FreeCAD. Icons can differ per theme."""
+    return (
+        MainWindowPreferences.GetString("StyleSheet")
+        + "|"
+        + MainWindowPreferences.GetString("Theme")
+    )
+
+
+def ReturnSourceKey_File(FilePath: str) -> str:
+    """Returns the source key for an icon file, or "" if the file is not a vector file.
+
+    The key changes when the file is changed.
+    """
+    if FilePath is None or FilePath.lower().endswith(VECTOR_EXTENSIONS) is False:
+        return ""
+    try:
+        Stat = os.stat(FilePath)
+    except OSError:
+        return ""
+    return f"file:{os.path.abspath(FilePath)}|{Stat.st_mtime_ns}|{Stat.st_size}"
+
+
+def ReturnPixmapFile(PixmapName: str) -> str:
+    """Returns the file of an icon that FreeCAD knows by name, or "" if it is not found.
+
+    The name is looked up in the icon search paths (the folders added with Gui.addIconPath)
+    and then in the Qt resources. Resource files start with ":".
+    """
+    if os.path.isfile(PixmapName):
+        return PixmapName
+    Names = [PixmapName]
+    if os.path.splitext(PixmapName)[1] == "":
+        Names = [PixmapName + Extension for Extension in PIXMAP_EXTENSIONS]
+    for Directory in QDir.searchPaths("icons"):
+        for Name in Names:
+            FilePath = os.path.join(Directory, Name)
+            if os.path.isfile(FilePath):
+                return FilePath
+    for Name in Names:
+        if QFile.exists(":/icons/" + Name):
+            return ":/icons/" + Name
+    return ""
+
+
+def ReturnSourceKey_Pixmap(PixmapName: str) -> str:
+    """Returns the source key for an icon that FreeCAD knows by name (Gui.getIcon), or "" if it cannot be cached.
+
+    The name is resolved to its file, so that the key changes when the file of an addon is changed.
+    Resources are compiled into FreeCAD, so their key changes with the FreeCAD version and revision.
+    Names that are not found are not cached.
+    """
+    if PixmapName is None or PixmapName == "":
+        return ""
+    PixmapFile = ReturnPixmapFile(PixmapName)
+    if PixmapFile == "" or PixmapFile.lower().endswith(VECTOR_EXTENSIONS) is False:
+        return ""
+    if PixmapFile.startswith(":"):
+        return f"resource:{PixmapFile}|{'.'.join(str(Item) for Item in App.Version()[0:4])}"
+    return ReturnSourceKey_File(PixmapFile)
+
+
+def ReturnFileName(Source: str, Pixels: int, DevicePixelRatio: float) -> str:
+    Key = json.dumps(
+        [RasterCacheVersion, Source, Pixels, round(DevicePixelRatio, 2), ReturnTheme()]
+    )
+    return hashlib.sha1(Key.encode("utf-8")).hexdigest() + ".png"
+
+
+def LoadEntries():
+    """Reads the files in the cache directory once, the oldest first."""
+    global Entries, TotalBytes
+
+    Entries = OrderedDict()
+    TotalBytes = 0
+    if os.path.isdir(CACHE_DIRECTORY) is False:
+        return
+    Files = []
+    with os.scandir(CACHE_DIRECTORY) as Iterator:
+        for Entry in Iterator:
+            if Entry.is_file() and Entry.name.endswith(".png"):
+                Stat = Entry.stat()
+                Files.append((Stat.st_mtime_ns, Entry.name, Stat.st_size))
+    Files.sort()
+    for Item in Files:
+        Entries[Item[1]] = Item[2]
+        TotalBytes = TotalBytes + Item[2]
+    return
+
+
+def LoadPixmap(FileName: str) -> QPixmap:
+    """Returns the stored pixmap, or None if it is not stored."""
+    if Entries is None:
+        LoadEntries()
+    if FileName not in Entries:
+        return None
+    Path = os.path.join(CACHE_DIRECTORY, FileName)
+    Pixmap = QPixmap(Path)
+    if Pixmap.isNull():
+        RemoveEntry(FileName)
+        return None
+    Entries.move_to_end(FileName)
+    # Update the time stamp once per session, so that the order is kept for the next session
+    if FileName not in Touched:
+        Touched.add(FileName)
+        try:
+            os.utime(Path)
+        except OSError:
+            pass
+    return Pixmap
+
+
+def SavePixmap(FileName: str, Pixmap: QPixmap):
+    """Writes the pixmap to the cache and removes the least recently used files if the cache is full."""
+    global TotalBytes
+
+    if Entries is None:
+        LoadEntries()
+    if os.path.isdir(CACHE_DIRECTORY) is False:
+        os.makedirs(CACHE_DIRECTORY)
+    Path = os.path.join(CACHE_DIRECTORY, FileName)
+    if Pixmap.save(Path, "PNG") is False:
+        return
+    if FileName in Entries:
+        TotalBytes = TotalBytes - Entries[FileName]
+    Entries[FileName] = os.path.getsize(Path)
+    Entries.move_to_end(FileName)
+    Touched.add(FileName)
+    TotalBytes = TotalBytes + Entries[FileName]
+
+    while TotalBytes > RASTER_CACHE_MAX_BYTES and len(Entries) > 1:
+        RemoveEntry(next(iter(Entries)))
+    return
+
+
+def RemoveEntry(FileName: str):
+    global TotalBytes
+
+    TotalBytes = TotalBytes - Entries.pop(FileName, 0)
+    try:
+        os.remove(os.path.join(CACHE_DIRECTORY, FileName))
+    except OSError:
+        pass
+    return
+
+
+def RenderPixmap(Icon: QIcon, Pixels: int) -> QPixmap:
+    """Renders the icon in a square pixmap of exactly the given number of pixels."""
+    Pixmap = QPixmap(Pixels, Pixels)
+    Pixmap.fill(Qt.GlobalColor.transparent)
+    Painter = QPainter(Pixmap)
+    Icon.paint(Painter, QRect(0, 0, Pixels, Pixels))
+    Painter.end()
+    return Pixmap
+
+
+# endregion
+
+
+def ReturnIcon(Source: str, CreateIcon, Sizes: list = None) -> QIcon:
+    """Returns an icon made of stored pixmaps. Missing pixmaps are rendered once and stored.
+
+    Args:
+        Source (str): the source key from ReturnSourceKey_File or ReturnSourceKey_Pixmap.
+            If it is "", the icon is not cached.
+        CreateIcon (function): returns the original icon. Only called when a pixmap is missing.
+        Sizes (list, optional): the sizes in logical pixels. Defaults to None, which uses the sizes of the ribbon.
+
+    Returns:
+        QIcon: the icon. Can be empty or None if CreateIcon returns that.
+    """
+    global Hits, Misses
+
+    if Source == "":
+        return CreateIcon()
+    if Sizes is None:
+        Sizes = ReturnIconSizes()
+    DevicePixelRatio = ReturnDevicePixelRatio()
+
+    try:
+        Pixmaps = []
+        OriginalIcon = None
+        for Size in Sizes:
+            Pixels = round(Size * DevicePixelRatio)
+            FileName = ReturnFileName(Source, Pixels, DevicePixelRatio)
+            Pixmap = LoadPixmap(FileName)
+            if Pixmap is None:
+                Misses = Misses + 1
+                if OriginalIcon is None:
+                    OriginalIcon = CreateIcon()
+                    if OriginalIcon is None or OriginalIcon.isNull():
+                        return OriginalIcon
+                Pixmap = RenderPixmap(OriginalIcon, Pixels)
+                SavePixmap(FileName, Pixmap)
+            else:
+                Hits = Hits + 1
+            Pixmap.setDevicePixelRatio(DevicePixelRatio)
+            Pixmaps.append(Pixmap)
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"Ribbon UI: Icon cache not used for {Source}. {e}", "Warning")
+        return CreateIcon()
+
+    Icon = QIcon()
+    for Pixmap in Pixmaps:
+        Icon.addPixmap(Pixmap)
+    return Icon
+
+
+def ReturnPixmap(Source: str, CreatePixmap) -> QPixmap:
+    """Returns the stored pixmap at the size of the source. When it is missing, CreatePixmap is called and the result is stored.
+
+    Args:
+        Source (str): the source key from ReturnSourceKey_File. If it is "", the pixmap is not cached.
+        CreatePixmap (function): returns the original pixmap.
+    """
+    global Hits, Misses
+
+    if Source == "":
+        return CreatePixmap()
+    try:
+        # Pixmaps at the size of the source are independent of the device pixel ratio
+        FileName = ReturnFileName(Source, 0, 1.0)
+        Pixmap = LoadPixmap(FileName)
+        if Pixmap is not None:
+            Hits = Hits + 1
+            return Pixmap
+        Misses = Misses + 1
+        Pixmap = CreatePixmap()
+        if Pixmap is not None and Pixmap.isNull() is False:
+            SavePixmap(FileName, Pixmap)
+        return Pixmap
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"Ribbon UI: Icon cache not used for {Source}. {e}", "Warning")
+        return CreatePixmap()
+
+
+def Clear():
+    """Removes all stored pixmaps, for example after the data file is created again."""
+    global Entries, TotalBytes
+
+    if Entries is None:
+        LoadEntries()
+    for FileName in list(Entries.keys()):
+        RemoveEntry(FileName)
+    Entries.clear()
+    TotalBytes = 0
+    Touched.clear()
+    return
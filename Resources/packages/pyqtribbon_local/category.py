@@ -109,43 +109,74 @@ class RibbonCategoryLayoutWidget(QFrame):
         self._mainLayout.addWidget(spacer, 0,2,1,-1)  # fmt: skip
         self._mainLayout.addWidget(self._nextButton, 1,3,1,1, Qt.AlignmentFlag.AlignVCenter)
 
+        # The number of paint events, see paintCount()
+        self._paintCount = 0
+
+        # Update the scroll buttons when the scroll range or position changes
+        horizontalScrollBar = self._categoryScrollArea.horizontalScrollBar()
+        horizontalScrollBar.rangeChanged.connect(self._setScrollButtonsVisible)  # type: ignore
+        horizontalScrollBar.valueChanged.connect(self._setScrollButtonsVisible)  # type: ignore
+
         # Auto set the visibility of the scroll buttons
         self.autoSetScrollButtonsVisible()
 
     def paintEvent(self, a0: QPaintEvent) -> None:
         """Override the paint event to draw the background."""
         super().paintEvent(a0)
-        self.autoSetScrollButtonsVisible()
+        self._paintCount += 1
+
+    def paintCount(self) -> int:
+        """Return the number of paint events since the creation or the last reset.
+
+        An idle ribbon should not repaint, so this number should not increase.
+        """
+        return self._paintCount
+
+    def resetPaintCount(self):
+        """Reset the number of paint events."""
+        self._paintCount = 0
 
     def resizeEvent(self, a0: QResizeEvent) -> None:
         """Override the resize event to resize the scroll area."""
         super().resizeEvent(a0)
-        self.autoSetScrollButtonsVisible()
+        # The visibility follows the scroll range, only the icon size depends on the height
+        if a0.size().height() != a0.oldSize().height():
+            self._setScrollButtonsIconSize()
 
     def autoSetScrollButtonsVisible(self):
-        """Set the visibility of the scroll buttons."""
+        """Set the visibility and icon size of the scroll buttons."""
+        self._setScrollButtonsVisible()
+        self._setScrollButtonsIconSize()
+
+    def _setScrollButtonsVisible(self, *args):
+        """Set the visibility of the scroll buttons from the position of the scroll bar."""
         horizontalScrollBar = self._categoryScrollArea.horizontalScrollBar()
-        self._previousButton.setVisible(
-            horizontalScrollBar.value() > horizontalScrollBar.minimum()
-        )
-        self._nextButton.setVisible(
-            horizontalScrollBar.value() < horizontalScrollBar.maximum()
-        )
-        self._previousButton.setIconSize(QSize(12, self.size().height() - 15))
-        self._nextButton.setIconSize(QSize(12, self.size().height() - 15))
+        previousVisible = horizontalScrollBar.value() > horizontalScrollBar.minimum()
+        nextVisible = horizontalScrollBar.value() < horizontalScrollBar.maximum()
+        # Only change the buttons when needed, to avoid new layout requests
+        if self._previousButton.isHidden() == previousVisible:
+            self._previousButton.setVisible(previousVisible)
+        if self._nextButton.isHidden() == nextVisible:
+            self._nextButton.setVisible(nextVisible)
+
+    def _setScrollButtonsIconSize(self):
+        """Set the icon size of the scroll buttons from the height of the category."""
+        iconSize = QSize(12, self.size().height() - 15)
+        if self._previousButton.iconSize() != iconSize:
+            self._previousButton.setIconSize(iconSize)
+        if self._nextButton.iconSize() != iconSize:
+            self._nextButton.setIconSize(iconSize)
 
     def scrollPrevious(self):
         """Scroll the category to the previous widget."""
         horizontalScrollBar = self._categoryScrollArea.horizontalScrollBar()
         horizontalScrollBar.setValue(horizontalScrollBar.value() - 50)
-        self.autoSetScrollButtonsVisible()
 
     def scrollNext(self):
         """Scroll the category to the next widget."""
         self._categoryScrollArea.horizontalScrollBar().setValue(
             self._categoryScrollArea.horizontalScrollBar().value() + 50
         )
-        self.autoSetScrollButtonsVisible()
 
     def addWidget(self, widget: QWidget):
         """Add a widget to the category layout.
@@ -64,7 +64,11 @@ class RibbonPanelTitle(QLabel):
 
 
 class RibbonGridLayoutManager(object):
-    """Grid Layout Manager."""
+    """Grid Layout Manager.
+
+    The occupied cells are stored in an array with spare columns, which grows by doubling its capacity.
+    Cells are never freed, so for each span a cursor per row remembers the first column that can still fit.
+    """
 
     def __init__(self, rows: int):
         """Create a new grid layout manager.
@@ -72,7 +76,33 @@ class RibbonGridLayoutManager(object):
         :param rows: The number of rows in the grid layout.
         """
         self.rows = rows
-        self.cells = np.ones((rows, 1), dtype=bool)
+        # The cells in use are the first self._columns columns of self._cells. True means available.
+        self._cells = np.ones((rows, 8), dtype=bool)
+        self._columns = 1
+        # The first column per row from which a search for a (rowSpan, colSpan) must start
+        self._cursors: Dict[tuple, List[int]] = {}
+        # The column after the last used cell in the first row
+        self._firstRowEnd = 0
+
+    @property
+    def cells(self) -> np.ndarray:
+        """The grid of cells. True means that the cell is available."""
+        return self._cells[:, : self._columns]
+
+    def _setColumns(self, columns: int):
+        """Set the number of columns in the grid. New columns are available."""
+        capacity = self._cells.shape[1]
+        if columns > capacity:
+            cells = np.ones((self.rows, max(columns, capacity * 2)), dtype=bool)
+            cells[:, :capacity] = self._cells
+            self._cells = cells
+        self._columns = columns
+
+    def _occupy(self, row: int, col: int, rowSpan: int, endCol: int):
+        """Mark the cells from (row, col) to (row + rowSpan, endCol) as used."""
+        self._cells[row : row + rowSpan, col:endCol] = False
+        if row == 0 and endCol > col and endCol > self._firstRowEnd:
+            self._firstRowEnd = endCol
 
     def request_cells(
         self, rowSpan: int = 1, colSpan: int = 1, mode: RibbonSpaceFindMode = ColumnWise
@@ -86,35 +116,37 @@ class RibbonGridLayoutManager(object):
         """
         if rowSpan > self.rows:
             raise ValueError("RowSpan is too large")
+        columns = self._columns
         if mode == ColumnWise:
-            for row in range(self.cells.shape[0] - rowSpan + 1):
-                for col in range(self.cells.shape[1] - colSpan + 1):
-                    if self.cells[row : row + rowSpan, col : col + colSpan].all():
-                        self.cells[row : row + rowSpan, col : col + colSpan] = False
+            cursors = self._cursors.get((rowSpan, colSpan))
+            if cursors is None:
+                cursors = [0] * self.rows
+                self._cursors[(rowSpan, colSpan)] = cursors
+            for row in range(self.rows - rowSpan + 1):
+                col = cursors[row]
+                while col <= columns - colSpan:
+                    if self._cells[row : row + rowSpan, col : col + colSpan].all():
+                        cursors[row] = col
+                        self._occupy(row, col, rowSpan, col + colSpan)
                         return row, col
+                    col += 1
+                # Positions before col stay unavailable, because cells are never freed
+                cursors[row] = max(col, cursors[row])
         else:
-            for col in range(self.cells.shape[1]):
-                if self.cells[0, col:].all():
-                    if self.cells.shape[1] - col < colSpan:
-                        self.cells = np.append(
-                            self.cells,
-                            np.ones(
-                                (self.rows, colSpan - (self.cells.shape[1] - col)),
-                                dtype=bool,
-                            ),
-                            axis=1,
-                        )
-                    self.cells[0, col:] = False
-                    return 0, col
-        cols = self.cells.shape[1]
+            # The first row is available from the column after its last used cell
+            col = self._firstRowEnd
+            if col < columns:
+                if columns - col < colSpan:
+                    self._setColumns(col + colSpan)
+                self._occupy(0, col, 1, self._columns)
+                return 0, col
+        cols = columns
         colSpan1 = colSpan
-        if self.cells[:, -1].all():
+        if self._cells[:, columns - 1].all():
             cols -= 1
             colSpan1 -= 1
-        self.cells = np.append(
-            self.cells, np.ones((self.rows, colSpan1), dtype=bool), axis=1
-        )
-        self.cells[:rowSpan, cols : cols + colSpan] = False
+        self._setColumns(columns + colSpan1)
+        self._occupy(0, cols, rowSpan, cols + colSpan)
         return 0, cols
 
 
@@ -0,0 +1,62 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script measures the time to place widgets in a panel with "RibbonGridLayoutManager" of pyqtribbon_local.
+# The panels have 3 rows and a mix of large buttons (3 rows) and small buttons (1 row),
+# like the panels of the ribbon. The original implementation from "Check_GridLayoutManager.py" is measured as well.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+sys.path.append(os.path.join(ParentPath, "Resources", "packages"))
+sys.path.append(os.path.dirname(__file__))
+
+from pyqtribbon_local.panel import RibbonGridLayoutManager
+from Check_GridLayoutManager import RibbonGridLayoutManager_Original
+
+# Set the number of widgets per panel and the number of panels to build
+WidgetCounts = [10, 50, 100, 250, 500]
+Repeats = 20
+
+
+def Measure(Class, WidgetCount):
+    StartTime = time.perf_counter()
+    for i in range(Repeats):
+        Manager = Class(3)
+        for j in range(WidgetCount):
+            # Every fourth widget is a large button
+            if j % 4 == 0:
+                Manager.request_cells(3, 1)
+            else:
+                Manager.request_cells(1, 1)
+    # Return the time per panel in ms
+    return (time.perf_counter() - StartTime) / Repeats * 1000
+
+
+for WidgetCount in WidgetCounts:
+    Original = Measure(RibbonGridLayoutManager_Original, WidgetCount)
+    Current = Measure(RibbonGridLayoutManager, WidgetCount)
+    print(f"{WidgetCount:>4} widgets: {Original:8.2f} ms original, {Current:6.2f} ms current per panel")
@@ -0,0 +1,114 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares two ways of highlighting the parts of a custom ribbon button on hovering:
+# setting a new stylesheet on every enter and leave event, like the ribbon did before,
+# against switching the dynamic property "Hover" with "CustomWidgets.SetHoverState".
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+from PySide.QtWidgets import QApplication, QLabel, QToolButton
+
+import StyleMapping_Ribbon
+from CustomWidgets import ReturnHoverColor, ReturnHoverStyleSheet, SetHoverState
+
+# Set the number of enter and leave events per button
+Repeats = 500
+
+App = QApplication.instance()
+if App is None:
+    App = QApplication(sys.argv)
+
+BaseStyleSheet = StyleMapping_Ribbon.ReturnStyleSheet(
+    control="toolbutton",
+    radius="2px",
+)
+HoverColor = ReturnHoverColor()
+
+
+# The old approach: build and set a stylesheet for both controls on every event
+def Enter_StyleSheet(Button, Label):
+    Button.setStyleSheet(
+        "QToolButton, QToolButton:hover {background-color: "
+        + HoverColor
+        + ";border: none;border-top-left-radius: 2px;border-top-right-radius: 2px;spacing: 0px;}"
+    )
+    Label.setStyleSheet(
+        "QLabel, QLabel:hover {background-color: "
+        + HoverColor
+        + ";border: none;border-bottom-left-radius: 2px;border-bottom-right-radius: 2px;spacing: 0px;}"
+    )
+
+
+def Leave_StyleSheet(Button, Label):
+    Button.setStyleSheet(BaseStyleSheet)
+    Label.setStyleSheet(BaseStyleSheet)
+
+
+# The new approach: only switch the property
+def Enter_Property(Button, Label):
+    SetHoverState(Button, "Top")
+    SetHoverState(Label, "Bottom")
+
+
+def Leave_Property(Button, Label):
+    SetHoverState(Button, "")
+    SetHoverState(Label, "")
+
+
+def Measure(Enter, Leave, StyleSheet):
+    Button = QToolButton()
+    Label = QLabel("Command")
+    Button.setStyleSheet(StyleSheet)
+    Label.setStyleSheet(StyleSheet)
+    Button.show()
+    Label.show()
+    App.processEvents()
+
+    StartTime = time.perf_counter()
+    for i in range(Repeats):
+        Enter(Button, Label)
+        Button.ensurePolished()
+        Label.ensurePolished()
+        Leave(Button, Label)
+        Button.ensurePolished()
+        Label.ensurePolished()
+    App.processEvents()
+    Duration = time.perf_counter() - StartTime
+
+    Button.close()
+    Label.close()
+    # Return the time per enter/leave pair in microseconds
+    return Duration / Repeats * 1e6
+
+
+StyleSheetTime = Measure(Enter_StyleSheet, Leave_StyleSheet, BaseStyleSheet)
+PropertyTime = Measure(Enter_Property, Leave_Property, BaseStyleSheet + ReturnHoverStyleSheet())
+
+print(f"Stylesheet per event: {StyleSheetTime:.1f} µs per enter/leave")
+print(f"Dynamic property:     {PropertyTime:.1f} µs per enter/leave")
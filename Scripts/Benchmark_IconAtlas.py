@@ -0,0 +1,118 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares the cold-start time to create the command icons from the data file:
+# one PNG per icon decoded with "Serialize_Ribbon.deserializeIcon", like the ribbon did before,
+# against one atlas per icon size that is decoded once and cut with QPixmap.copy(rect).
+# The icons of the current data file are used. If there is none, generated icons are used.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+import tempfile
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+from PySide.QtGui import QImage, QPainter, QColor
+from PySide.QtWidgets import QApplication
+from PySide.QtCore import Qt
+
+from Parameters_Ribbon import Parameters
+import DataFile_Ribbon
+import Serialize_Ribbon
+
+# Set the number of generated icons, used when there is no data file
+Count = 3000
+# Set the size of the generated icons
+Size = 64
+
+App = QApplication.instance()
+if App is None:
+    App = QApplication(sys.argv)
+
+
+def ReturnIcons() -> list:
+    """Returns [name, iconPixmaps] for all command icons of the data file, or generated icons."""
+    DataFile = os.path.join(Parameters.CONFIG_DIR, "RibbonDataFile.dat")
+    Data = DataFile_Ribbon.OpenDataFile(DataFile)
+    if Data is not None:
+        Icons = []
+        for Name in Data.IconNames("Command_Icons"):
+            Icons.append([Name, Data.ReturnIconCopy("Command_Icons", Name)])
+        # Icons from a data file with atlases get their own pixmaps first
+        Serialize_Ribbon.unpackAtlases({"Command_Icons": Icons})
+        if len(Icons) > 0:
+            return Icons
+
+    Icons = []
+    for i in range(Count):
+        Image = QImage(Size, Size, QImage.Format.Format_ARGB32_Premultiplied)
+        Image.fill(Qt.GlobalColor.transparent)
+        Painter = QPainter(Image)
+        Painter.setBrush(QColor.fromHsv(i % 360, 200, 200))
+        Painter.drawEllipse(4, 4, Size - 8, Size - 8)
+        Painter.drawText(Image.rect(), Qt.AlignmentFlag.AlignCenter, str(i))
+        Painter.end()
+        Icons.append(
+            [f"Command_{i}", {str(Size): {str(Size): {"normal": {"off": Serialize_Ribbon.imageToBytes(Image)}}}}]
+        )
+    return Icons
+
+
+def Measure(FileName: str) -> float:
+    """Opens the data file and creates all command icons. Returns the time in milliseconds."""
+    DataFile_Ribbon.CloseDataFile(FileName)
+    Serialize_Ribbon.clearAtlases()
+
+    StartTime = time.perf_counter()
+    Data = DataFile_Ribbon.OpenDataFile(FileName)
+    for Name in Data.IconNames("Command_Icons"):
+        Icon = Serialize_Ribbon.deserializeIcon(Data.ReturnIcon("Command_Icons", Name))
+        # Create the pixmap, like a button does when it is painted
+        Icon.pixmap(Size, Size)
+    Duration = time.perf_counter() - StartTime
+
+    DataFile_Ribbon.CloseDataFile(FileName)
+    return Duration * 1000
+
+
+Icons = ReturnIcons()
+Directory = tempfile.mkdtemp()
+PNGFile = os.path.join(Directory, "RibbonDataFile_PNG.dat")
+AtlasFile = os.path.join(Directory, "RibbonDataFile_Atlas.dat")
+
+DataFile_Ribbon.WriteDataFile(PNGFile, {"Command_Icons": Icons})
+Atlases = Serialize_Ribbon.packAtlases({"Command_Icons": Icons})
+DataFile_Ribbon.WriteDataFile(AtlasFile, {"Command_Icons": Icons, "Icon_Atlases": Atlases})
+
+PNGTime = Measure(PNGFile)
+AtlasTime = Measure(AtlasFile)
+
+print(f"{len(Icons)} icons, {len(Atlases)} atlases")
+print(f"One PNG per icon: {PNGTime:.1f} ms ({os.path.getsize(PNGFile)} bytes)")
+print(f"Atlas per size:   {AtlasTime:.1f} ms ({os.path.getsize(AtlasFile)} bytes)")
+
+for FileName in (PNGFile, AtlasFile):
+    os.remove(FileName)
+os.rmdir(Directory)
@@ -0,0 +1,102 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2024 Paul Ebbers                                        *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares the icon lookup with "IconIndex_Ribbon" against walking "Resources/FreeCAD Icons"
+# for every command, like the ribbon did before the index was introduced.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+import IconIndex_Ribbon
+
+# Set the number of times the list of names is looked up
+Repeats = 3
+
+IconDirectory = IconIndex_Ribbon.ICON_DIRECTORY
+
+
+def FindContaining_Walk(Name):
+    result = []
+    for root, dirs, files in os.walk(IconDirectory):
+        for fileName in files:
+            if Name in fileName:
+                result.append(os.path.join(root, fileName))
+    return sorted(result)
+
+
+def FindExact_Walk(Name):
+    result = ""
+    for root, dirs, files in os.walk(IconDirectory):
+        for fileName in sorted(files):
+            if Name == fileName.split(".")[0]:
+                result = os.path.join(root, fileName)
+    return result
+
+
+# Use the icon names as command names and add some names that are not present
+CommandNames = [fileName.split(".")[0] for fileName in os.listdir(IconDirectory)]
+CommandNames.extend([f"Missing_Command_{i}" for i in range(100)])
+
+# Build the index from scratch
+StartTime = time.perf_counter()
+Index = IconIndex_Ribbon.BuildIndex()
+BuildTime = time.perf_counter() - StartTime
+
+# Load the stored index, as is done at import
+StartTime = time.perf_counter()
+Index = IconIndex_Ribbon.LoadIndex()
+LoadTime = time.perf_counter() - StartTime
+
+# Check that both methods return the same result
+for Name in CommandNames:
+    if Index.FindContaining(Name) != FindContaining_Walk(Name):
+        print(f"Substring lookup differs for {Name}")
+    if Index.FindExact(Name) != FindExact_Walk(Name):
+        print(f"Exact lookup differs for {Name}")
+
+StartTime = time.perf_counter()
+for i in range(Repeats):
+    for Name in CommandNames:
+        FindContaining_Walk(Name)
+WalkTime = time.perf_counter() - StartTime
+
+StartTime = time.perf_counter()
+for i in range(Repeats):
+    # Clear the cache, otherwise only the first round does a real lookup
+    Index._ContainingCache.clear()
+    for Name in CommandNames:
+        Index.FindContaining(Name)
+IndexTime = time.perf_counter() - StartTime
+
+Lookups = Repeats * len(CommandNames)
+print(f"Icons in index:         {len(Index.Files)}")
+print(f"Lookups:                {Lookups}")
+print(f"Build index:            {BuildTime * 1000:.1f} ms")
+print(f"Load index:             {LoadTime * 1000:.1f} ms")
+print(f"os.walk per lookup:     {WalkTime / Lookups * 1e6:.1f} us")
+print(f"Index per lookup:       {IndexTime / Lookups * 1e6:.1f} us")
+print(f"Speed up:               {WalkTime / IndexTime:.0f}x")
@@ -0,0 +1,91 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2024 Paul Ebbers                                        *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script compares reading the Ribbon settings from the snapshot in "Parameters_Ribbon"
+# against reading them from the FreeCAD parameters, like the ribbon did before the snapshot was introduced.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+import Parameters_Ribbon
+from Parameters_Ribbon import Settings, DefaultSettings, preferences
+
+# Set the number of reads per setting
+Repeats = 1000
+
+
+def GetBoolSetting_Parameters(settingName):
+    result = None
+    settings = preferences.GetContents()
+    exists = False
+    if settings is not None:
+        for setting in settings:
+            if setting[0] == "Boolean" and setting[1] == settingName:
+                exists = True
+                break
+        if exists is True:
+            result = preferences.GetBool(settingName)
+    return result
+
+
+def GetIntSetting_Parameters(settingName):
+    return preferences.GetInt(settingName)
+
+
+BoolNames = [Name for Name, Value in DefaultSettings.items() if type(Value) is bool]
+IntNames = [Name for Name, Value in DefaultSettings.items() if type(Value) is int]
+
+# Check that both methods return the same result
+for Name in BoolNames:
+    if Settings.GetBoolSetting(Name) != GetBoolSetting_Parameters(Name):
+        print(f"Boolean setting differs for {Name}")
+for Name in IntNames:
+    if Settings.GetIntSetting(Name) != GetIntSetting_Parameters(Name):
+        print(f"Integer setting differs for {Name}")
+
+# Check that a change is seen by the snapshot
+Name = IntNames[0]
+Value = Settings.GetIntSetting(Name)
+preferences.SetInt(Name, Value + 1)
+if Settings.GetIntSetting(Name) != Value + 1:
+    print(f"Snapshot is not updated for {Name}")
+preferences.SetInt(Name, Value)
+
+
+def Measure(Function, Names):
+    StartTime = time.perf_counter()
+    for i in range(Repeats):
+        for Name in Names:
+            Function(Name)
+    return Repeats * len(Names) / (time.perf_counter() - StartTime)
+
+
+print(f"Snapshot in use:        {Parameters_Ribbon.Observer is not None}")
+print(f"Boolean, parameters:    {Measure(GetBoolSetting_Parameters, BoolNames):.0f} reads/s")
+print(f"Boolean, snapshot:      {Measure(Settings.GetBoolSetting, BoolNames):.0f} reads/s")
+print(f"Integer, parameters:    {Measure(GetIntSetting_Parameters, IntNames):.0f} reads/s")
+print(f"Integer, snapshot:      {Measure(Settings.GetIntSetting, IntNames):.0f} reads/s")
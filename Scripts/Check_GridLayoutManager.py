@@ -0,0 +1,110 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script checks that "RibbonGridLayoutManager" in pyqtribbon_local places the widgets exactly
+# like the original implementation, which grew its grid with np.append on every request.
+# Random sequences of requests with random spans and modes are run on both and their results compared.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import random
+
+import numpy as np
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+sys.path.append(os.path.join(ParentPath, "Resources", "packages"))
+
+from pyqtribbon_local.constants import ColumnWise, RowWise
+from pyqtribbon_local.panel import RibbonGridLayoutManager
+
+# Set the number of random sequences and the maximum length of a sequence
+Sequences = 2000
+MaxRequests = 60
+
+
+# The original implementation
+class RibbonGridLayoutManager_Original(object):
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.cells = np.ones((rows, 1), dtype=bool)
+
+    def request_cells(self, rowSpan: int = 1, colSpan: int = 1, mode=ColumnWise):
+        if rowSpan > self.rows:
+            raise ValueError("RowSpan is too large")
+        if mode == ColumnWise:
+            for row in range(self.cells.shape[0] - rowSpan + 1):
+                for col in range(self.cells.shape[1] - colSpan + 1):
+                    if self.cells[row : row + rowSpan, col : col + colSpan].all():
+                        self.cells[row : row + rowSpan, col : col + colSpan] = False
+                        return row, col
+        else:
+            for col in range(self.cells.shape[1]):
+                if self.cells[0, col:].all():
+                    if self.cells.shape[1] - col < colSpan:
+                        self.cells = np.append(
+                            self.cells,
+                            np.ones(
+                                (self.rows, colSpan - (self.cells.shape[1] - col)),
+                                dtype=bool,
+                            ),
+                            axis=1,
+                        )
+                    self.cells[0, col:] = False
+                    return 0, col
+        cols = self.cells.shape[1]
+        colSpan1 = colSpan
+        if self.cells[:, -1].all():
+            cols -= 1
+            colSpan1 -= 1
+        self.cells = np.append(
+            self.cells, np.ones((self.rows, colSpan1), dtype=bool), axis=1
+        )
+        self.cells[:rowSpan, cols : cols + colSpan] = False
+        return 0, cols
+
+
+def CheckSequences():
+    Failures = 0
+    for Seed in range(Sequences):
+        Random = random.Random(Seed)
+        Rows = Random.randint(1, 6)
+        Original = RibbonGridLayoutManager_Original(Rows)
+        Manager = RibbonGridLayoutManager(Rows)
+        for i in range(Random.randint(1, MaxRequests)):
+            RowSpan = Random.randint(1, Rows)
+            ColSpan = Random.randint(1, 4)
+            Mode = Random.choice([ColumnWise, ColumnWise, RowWise])
+            Expected = Original.request_cells(RowSpan, ColSpan, Mode)
+            Result = Manager.request_cells(RowSpan, ColSpan, Mode)
+            if Result != Expected or Manager.cells.shape != Original.cells.shape or not (Manager.cells == Original.cells).all():
+                print(f"Sequence {Seed}, request {i} ({RowSpan}, {ColSpan}, {Mode.name}): {Result} instead of {Expected}")
+                Failures = Failures + 1
+                break
+
+    print(f"{Sequences} sequences checked, {Failures} different")
+    return Failures
+
+
+if __name__ == "__main__":
+    CheckSequences()
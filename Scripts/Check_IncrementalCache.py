@@ -0,0 +1,99 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script checks that an incremental update of the data file gives the same result as a full rebuild,
+# on an installation where nothing has changed since the last rebuild.
+# It creates the data file twice: first completely, then incrementally. The commands, their icons and
+# icon flags, the workbenches and the toolbars of both files are compared.
+# Run it from the FreeCAD python console or as a macro. The data file is replaced by the incremental result.
+
+import os
+import sys
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+from Parameters_Ribbon import Parameters
+import CacheFunctions
+import DataFile_Ribbon
+
+DataFile = os.path.join(Parameters.CONFIG_DIR, "RibbonDataFile.dat")
+
+
+def ReturnSnapshot() -> dict:
+    """Returns the parts of the data file that are compared, as plain python objects."""
+    Data = DataFile_Ribbon.OpenDataFile(DataFile)
+    Snapshot = {
+        "List_Commands": {CommandItem[0]: CommandItem for CommandItem in Data["List_Commands"]},
+        "List_Workbenches": {WorkBenchItem[0]: WorkBenchItem for WorkBenchItem in Data["List_Workbenches"]},
+        "StringList_Toolbars": sorted(str(ToolbarItem) for ToolbarItem in Data["StringList_Toolbars"]),
+        "Command_Icons": sorted(Data.IconNames("Command_Icons")),
+        "WorkBench_Icons": sorted(Data.IconNames("WorkBench_Icons")),
+        "Command_IconFlags": dict(Data.get("Command_IconFlags", {})),
+    }
+    DataFile_Ribbon.CloseDataFile(DataFile)
+    return Snapshot
+
+
+def Compare(Full: dict, Incremental: dict) -> int:
+    """Prints the differences and returns their number."""
+    Differences = 0
+    for Key in Full:
+        if Full[Key] == Incremental[Key]:
+            print(f"{Key}: equal")
+            continue
+        if isinstance(Full[Key], dict):
+            Missing = sorted(set(Full[Key]) - set(Incremental[Key]))
+            Extra = sorted(set(Incremental[Key]) - set(Full[Key]))
+            Changed = sorted(
+                Name for Name in set(Full[Key]) & set(Incremental[Key]) if Full[Key][Name] != Incremental[Key][Name]
+            )
+            print(f"{Key}: {len(Missing)} missing, {len(Extra)} extra, {len(Changed)} changed")
+            for Name in Missing[:20]:
+                print(f"    missing: {Name}")
+            for Name in Extra[:20]:
+                print(f"    extra:   {Name}")
+            for Name in Changed[:20]:
+                print(f"    changed: {Name}: {Full[Key][Name]} -> {Incremental[Key][Name]}")
+            Differences = Differences + len(Missing) + len(Extra) + len(Changed)
+        else:
+            Missing = sorted(set(Full[Key]) - set(Incremental[Key]))
+            Extra = sorted(set(Incremental[Key]) - set(Full[Key]))
+            print(f"{Key}: {len(Missing)} missing, {len(Extra)} extra")
+            for Name in Missing[:20]:
+                print(f"    missing: {Name}")
+            for Name in Extra[:20]:
+                print(f"    extra:   {Name}")
+            Differences = Differences + max(1, len(Missing) + len(Extra))
+    return Differences
+
+
+CacheFunctions.CreateCache(Incremental=False)
+FullSnapshot = ReturnSnapshot()
+CacheFunctions.CreateCache(Incremental=True)
+IncrementalSnapshot = ReturnSnapshot()
+
+Differences = Compare(FullSnapshot, IncrementalSnapshot)
+if Differences == 0:
+    print("The incremental update is equal to the full rebuild")
+else:
+    print(f"The incremental update differs from the full rebuild in {Differences} places")
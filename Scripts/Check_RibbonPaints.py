@@ -0,0 +1,62 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script counts the paint events of the ribbon categories while FreeCAD is idle.
+# Do not move the mouse over the ribbon while it runs. An idle ribbon should not repaint,
+# so all counts should stay at zero, apart from a blinking cursor or an animation.
+# Run it from the FreeCAD python console or as a macro, with the ribbon loaded.
+
+import os
+import sys
+
+import FreeCADGui as Gui
+from PySide.QtCore import QTimer
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+sys.path.append(os.path.join(ParentPath, "Resources", "packages"))
+
+from pyqtribbon_local.category import RibbonCategoryLayoutWidget
+
+# Set the time to wait in ms
+IdleTime = 5000
+
+mw = Gui.getMainWindow()
+Categories = mw.findChildren(RibbonCategoryLayoutWidget)
+for Category in Categories:
+    Category.resetPaintCount()
+
+
+def ReportPaintCount():
+    Total = 0
+    for Category in Categories:
+        if Category.paintCount() > 0:
+            Name = Category.objectName()
+            if hasattr(Category, "title"):
+                Name = Category.title()
+            print(f"{Name}: {Category.paintCount()} paint events")
+        Total = Total + Category.paintCount()
+    print(f"{len(Categories)} categories, {Total} paint events in {IdleTime / 1000:.0f} s")
+
+
+print(f"Counting paint events for {IdleTime / 1000:.0f} s...")
+QTimer.singleShot(IdleTime, ReportPaintCount)
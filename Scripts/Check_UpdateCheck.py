@@ -0,0 +1,93 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2024 Paul Ebbers                                        *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# This script checks the update check of "UpdateCheck_Ribbon" against a local http server instead of GitHub:
+# the version is read from the served package.xml, the stored result is used within its interval,
+# and a server that does not respond is stopped by the timeout.
+# Run it from the FreeCAD python console or as a macro.
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+import UpdateCheck_Ribbon
+
+PackageXML = b"""<?xml version="1.0" encoding="UTF-8" standalone="no" ?>
+<package format="1" xmlns="https://wiki.freecad.org/Package_Metadata">
+  <name>FreeCAD Ribbon</name>
+  <version>99.0.0</version>
+</package>
+"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.end_headers()
+        self.wfile.write(PackageXML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Start a local server on a free port
+Server = HTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=Server.serve_forever, daemon=True).start()
+Url = f"http://127.0.0.1:{Server.server_address[1]}/package.xml"
+
+# Get the version from the local server
+LatestVersion = UpdateCheck_Ribbon.FetchLatestVersion(Url, Timeout=2)
+print(f"Version from local server:  {LatestVersion}")
+if LatestVersion != "99.0.0":
+    print("Wrong version returned")
+if UpdateCheck_Ribbon.IsNewerVersion(LatestVersion, "1.11.3") is False:
+    print("Version is not seen as newer")
+if UpdateCheck_Ribbon.IsNewerVersion("1.11.4", "1.12.0") is True:
+    print("Older version is seen as newer")
+
+# Store the result and read it back within and outside of the interval
+CacheFile = os.path.join(tempfile.mkdtemp(), "RibbonUpdateCheck.json")
+UpdateCheck_Ribbon.WriteCachedVersion(LatestVersion, CacheFile)
+if UpdateCheck_Ribbon.ReturnCachedVersion(CacheFile, Interval=1) != LatestVersion:
+    print("Stored version is not used")
+if UpdateCheck_Ribbon.ReturnCachedVersion(CacheFile, Interval=-1) is not None:
+    print("Stored version is used after the interval")
+
+# A server that accepts the connection but never answers
+Silent = socket.socket()
+Silent.bind(("127.0.0.1", 0))
+Silent.listen(1)
+SilentUrl = f"http://127.0.0.1:{Silent.getsockname()[1]}/package.xml"
+StartTime = time.perf_counter()
+Result = UpdateCheck_Ribbon.FetchLatestVersion(SilentUrl, Timeout=1)
+print(f"Silent server:              {Result} after {time.perf_counter() - StartTime:.1f} s")
+
+Silent.close()
+Server.shutdown()
@@ -26,8 +26,12 @@
 
 import json
 import os
+import sys
 
 ParentPath = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ParentPath)
+
+import DataFile_Ribbon
 JsonName = "RibbonStructure.json"
 # get the path for the Json file
 JsonFile = os.path.join(ParentPath, JsonName)
@@ -35,11 +39,8 @@ JsonFile = os.path.join(ParentPath, JsonName)
 # Get the datafile
 DataFile = os.path.join(ParentPath, "RibbonDataFile.dat")
 
-# create a dict from the data file and close the data file
-Data = {}
-# read ribbon structure from JSON file
-with open(DataFile, "r") as file:
-    Data.update(json.load(file))
+# read the data file. An older JSON data file is converted first
+Data = DataFile_Ribbon.OpenDataFile(DataFile).Metadata()
 
 # Create a list with workbench data
 ListWorkbenchesData = []
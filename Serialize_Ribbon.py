@@ -22,22 +22,29 @@
 
 # This code is based on the serialize function of the SearBar Addon.
 # Original developer for the SearchBar addon is Suzanne Soy.
-from PySide.QtGui import QIcon, QPixmap
+import hashlib
+import math
+from PySide.QtGui import QIcon, QPixmap, QImage, QPainter
 from PySide.QtCore import (
     Qt,
     QSize,
+    QRect,
     QBuffer,
     QIODevice,
     QTextStream,
     QByteArray,
 )
+import DataFile_Ribbon
 
+# The maximum width and height of an atlas in pixels
+ATLAS_MAX_SIZE = 2048
 
-def iconToBase64(
+
+def iconToBytes(
     icon: QIcon, sz=QSize(64, 64), mode=QIcon.Mode.Normal, state=QIcon.State.On
 ):
     """
-    Converts a QIcon to a Base64-encoded string representation of its pixmap.
+    Converts a QIcon to the PNG data of its pixmap.
 
     Args:
         icon (QIcon): The icon to encode.
@@ -46,7 +53,7 @@ def iconToBase64(
         state (QIcon.State): The state of the pixmap (e.g., On, Off).
 
     Returns:
-        str: The Base64-encoded string of the icon's pixmap.
+        bytes: The PNG data of the icon's pixmap.
     """
     buf = QBuffer()
     buf.open(QIODevice.OpenModeFlag.WriteOnly)
@@ -59,52 +66,375 @@ def iconToBase64(
         # raise ValueError("Failed to save icon to buffer. Ensure the icon is valid.")
         print(e)
 
-    # Use standard Base64 encoding
-    base64_data = buf.data().toBase64().data().decode("utf-8")
+    data = bytes(buf.data().data())
     buf.close()
+    return data
+
+
+def iconToBase64(
+    icon: QIcon, sz=QSize(64, 64), mode=QIcon.Mode.Normal, state=QIcon.State.On
+):
+    """
+    Converts a QIcon to a Base64-encoded string representation of its pixmap.
+
+    Args:
+        icon (QIcon): The icon to encode.
+        sz (QSize): The size of the pixmap to generate.
+        mode (QIcon.Mode): The mode of the pixmap (e.g., Normal, Disabled).
+        state (QIcon.State): The state of the pixmap (e.g., On, Off).
+
+    Returns:
+        str: The Base64-encoded string of the icon's pixmap.
+    """
+    # Use standard Base64 encoding
+    base64_data = (
+        QByteArray(iconToBytes(icon, sz, mode, state)).toBase64().data().decode("utf-8")
+    )
     return base64_data
 
 
-def serializeIcon(icon):
+IconModes = {
+    "normal": QIcon.Mode.Normal,
+    "disabled": QIcon.Mode.Disabled,
+    "active": QIcon.Mode.Active,
+    "selected": QIcon.Mode.Selected,
+}
+IconStates = {
+    "off": QIcon.State.Off,
+    "on": QIcon.State.On,
+}
+
+
+def serializeIcon(icon, raw=False, compact=False):
+    """
+    Serializes all sizes, modes and states of an icon.
+
+    Args:
+        icon (QIcon): The icon to serialize.
+        raw (bool, optional): Store the PNG data as bytes instead of base64 strings.
+            Used for the binary data file. Defaults to False.
+        compact (bool, optional): Store only the normal/off pixmap per size.
+            The other modes are generated by the style when the icon is used. Defaults to False.
+
+    Returns:
+        dict: {width: {height: {mode: {state: pixmap}}}}
+    """
+    encode = iconToBase64
+    if raw is True:
+        encode = iconToBytes
     iconPixmaps = {}
     for sz in icon.availableSizes():
         strW = str(sz.width())
         strH = str(sz.height())
         iconPixmaps[strW] = {}
         iconPixmaps[strW][strH] = {}
-        for strMode, mode in {
-            "normal": QIcon.Mode.Normal,
-            "disabled": QIcon.Mode.Disabled,
-            "active": QIcon.Mode.Active,
-            "selected": QIcon.Mode.Selected,
-        }.items():
+        if compact is True:
+            iconPixmaps[strW][strH]["normal"] = {
+                "off": encode(icon, sz, QIcon.Mode.Normal, QIcon.State.Off)
+            }
+            continue
+        for strMode, mode in IconModes.items():
             iconPixmaps[strW][strH][strMode] = {}
-            for strState, state in {
-                "off": QIcon.State.Off,
-                "on": QIcon.State.On,
-            }.items():
-                iconPixmaps[strW][strH][strMode][strState] = iconToBase64(
+            for strState, state in IconStates.items():
+                iconPixmaps[strW][strH][strMode][strState] = encode(
                     icon, sz, mode, state
                 )
     return iconPixmaps
 
 
+class PixmapData(bytes):
+    """PNG data of a pixmap together with its SHA-1 hash (PixmapData.Hash)."""
+
+    Hash = b""
+
+
+def iconToImages(icon, compact=False) -> list:
+    """
+    Renders the pixmaps of an icon as QImages.
+    This must run on the GUI thread, because QPixmap is not thread-safe.
+
+    Args:
+        icon (QIcon): The icon to render.
+        compact (bool, optional): Render only the normal/off pixmap per size. Defaults to False.
+
+    Returns:
+        list: [width, height, mode, state, QImage] for each pixmap.
+    """
+    images = []
+    for sz in icon.availableSizes():
+        strW = str(sz.width())
+        strH = str(sz.height())
+        for strMode, mode in IconModes.items():
+            for strState, state in IconStates.items():
+                if compact is True and (strMode != "normal" or strState != "off"):
+                    continue
+                images.append(
+                    [strW, strH, strMode, strState, icon.pixmap(sz, mode, state).toImage()]
+                )
+    return images
+
+
+def imageToBytes(image: QImage) -> PixmapData:
+    """
+    Encodes a QImage as PNG and hashes the result.
+    QImage is thread-safe, so this can run in a worker thread.
+
+    Args:
+        image (QImage): The image to encode.
+
+    Returns:
+        PixmapData: The PNG data with its hash.
+    """
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buf, "PNG")
+    data = PixmapData(buf.data().data())
+    buf.close()
+    data.Hash = hashlib.sha1(data).digest()
+    return data
+
+
+def imagesToDict(images: list) -> dict:
+    """
+    Puts the images from iconToImages in the nested dict form, without encoding them. Used for packing atlases.
+
+    Returns:
+        dict: {width: {height: {mode: {state: QImage}}}}
+    """
+    iconPixmaps = {}
+    for strW, strH, strMode, strState, image in images:
+        iconPixmaps.setdefault(strW, {}).setdefault(strH, {}).setdefault(strMode, {})[
+            strState
+        ] = image
+    return iconPixmaps
+
+
+def imagesToPixmaps(images: list) -> dict:
+    """
+    Encodes the images from iconToImages. Can run in a worker thread.
+
+    Returns:
+        dict: {width: {height: {mode: {state: PixmapData}}}}, the same form as serializeIcon(raw=True).
+    """
+    iconPixmaps = {}
+    for strW, strH, strMode, strState, image in images:
+        iconPixmaps.setdefault(strW, {}).setdefault(strH, {}).setdefault(strMode, {})[
+            strState
+        ] = imageToBytes(image)
+    return iconPixmaps
+
+
+def isValidIcon(icon: QIcon) -> bool:
+    """
+    Returns True if the icon can be shown at 64x64 pixels. Smaller icons are placeholders.
+
+    Args:
+        icon (QIcon): The icon to check.
+    """
+    return icon.pixmap(64, 64).toImage().bytesPerLine() >= 256
+
+
+def iconFlags(icon: QIcon) -> list:
+    """
+    Returns the flags of an icon that are stored in the data file, so that the dialogs do not need to render it.
+
+    Args:
+        icon (QIcon): The icon to check. Can be None.
+
+    Returns:
+        list: [valid (bool), the SHA-1 hash of an 8x8 thumbnail as hex string]. [False, ""] for an empty icon.
+    """
+    if icon is None or icon.isNull():
+        return [False, ""]
+    image = icon.pixmap(64, 64).toImage()
+    thumbnail = image.scaled(
+        8, 8, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+    ).convertToFormat(QImage.Format.Format_ARGB32)
+    return [image.bytesPerLine() >= 256, imageToBytes(thumbnail).Hash.hex()]
+
+
 def deserializeIcon(iconPixmaps):
     ico = QIcon()
+    # Pixmaps that are used for more than one mode or state are decoded once.
+    # Identical base64 strings are equal, identical data from the binary data file is the same object
+    decoded = {}
     for strW, wPixmaps in iconPixmaps.items():
         for strH, hPixmaps in wPixmaps.items():
             for strMode, modePixmaps in hPixmaps.items():
-                mode = {
-                    "normal": QIcon.Mode.Normal,
-                    "disabled": QIcon.Mode.Disabled,
-                    "active": QIcon.Mode.Active,
-                    "selected": QIcon.Mode.Selected,
-                }[strMode]
+                mode = IconModes[strMode]
                 for strState, statePixmap in modePixmaps.items():
-                    state = {"off": QIcon.State.Off, "on": QIcon.State.On}[strState]
-                    pxm = QPixmap()
-                    pxm.loadFromData(
-                        QByteArray.fromBase64(bytearray(statePixmap.encode("utf-8")))
-                    )
+                    state = IconStates[strState]
+                    if isinstance(statePixmap, str):
+                        key = statePixmap
+                    elif isinstance(statePixmap, DataFile_Ribbon.AtlasPixmap):
+                        key = (statePixmap.Key, statePixmap.Rect)
+                    else:
+                        key = id(statePixmap)
+                    pxm = decoded.get(key)
+                    if pxm is None:
+                        pxm = QPixmap()
+                        if isinstance(statePixmap, DataFile_Ribbon.AtlasPixmap):
+                            # Cut the pixmap out of the atlas, which is decoded once
+                            pxm = returnAtlas(statePixmap).copy(QRect(*statePixmap.Rect))
+                        elif isinstance(statePixmap, str):
+                            pxm.loadFromData(
+                                QByteArray.fromBase64(bytearray(statePixmap.encode("utf-8")))
+                            )
+                        else:
+                            # Raw data from the binary data file (bytes or a memoryview of the file)
+                            try:
+                                pxm.loadFromData(statePixmap)
+                            except TypeError:
+                                pxm.loadFromData(bytes(statePixmap))
+                        decoded[key] = pxm
                     ico.addPixmap(pxm, mode, state)
     return ico
+
+
+# region - Atlases
+# Decoded atlases. Key is AtlasPixmap.Key. Only the atlases of one data file are kept
+_Atlases = {}
+
+
+def returnAtlas(atlasPixmap) -> QPixmap:
+    """
+    Returns the decoded atlas of an AtlasPixmap. Each atlas is decoded once.
+
+    Args:
+        atlasPixmap (DataFile_Ribbon.AtlasPixmap): a pixmap from an atlas.
+
+    Returns:
+        QPixmap: the whole atlas.
+    """
+    atlas = _Atlases.get(atlasPixmap.Key)
+    if atlas is None:
+        # Remove the atlases of a data file that is replaced
+        for key in list(_Atlases.keys()):
+            if key[0:2] != atlasPixmap.Key[0:2]:
+                del _Atlases[key]
+        atlas = QPixmap()
+        try:
+            atlas.loadFromData(atlasPixmap.Data)
+        except TypeError:
+            atlas.loadFromData(bytes(atlasPixmap.Data))
+        _Atlases[atlasPixmap.Key] = atlas
+    return atlas
+
+
+def clearAtlases():
+    """Removes the decoded atlases."""
+    _Atlases.clear()
+    return
+
+
+def pixmapToImage(statePixmap, atlasImages: dict) -> QImage:
+    """
+    Decodes a serialized pixmap to a QImage.
+
+    Args:
+        statePixmap: a QImage, a base64 string, PNG data or a DataFile_Ribbon.AtlasPixmap.
+        atlasImages (dict): decoded atlases, filled on first use.
+
+    Returns:
+        QImage: the image.
+    """
+    if isinstance(statePixmap, QImage):
+        return statePixmap
+    if isinstance(statePixmap, DataFile_Ribbon.AtlasPixmap):
+        atlas = atlasImages.get(statePixmap.Key)
+        if atlas is None:
+            atlas = QImage.fromData(bytes(statePixmap.Data))
+            atlasImages[statePixmap.Key] = atlas
+        return atlas.copy(QRect(*statePixmap.Rect))
+    if isinstance(statePixmap, str):
+        return QImage.fromData(QByteArray.fromBase64(bytearray(statePixmap.encode("utf-8"))))
+    return QImage.fromData(bytes(statePixmap))
+
+
+def packAtlases(serializedIcons: dict) -> list:
+    """
+    Packs the pixmaps of all icons in atlases, one or more per icon size, mode and state.
+    The pixmaps in serializedIcons are replaced by DataFile_Ribbon.AtlasPixmaps with the atlas number as key.
+    Pixmaps that cannot be decoded are removed.
+
+    Args:
+        serializedIcons (dict): {section: [[name, iconPixmaps], ...]}, as written by DataFile_Ribbon.WriteDataFile.
+            The pixmaps can be QImages (from imagesToDict), which are packed without decoding.
+
+    Returns:
+        list: the PNG data of the atlases, in the order of the atlas numbers.
+    """
+    # Collect the images per size, mode and state
+    atlasImages = {}
+    groups = {}
+    invalid = []
+    for iconItems in serializedIcons.values():
+        for iconItem in iconItems:
+            iconPixmaps = iconItem[1]
+            for strW, wPixmaps in iconPixmaps.items():
+                for strH, hPixmaps in wPixmaps.items():
+                    for strMode, modePixmaps in hPixmaps.items():
+                        for strState, statePixmap in modePixmaps.items():
+                            image = pixmapToImage(statePixmap, atlasImages)
+                            if image.isNull():
+                                invalid.append((modePixmaps, strState))
+                                continue
+                            groups.setdefault((strW, strH, strMode, strState), []).append(
+                                (modePixmaps, strState, image)
+                            )
+    # Remove the pixmaps that cannot be decoded. An AtlasPixmap of an old data file cannot be written as it is
+    for modePixmaps, strState in invalid:
+        del modePixmaps[strState]
+
+    atlases = []
+    for items in groups.values():
+        # All images in a group have about the same size. Place them in a grid of equal cells
+        cellWidth = max(item[2].width() for item in items)
+        cellHeight = max(item[2].height() for item in items)
+        columns = max(1, min(ATLAS_MAX_SIZE // cellWidth, math.ceil(math.sqrt(len(items)))))
+        rows = max(1, ATLAS_MAX_SIZE // cellHeight)
+        perAtlas = columns * rows
+        for start in range(0, len(items), perAtlas):
+            pageItems = items[start : start + perAtlas]
+            pageRows = math.ceil(len(pageItems) / columns)
+            atlas = QImage(
+                columns * cellWidth, pageRows * cellHeight, QImage.Format.Format_ARGB32_Premultiplied
+            )
+            atlas.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(atlas)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            for i, (modePixmaps, strState, image) in enumerate(pageItems):
+                x = (i % columns) * cellWidth
+                y = (i // columns) * cellHeight
+                painter.drawImage(x, y, image)
+                modePixmaps[strState] = DataFile_Ribbon.AtlasPixmap(
+                    len(atlases), None, (x, y, image.width(), image.height())
+                )
+            painter.end()
+            atlases.append(imageToBytes(atlas))
+    return atlases
+
+
+def unpackAtlases(serializedIcons: dict):
+    """
+    Replaces the DataFile_Ribbon.AtlasPixmaps in serializedIcons by PNG data of their own.
+    Used when an existing data file with atlases is written without atlases.
+
+    Args:
+        serializedIcons (dict): {section: [[name, iconPixmaps], ...]}
+    """
+    atlasImages = {}
+    for iconItems in serializedIcons.values():
+        for iconItem in iconItems:
+            for wPixmaps in iconItem[1].values():
+                for hPixmaps in wPixmaps.values():
+                    for modePixmaps in hPixmaps.values():
+                        for strState, statePixmap in modePixmaps.items():
+                            if isinstance(statePixmap, DataFile_Ribbon.AtlasPixmap):
+                                modePixmaps[strState] = imageToBytes(
+                                    pixmapToImage(statePixmap, atlasImages)
+                                )
+    return
+
+
+# endregion
@@ -522,7 +522,12 @@ def ReturnXML_Value_Git(
     attribKey: str = "",
     attribValue: str = "",
     host="https://codeberg.org",
+    url: str = "",
+    timeout: float = None,
 ):
+    """Returns the value of an element in an xml file from the repository.
+    A different url (e.g. a local server) can be given with "url".
+    With a timeout in seconds, the request stops when the server does not respond in time."""
     # import requests_local as requests
     import xml.etree.ElementTree as ET
     from urllib import request
@@ -532,13 +537,17 @@ def ReturnXML_Value_Git(
         # Passing the path of the
         # xml document to enable the
         # parsing process
-        url = f"{host}/{User}/{Repository}/{Branch}/{File}"
-        if host == "https://codeberg.org":
-           url = f"{host}/{User}/{Repository}/src/branch/{Branch}/{File}" 
-        if host == "https://github.com":
-            url = f"{host}/{User}/{Repository}/blob/{Branch}/{File}" 
-        url = "https://raw.githubusercontent.com/APEbbers/FreeCAD-Ribbon/refs/heads/main/package.xml"
-        response = request.urlopen(url)
+        if url == "":
+            url = f"{host}/{User}/{Repository}/{Branch}/{File}"
+            if host == "https://codeberg.org":
+               url = f"{host}/{User}/{Repository}/src/branch/{Branch}/{File}" 
+            if host == "https://github.com":
+                url = f"{host}/{User}/{Repository}/blob/{Branch}/{File}" 
+            url = "https://raw.githubusercontent.com/APEbbers/FreeCAD-Ribbon/refs/heads/main/package.xml"
+        if timeout is None:
+            response = request.urlopen(url)
+        else:
+            response = request.urlopen(url, timeout=timeout)
         data = response.read()
         root: Element[str] = ET.fromstring(data)
         result = ""
@@ -893,8 +902,7 @@ def addMissingCommands(CommandList: list):
 
 
 def returnQiCons_Commands(CommandName, pixmap=""):
-    from PySide.QtGui import QIcon, QAction
-    from PySide.QtWidgets import QToolButton, QMenu
+    from PySide.QtGui import QIcon
 
     try:
         if len(CommandName.split(", ")) > 1:
@@ -942,20 +950,88 @@ def returnQiCons_Commands(CommandName, pixmap=""):
         
     if icon is None or (icon is not None and icon.isNull()):
         try:
-            Menus = mw.findChildren(QToolButton)
-            for i in range(len(Menus)):
-                action = Menus[i].defaultAction()
-                if action is None:
-                    action = Menus[i].actions()[0]
-                if action.data() == CommandName:
-                    icon = Menus[i].icon()
-                    if icon is not None and icon.isNull() is False:
-                        return icon
+            action = ReturnIndexedAction(CommandName)
+            if action is not None:
+                icon = action.icon()
+                if icon is not None and icon.isNull() is False:
+                    return icon
         except Exception:
             pass
     return icon
 
 
+# region - Action index
+# Index from the data or objectName of the actions on the toolbuttons to the action.
+# Used as the last fallback for command icons. It is built on the first lookup and
+# rebuilt on the first lookup after a workbench is activated (new toolbars can be added then).
+# After that, a lookup is a dict lookup instead of a scan of all toolbuttons of the main window.
+ActionIndex = {}
+ActionIndexIsValid = False
+ActionIndexConnected = False
+
+
+def InvalidateActionIndex(*args):
+    """Marks the action index as outdated. It is rebuilt on the next lookup."""
+    global ActionIndexIsValid
+    ActionIndexIsValid = False
+    return
+
+
+def BuildActionIndex():
+    """Scans the toolbuttons of the main window once and fills the action index."""
+    from PySide.QtWidgets import QToolButton
+
+    global ActionIndexIsValid, ActionIndexConnected
+
+    # Keep the index up to date when a workbench is activated
+    if ActionIndexConnected is False:
+        try:
+            mw.workbenchActivated.connect(InvalidateActionIndex)
+            ActionIndexConnected = True
+        except Exception:
+            pass
+
+    ActionIndex.clear()
+    for Button in mw.findChildren(QToolButton):
+        action = Button.defaultAction()
+        if action is None:
+            actions = Button.actions()
+            if len(actions) == 0:
+                continue
+            action = actions[0]
+        # The data is the command name. The first toolbutton with that data wins,
+        # like the scan that is replaced by this index
+        Data = action.data()
+        if isinstance(Data, str) and Data != "" and Data not in ActionIndex:
+            ActionIndex[Data] = action
+    # Add the object names that are not present as data
+    for action in list(ActionIndex.values()):
+        Name = action.objectName()
+        if Name != "" and Name not in ActionIndex:
+            ActionIndex[Name] = action
+    ActionIndexIsValid = True
+    return
+
+
+def ReturnIndexedAction(CommandName: str):
+    """Returns the action on a toolbutton for the command name, or None if there is none."""
+    if ActionIndexIsValid is False:
+        BuildActionIndex()
+    action = ActionIndex.get(CommandName)
+    if action is None:
+        return None
+    try:
+        # Raises a RuntimeError when the action is deleted
+        action.objectName()
+    except RuntimeError:
+        del ActionIndex[CommandName]
+        return None
+    return action
+
+
+# endregion
+
+
 def CorrectGetToolbarItems(ToolbarItems: dict):
     newCommands = []
 
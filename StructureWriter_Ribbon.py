@@ -0,0 +1,154 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Write-behind persistence for "RibbonStructure.json".
+#
+# Changes to the ribbon structure are marked as dirty. The file is written once when no new changes
+# are marked within a short delay, when a flush is requested or when FreeCAD is closed.
+# The file is first written to a temporary file, which then replaces the original file.
+import os
+import json
+import atexit
+
+from PySide.QtCore import QObject, QTimer, QCoreApplication
+
+from Parameters_Ribbon import Parameters
+import Standard_Functions_Ribbon as StandardFunctions
+
+# The time in ms to wait for new changes before the file is written
+DEBOUNCE_TIME = 500
+
+
+class RibbonStructureWriter(QObject):
+    """Owns the writing of the ribbon structure to its json file."""
+
+    def __init__(self, Delay: int = DEBOUNCE_TIME):
+        super().__init__()
+        self.Structure = None
+        self.FileName = ""
+        # The number of requested writes and the number of writes done on disk
+        self.Requests = 0
+        self.Writes = 0
+
+        self.Timer = QTimer(self)
+        self.Timer.setSingleShot(True)
+        self.Timer.setInterval(Delay)
+        self.Timer.timeout.connect(self.Flush)
+        return
+
+    def IsDirty(self) -> bool:
+        return self.Structure is not None
+
+    def SavedWrites(self) -> int:
+        """Returns the number of writes that were combined with a later write."""
+        return self.Requests - self.Writes
+
+    def MarkDirty(self, Structure: dict, FileName: str = ""):
+        """Marks the structure as changed. It is written after a short delay.
+
+        Args:
+            Structure (dict): the ribbon structure to write.
+            FileName (str, optional): the json file. Defaults to Parameters.RIBBON_STRUCTURE_JSON.
+        """
+        self.Requests = self.Requests + 1
+        self.Structure = Structure
+        self.FileName = FileName
+        # Restart the timer, so that quick changes are written once
+        self.Timer.start()
+        return
+
+    def WriteNow(self, Structure: dict, FileName: str = ""):
+        """Writes the structure immediately. A pending change is replaced by this structure."""
+        self.MarkDirty(Structure, FileName)
+        self.Flush()
+        return
+
+    def Flush(self) -> bool:
+        """Writes the pending change to disk, if any.
+
+        Returns:
+            bool: True if the file is written.
+        """
+        self.Timer.stop()
+        if self.Structure is None:
+            return False
+
+        FileName = self.FileName
+        if FileName == "":
+            FileName = Parameters.RIBBON_STRUCTURE_JSON
+        Structure = self.Structure
+        self.Structure = None
+
+        # Write to a temporary file first, so that the json file is never left half written
+        TempFile = FileName + ".tmp"
+        try:
+            with open(TempFile, "w") as outfile:
+                json.dump(Structure, outfile, indent=4)
+            os.replace(TempFile, FileName)
+        except Exception as e:
+            StandardFunctions.Print(f"Ribbon UI: failed to write {FileName}: {e}", "Error")
+            try:
+                os.remove(TempFile)
+            except OSError:
+                pass
+            return False
+
+        self.Writes = self.Writes + 1
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(
+                f"Ribbon UI: ribbon structure written ({self.Writes} writes, {self.SavedWrites()} writes saved)",
+                "Log",
+            )
+        return True
+
+
+# The writer that is used for the ribbon structure
+Writer = RibbonStructureWriter()
+
+# Make sure that pending changes are written when FreeCAD is closed
+if QCoreApplication.instance() is not None:
+    QCoreApplication.instance().aboutToQuit.connect(Writer.Flush)
+
+
+def _FlushOnExit():
+    try:
+        Writer.Flush()
+    except RuntimeError:
+        # The timer is already deleted by Qt
+        pass
+
+
+atexit.register(_FlushOnExit)
+
+
+def MarkDirty(Structure: dict, FileName: str = ""):
+    Writer.MarkDirty(Structure, FileName)
+    return
+
+
+def WriteNow(Structure: dict, FileName: str = ""):
+    Writer.WriteNow(Structure, FileName)
+    return
+
+
+def Flush() -> bool:
+    return Writer.Flush()
@@ -22,6 +22,8 @@
 import FreeCAD as App
 import FreeCADGui as Gui
 import os
+import json
+from string import Template
 from PySide.QtGui import QIcon, QPixmap, QAction, QColor
 from PySide.QtWidgets import (
     QListWidgetItem,
@@ -40,6 +42,7 @@ from PySide.QtCore import Qt, SIGNAL, Signal, QObject, QThread
 import sys
 import Standard_Functions_Ribbon as StandardFunctions
 from Parameters_Ribbon import Parameters
+import RasterCache_Ribbon
 
 # Get the resources
 ConfigDirectory = Parameters.CONFIG_DIR
@@ -77,9 +80,111 @@ def GetColorSetting(settingName: str) -> object:
 
         return result
 
-def DarkMode():
+# region - Theme index
+#
+# The preference packs of the installed add-ons are read once and stored as: stylesheet name (lower case) -> dark theme.
+# The index is rebuild when the folders or package.xml files in the Mod directory change.
+ThemeIndexVersion = "1.0"
+THEME_INDEX_FILE = os.path.join(ConfigDirectory, "RibbonThemeIndex.json")
+MOD_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ReturnThemeIndexKey(ModDirectory: str = MOD_DIRECTORY) -> dict:
+    """Returns the add-on folders with the modification time of the folder and its package.xml."""
+    Folders = []
+    try:
+        for entry in sorted(os.scandir(ModDirectory), key=lambda x: x.name):
+            if entry.is_dir() is False:
+                continue
+            PackageTime = 0
+            try:
+                PackageTime = os.stat(os.path.join(entry.path, "package.xml")).st_mtime_ns
+            except OSError:
+                pass
+            Folders.append([entry.name, entry.stat().st_mtime_ns, PackageTime])
+    except OSError:
+        pass
+    return {
+        "indexVersion": ThemeIndexVersion,
+        "modDirectory": ModDirectory,
+        "folders": Folders,
+    }
+
+
+def ReadPreferencePacks(packageXML: str, Themes: dict):
+    """Adds the stylesheets of the preference packs in a package.xml to Themes, if the pack is marked dark or light."""
     import xml.etree.ElementTree as ET
-    import os
+
+    # Get the tree and root of the xml file
+    tree = ET.parse(packageXML)
+    treeRoot = tree.getroot()
+    namespaces = {"i": "https://wiki.freecad.org/Package_Metadata"}
+    pack = treeRoot.findall(".//i:content/i:preferencepack", namespaces)
+
+    for element in pack:
+        # The first "dark" or "light" value of the pack applies to all its entries
+        IsDark = None
+        for child in element.iter():
+            if child.text is not None and child.text.lower() in ["dark", "light"]:
+                IsDark = child.text.lower() == "dark"
+                break
+        if IsDark is None:
+            continue
+        for child in element.iter():
+            if child.text is not None and child.text.strip() != "":
+                Themes.setdefault(child.text.lower(), IsDark)
+    return
+
+
+def BuildThemeIndex(Key: dict = None) -> dict:
+    """Reads the package.xml of every add-on, writes the index file and returns the index."""
+    if Key is None:
+        Key = ReturnThemeIndexKey()
+    Themes = {}
+    for Folder in Key["folders"]:
+        if Folder[2] == 0:
+            continue
+        packageXML = os.path.join(Key["modDirectory"], Folder[0], "package.xml")
+        try:
+            ReadPreferencePacks(packageXML, Themes)
+        except Exception:
+            pass
+
+    Data = {}
+    Data["key"] = Key
+    Data["themes"] = Themes
+    try:
+        if os.path.isdir(os.path.dirname(THEME_INDEX_FILE)) is False:
+            os.makedirs(os.path.dirname(THEME_INDEX_FILE))
+        with open(THEME_INDEX_FILE, "w") as outfile:
+            json.dump(Data, outfile)
+        outfile.close()
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"Ribbon UI: Theme index not written. {e}", "Warning")
+    return Themes
+
+
+def LoadThemeIndex() -> dict:
+    """Loads the stored index. If it is missing or the add-ons have changed, it is rebuild."""
+    Key = ReturnThemeIndexKey()
+    if os.path.exists(THEME_INDEX_FILE) is True:
+        try:
+            Data = {}
+            with open(THEME_INDEX_FILE, "r") as file:
+                Data.update(json.load(file))
+            file.close()
+            if Data["key"] == Key:
+                return Data["themes"]
+        except Exception:
+            pass
+    return BuildThemeIndex(Key)
+
+
+# endregion
+
+
+def DarkMode():
 
     # Define the standard result
     IsDarkTheme = False
@@ -108,47 +213,12 @@ def DarkMode():
     if "OpenDark.qss" in currentStyleSheet:
         return True
 
-    path = os.path.dirname(__file__)
-    # Get the folder with add-ons
-    for i in range(1):
-        # Starting point
-        path = os.path.dirname(path)
-
-    # Go through the sub-folders
-    for root, dirs, files in os.walk(path):
-        for name in dirs:
-            # # if the current stylesheet matches a sub directory, try to get the package.xml
-            packageXML = os.path.join(path, name, "package.xml")
-            try:
-                
-                if os.path.exists(packageXML):
-
-                    # Get the tree and root of the xml file
-                    tree = ET.parse(packageXML)
-                    treeRoot = tree.getroot()
-                    namespaces = {"i": "https://wiki.freecad.org/Package_Metadata"}
-                    pack =  treeRoot.findall(
-                        ".//i:content/i:preferencepack", namespaces
-                    )
-
-                    for element in pack:
-                        for child in element.iter():
-                            if child.text.lower() == currentStyleSheet.lower():
-                                for child2 in element.iter():
-                                    if child2.text.lower() == "dark":
-                                        if Parameters.DEBUG_MODE:
-                                            print(f"{child2.text} theme detected for: {child.text}")
-                                        return True
-                                    if child2.text.lower() == "light":
-                                        if Parameters.DEBUG_MODE:
-                                            print(f"{child2.text} theme detected for: {child.text}")
-                                        return False
-
-
-            except Exception as e:
-                if not os.path.isfile(packageXML):
-                    if "dark" in currentStyleSheet.lower():
-                        IsDarkTheme = True
+    # Look up the stylesheet in the preference packs of the installed add-ons
+    ThemeIndex = LoadThemeIndex()
+    if currentStyleSheet.lower() in ThemeIndex:
+        IsDarkTheme = ThemeIndex[currentStyleSheet.lower()]
+        if Parameters.DEBUG_MODE:
+            print(f"{'dark' if IsDarkTheme else 'light'} theme detected for: {currentStyleSheet}")
 
     return IsDarkTheme
 
@@ -156,6 +226,61 @@ def DarkMode():
 darkMode = DarkMode()
 
 
+# region - Theme cache
+#
+# The results of ReturnStyleItem and ReturnStyleSheet depend only on the FreeCAD stylesheet and a few settings.
+# They are stored per state and the cache is cleared when the state changes.
+# StyleMapping and the custom colors are read once at startup (changing them needs a restart),
+# so they are not part of the state.
+# The FreeCAD stylesheet is read again only when FreeCAD reports a change of it.
+StyleCache = {"State": None, "Items": {}, "StyleSheets": {}}
+CurrentStyleSheet = {"Name": None}
+
+
+class StyleSheetObserver:
+    """Observer for the main window preferences. Attached with ParameterGrp.Attach."""
+
+    def OnChange(self, grp, reason):
+        if reason == "StyleSheet":
+            CurrentStyleSheet["Name"] = None
+        return
+
+
+MainWindowPreferences = App.ParamGet("User parameter:BaseApp/Preferences/MainWindow")
+Observer = StyleSheetObserver()
+try:
+    MainWindowPreferences.Attach(Observer)
+except Exception:
+    Observer = None
+
+
+def ReturnCurrentStyleSheet() -> str:
+    """Returns the name of the stylesheet of FreeCAD."""
+    if CurrentStyleSheet["Name"] is None or Observer is None:
+        CurrentStyleSheet["Name"] = MainWindowPreferences.GetString("StyleSheet")
+    return CurrentStyleSheet["Name"]
+
+
+def ReturnStyleCache() -> dict:
+    """Returns the cache for the current state. The cache is cleared when the state has changed."""
+    State = (
+        ReturnCurrentStyleSheet(),
+        Parameters.CUSTOM_ICONS_ENABLED,
+        Parameters.CUSTOM_COLORS_ENABLED,
+        Parameters.BUTTON_BACKGROUND_ENABLED,
+        Parameters.USE_OVERLAY,
+        Parameters.BORDER_TRANSPARANT,
+    )
+    if StyleCache["State"] != State:
+        StyleCache["State"] = State
+        StyleCache["Items"].clear()
+        StyleCache["StyleSheets"].clear()
+    return StyleCache
+
+
+# endregion
+
+
 def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
     """
     Enter one of the names below:
@@ -177,12 +302,30 @@ def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
         "PinButton_closed" returns QIcon,
         "TitleBarButtons": returns list with icons,
     """
+    # Return the stored result if there is one. Icons are returned as a copy
+    Items = ReturnStyleCache()["Items"]
+    Key = (ControlName, ShowCustomIcon, IgnoreOverlay)
+    if Key in Items:
+        result = Items[Key]
+        if isinstance(result, QIcon):
+            return QIcon(result)
+        return result
+
+    result = ReturnStyleItem_Resolve(ControlName, ShowCustomIcon, IgnoreOverlay)
+    if result is not None:
+        Items[Key] = result
+        if isinstance(result, QIcon):
+            return QIcon(result)
+    return result
+
+
+def ReturnStyleItem_Resolve(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
+    """Returns the value for ReturnStyleItem without using the cache."""
     # define a result holder and a dict for the StyleMapping file
     result = "none"
 
     # Get the current stylesheet for FreeCAD
-    FreeCAD_preferences = App.ParamGet("User parameter:BaseApp/Preferences/MainWindow")
-    currentStyleSheet = FreeCAD_preferences.GetString("StyleSheet")
+    currentStyleSheet = ReturnCurrentStyleSheet()
     # if currentStyleSheet == "FreeCAD.qss":
     #     Theme = FreeCAD_preferences.GetString("Theme")
     #     if str("FreeCAD Light").lower() in Theme.lower():
@@ -192,12 +335,7 @@ def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
     
     # currentStyleSheet = "FreeCAD.qss"
     
-    IsInList = False
-    for key, value in StyleMapping_default["Stylesheets"].items():
-        if key == currentStyleSheet:
-            IsInList = True
-            break
-    if IsInList is False:
+    if currentStyleSheet not in StyleMapping_default["Stylesheets"]:
         currentStyleSheet = "none"
 
     ListIcons = [
@@ -231,10 +369,13 @@ def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
                 ]
                 if PixmapName == "" or PixmapName is None:
                     PixmapName = StyleMapping_default["Stylesheets"][""][ControlName]
-            if os.path.exists(PixmapName):
-                pixmap = QPixmap(PixmapName)
-            else:
-                pixmap = QPixmap(os.path.join(pathIcons, PixmapName))
+            if os.path.exists(PixmapName) is False:
+                PixmapName = os.path.join(pathIcons, PixmapName)
+            # Rendered SVG files are taken from the raster cache
+            pixmap = RasterCache_Ribbon.ReturnPixmap(
+                RasterCache_Ribbon.ReturnSourceKey_File(PixmapName),
+                lambda: QPixmap(PixmapName),
+            )
             result = QIcon()
             result.addPixmap(pixmap)
             return result
@@ -262,6 +403,81 @@ def ReturnStyleItem(ControlName, ShowCustomIcon=False, IgnoreOverlay=False):
         return None
 
 
+# The stylesheets for ReturnStyleSheet
+StyleSheetTemplates = {
+    "toolbutton": Template(
+        """QLayout {spacing: 0px}"""
+        + """QToolButton, QLabel {
+                        margin: 0px;
+                        padding: 0px;
+                        color: $FontColor;background: $BackgroundColor"""
+        + """;padding-left: $padding_left;padding-top: $padding_top"""
+        + """;padding-bottom: $padding_bottom;padding-right: $padding_right;spacing: 0px;}"""
+        + """QToolButton::menu-button {
+                        top: 0px;
+                        right: 0px;
+                        margin: 0px;
+                        padding: 0px;
+                        width: $width;
+                        border-radius: ${radius}px;"""
+        + """padding: 0px;
+                        subcontrol-origin: padding;
+                        subcontrol-position: center right;
+                    }"""
+        + """QToolButton:hover, QLabel:hover {
+                        margin: 0px;
+                        padding: 0px;"""
+        + """;background: $HoverColor;padding-left: $padding_left;padding-top: $padding_top"""
+        + """;padding-bottom: $padding_bottom;padding-right: $padding_right;border: 0.5px solid$BorderColor;}"""
+        + "QToolButton:disabled, QLabel:disabled {background-color: $BackgroundColor;border: 0.5px solid$BorderColor;}"
+    ),
+    "applicationbutton": Template(
+        """QToolButton {
+                        border-radius : $radius;padding-left: $padding_left;padding-top: $padding_top"""
+        + """;padding-bottom: $padding_bottom;padding-right: $padding_right"""
+        + """;background-color: $ApplicationButton;border: 0.5px solid$BorderColor;color: $FontColor;}"""
+        + """QToolButton:hover { border: 2px solid$BorderColor;border-radius : $radius;}"""
+        + """\n\nQToolTip {
+                    background-color: #FFFFE1;
+                    color: black;
+                    border: black solid 1px;
+                    border-radius: 2px;
+                    }"""
+    ),
+    "dragindicator": Template(
+        """QLabel {
+                        background-color: $HoverColor;border-radius: ${radius}px;;}"""
+    ),
+    # Highlight for the parts of a custom button, set with the dynamic property "Hover".
+    # The value sets the rounded corners: Full, Top, Bottom, Left or Right.
+    "hover": Template(
+        """QToolButton[Hover="Full"], QLabel[Hover="Full"] {
+                        border-top-left-radius: 2px;border-bottom-left-radius: 2px;
+                        border-top-right-radius: 2px;border-bottom-right-radius: 2px;}"""
+        + """QToolButton[Hover="Top"], QLabel[Hover="Top"] {
+                        border-top-left-radius: 2px;border-bottom-left-radius: 0px;
+                        border-top-right-radius: 2px;border-bottom-right-radius: 0px;}"""
+        + """QToolButton[Hover="Bottom"], QLabel[Hover="Bottom"] {
+                        border-top-left-radius: 0px;border-bottom-left-radius: 2px;
+                        border-top-right-radius: 0px;border-bottom-right-radius: 2px;}"""
+        + """QToolButton[Hover="Left"], QLabel[Hover="Left"] {
+                        border-top-left-radius: 2px;border-bottom-left-radius: 2px;
+                        border-top-right-radius: 0px;border-bottom-right-radius: 0px;}"""
+        + """QToolButton[Hover="Right"], QLabel[Hover="Right"] {
+                        border-top-left-radius: 0px;border-bottom-left-radius: 0px;
+                        border-top-right-radius: 2px;border-bottom-right-radius: 2px;}"""
+        + """QToolButton[Hover="Full"], QLabel[Hover="Full"], QToolButton[Hover="Top"], QLabel[Hover="Top"],
+                    QToolButton[Hover="Bottom"], QLabel[Hover="Bottom"], QToolButton[Hover="Left"], QLabel[Hover="Left"],
+                    QToolButton[Hover="Right"], QLabel[Hover="Right"] {
+                        background-color: $HoverColor;
+                        border: none;
+                        margin: 0px;
+                        spacing: 0px;
+                        padding: 0px;}"""
+    ),
+}
+
+
 def ReturnStyleSheet(
     control,
     radius="2px",
@@ -279,9 +495,16 @@ def ReturnStyleSheet(
         toolbutton,
         applicationbutton,
         DragIndicator,
+        hover (use HoverColor for the highlight color),
     """
     StyleSheet = ""
     try:
+        # Return the stored stylesheet if there is one
+        StyleSheets = ReturnStyleCache()["StyleSheets"]
+        Key = (control.lower(), radius, padding_left, padding_top, padding_right, padding_bottom, width, HoverColor)
+        if Key in StyleSheets:
+            return StyleSheets[Key]
+
         BorderColor = ReturnStyleItem("Border_Color")
         BackgroundColor = ReturnStyleItem("Background_Color")
         ApplicationButton = ReturnStyleItem("ApplicationButton_Background")
@@ -289,114 +512,25 @@ def ReturnStyleSheet(
             HoverColor = ReturnStyleItem("Background_Color_Hover")
         FontColor = ReturnStyleItem("FontColor")
 
-        AppColor_1 = ApplicationButton
-        AppColor_2 = ApplicationButton
-        AppColor_3 = ApplicationButton
-        AppBorder_1 = BorderColor
-        AppBorder_2 = BorderColor
         if BackgroundColor is not None and BorderColor is not None:
             if control.lower() == "toolbutton":
                 if Parameters.BORDER_TRANSPARANT is True:
                     BorderColor = BackgroundColor
-                StyleSheet = (
-                    """QLayout {spacing: 0px}"""
-                    + """QToolButton, QLabel {
-                        margin: 0px;
-                        padding: 0px;
-                        color: """
-                    + FontColor
-                    + """;background: """
-                    + BackgroundColor
-                    + """;padding-left: """
-                    + padding_left
-                    + """;padding-top: """
-                    + padding_top
-                    + """;padding-bottom: """
-                    + padding_bottom
-                    + """;padding-right: """
-                    + padding_right
-                    + """;spacing: 0px;}"""
-                    + """QToolButton::menu-button {
-                        top: 0px;
-                        right: 0px;
-                        margin: 0px;
-                        padding: 0px;
-                        width: """
-                    + width
-                    + """;
-                        border-radius: """
-                    + radius
-                    + """px;"""
-                    + """padding: 0px;
-                        subcontrol-origin: padding;
-                        subcontrol-position: center right;
-                    }"""
-                    + """QToolButton:hover, QLabel:hover {
-                        margin: 0px;
-                        padding: 0px;"""
-                    + """;background: """
-                    + HoverColor
-                    + """;padding-left: """
-                    + padding_left
-                    + """;padding-top: """
-                    + padding_top
-                    + """;padding-bottom: """
-                    + padding_bottom
-                    + """;padding-right: """
-                    + padding_right
-                    + """;border: 0.5px solid"""
-                    + BorderColor
-                    + """;}"""
-                    + "QToolButton:disabled, QLabel:disabled {background-color: "
-                        + ReturnStyleItem("Background_Color")
-                        + ";border: 0.5px solid"
-                        + BorderColor
-                        + ";}"
-                )
-                return StyleSheet
-            if control.lower() == "applicationbutton":
-                StyleSheet = (
-                    """QToolButton {
-                        border-radius : """
-                    + radius
-                    + """;padding-left: """
-                    + padding_left
-                    + """;padding-top: """
-                    + padding_top
-                    + """;padding-bottom: """
-                    + padding_bottom
-                    + """;padding-right: """
-                    + padding_right
-                    + """;background-color: """
-                    + AppColor_1
-                    + """;border: 0.5px solid"""
-                    + BorderColor
-                     + """;color: """
-                    + FontColor
-                    + """;}"""
-                    + """QToolButton:hover { """
-                    + """border: 2px solid"""
-                    + BorderColor
-                    + """;border-radius : """
-                    + radius
-                    + """;}"""
-                    + """\n\nQToolTip {
-                    background-color: #FFFFE1;
-                    color: black;
-                    border: black solid 1px;
-                    border-radius: 2px;
-                    }"""
-                )
-            if control.lower() == "dragindicator":
-                StyleSheet = (
-                    """QLabel {
-                        background-color: """
-                    + HoverColor
-                    + """;border-radius: """
-                    + radius
-                    + """px;"""
-                    + """;}"""
+            if control.lower() in StyleSheetTemplates:
+                StyleSheet = StyleSheetTemplates[control.lower()].substitute(
+                    radius=radius,
+                    padding_left=padding_left,
+                    padding_top=padding_top,
+                    padding_right=padding_right,
+                    padding_bottom=padding_bottom,
+                    width=width,
+                    HoverColor=HoverColor,
+                    BorderColor=BorderColor,
+                    BackgroundColor=BackgroundColor,
+                    ApplicationButton=ApplicationButton,
+                    FontColor=FontColor,
                 )
+            StyleSheets[Key] = StyleSheet
             return StyleSheet
     except Exception as e:
         print(e)
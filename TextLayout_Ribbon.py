@@ -0,0 +1,144 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Text layout for the labels of the ribbon buttons.
+#
+# The buttons are created again every time the ribbon is rebuilt, mostly with the same texts and fonts.
+# The wrapped or elided lines and their widths are therefore stored in a small cache.
+# Only the most recently used layouts are kept.
+import typing
+from collections import OrderedDict
+
+from PySide.QtGui import QFont, QFontMetrics
+
+import Standard_Functions_Ribbon as StandardFunctions
+
+# The maximum number of text layouts to keep
+TEXT_LAYOUT_CACHE_SIZE = 1024
+
+
+class TextLayout(typing.NamedTuple):
+    # The text per line
+    Lines: tuple
+    # The width in pixels per line, measured with tightBoundingRect
+    Widths: tuple
+    # The width in pixels per line, measured with boundingRect
+    BoundingWidths: tuple
+    # True if the text was cut off or wrapped
+    Changed: bool
+
+
+TextLayoutCache = OrderedDict()
+# Counters for checking the cache
+CacheHits = 0
+CacheMisses = 0
+
+
+def ReturnTextLayout(
+    Text: str, Font: QFont, MaxWidth: int, MaxLines: int = 0, WordWrap: bool = True
+) -> TextLayout:
+    """Returns the lines of a text that fits in the given width.
+
+    Args:
+        Text (str): the text to layout.
+        Font (QFont): the font used to display the text.
+        MaxWidth (int): the maximum width of a line in pixels.
+        MaxLines (int, optional): the maximum number of lines. 0 means no limit. Defaults to 0.
+        WordWrap (bool, optional): True to wrap the text, False to elide it with "...". Defaults to True.
+
+    Returns:
+        TextLayout: the lines and their widths.
+    """
+    global CacheHits, CacheMisses
+
+    Key = (Text, Font.key(), int(MaxWidth), MaxLines, WordWrap)
+    Layout = TextLayoutCache.get(Key)
+    if Layout is not None:
+        CacheHits = CacheHits + 1
+        TextLayoutCache.move_to_end(Key)
+        return Layout
+
+    CacheMisses = CacheMisses + 1
+    Layout = ReturnTextLayout_Measure(Text, Font, MaxWidth, MaxLines, WordWrap)
+    TextLayoutCache[Key] = Layout
+    if len(TextLayoutCache) > TEXT_LAYOUT_CACHE_SIZE:
+        TextLayoutCache.popitem(last=False)
+    return Layout
+
+
+def ReturnTextLayout_Measure(
+    Text: str, Font: QFont, MaxWidth: int, MaxLines: int = 0, WordWrap: bool = True
+) -> TextLayout:
+    """Does the layout of ReturnTextLayout without the cache."""
+    FontMetrics = QFontMetrics(Font)
+    maxLength = ReturnFittingLength(FontMetrics, Text, MaxWidth)
+
+    if WordWrap is False:
+        Lines = [Text]
+        Changed = False
+        if maxLength < len(Text):
+            limit = max(maxLength - 3, 0)
+            Lines = [Text[:limit].strip() + "..."]
+            Changed = True
+    else:
+        Lines = StandardFunctions.ReturnWrappedText(
+            Text, max(maxLength, 1), MaxLines, True
+        )
+        if MaxLines > 0:
+            Lines = Lines[:MaxLines]
+        # Keep at least one line, also for a text with only spaces
+        if len(Lines) == 0:
+            Lines = [""]
+        Changed = len(Lines) > 1 or maxLength < len(Text)
+
+    return TextLayout(
+        Lines=tuple(Lines),
+        Widths=tuple(FontMetrics.tightBoundingRect(Line).width() for Line in Lines),
+        BoundingWidths=tuple(FontMetrics.boundingRect(Line).width() for Line in Lines),
+        Changed=Changed,
+    )
+
+
+def ReturnFittingLength(FontMetrics: QFontMetrics, Text: str, MaxWidth: int) -> int:
+    """Returns the number of characters from the start of the text that are narrower than MaxWidth."""
+    if FontMetrics.horizontalAdvance(Text, -1) < MaxWidth:
+        return len(Text)
+
+    # Search for the longest part that still fits. The whole part is measured, so kerning is included
+    Low = 0
+    High = len(Text)
+    while Low < High:
+        Middle = (Low + High + 1) // 2
+        if FontMetrics.horizontalAdvance(Text[:Middle], -1) < MaxWidth:
+            Low = Middle
+        else:
+            High = Middle - 1
+    return Low
+
+
+def ClearTextLayoutCache():
+    global CacheHits, CacheMisses
+
+    TextLayoutCache.clear()
+    CacheHits = 0
+    CacheMisses = 0
+    return
@@ -0,0 +1,156 @@
+# *************************************************************************
+# *                                                                       *
+# * Copyright (c) 2019-2024 Paul Ebbers                                   *
+# *                                                                       *
+# * This program is free software; you can redistribute it and/or modify  *
+# * it under the terms of the GNU Lesser General Public License (LGPL)    *
+# * as published by the Free Software Foundation; either version 3 of     *
+# * the License, or (at your option) any later version.                   *
+# * for detail see the LICENCE text file.                                 *
+# *                                                                       *
+# * This program is distributed in the hope that it will be useful,       *
+# * but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# * GNU Library General Public License for more details.                  *
+# *                                                                       *
+# * You should have received a copy of the GNU Library General Public     *
+# * License along with this program; if not, write to the Free Software   *
+# * Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# * USA                                                                   *
+# *                                                                       *
+# *************************************************************************
+
+# Check for a new version of the Ribbon without blocking the GUI.
+#
+# The latest version is requested in a background thread. The result is stored with a time stamp
+# in "RibbonUpdateCheck.json" in the config directory. As long as the stored result is not older than
+# Parameters.UPDATE_CHECK_INTERVAL (hours), it is used and no request is made.
+import os
+import json
+import time
+import threading
+
+from PySide.QtCore import QObject, Signal
+
+from Parameters_Ribbon import Parameters
+import Standard_Functions_Ribbon as StandardFunctions
+
+CACHE_FILE = os.path.join(Parameters.CONFIG_DIR, "RibbonUpdateCheck.json")
+# The url of the package.xml with the latest version. Empty means the default of ReturnXML_Value_Git
+URL = ""
+
+
+def ReturnCachedVersion(CacheFile: str = CACHE_FILE, Interval: float = None) -> str:
+    """Returns the stored latest version, or None when there is no result or it is too old.
+
+    Args:
+        CacheFile (str, optional): the file with the stored result. Defaults to CACHE_FILE.
+        Interval (float, optional): the time in hours the result is valid. Defaults to Parameters.UPDATE_CHECK_INTERVAL.
+    """
+    if Interval is None:
+        Interval = Parameters.UPDATE_CHECK_INTERVAL
+    try:
+        with open(CacheFile, "r") as file:
+            Data = json.load(file)
+        if time.time() - float(Data["TimeStamp"]) > Interval * 3600:
+            return None
+        return Data["LatestVersion"]
+    except Exception:
+        return None
+
+
+def WriteCachedVersion(LatestVersion: str, CacheFile: str = CACHE_FILE):
+    """Stores the latest version with the current time."""
+    Data = {"LatestVersion": LatestVersion, "TimeStamp": time.time()}
+    try:
+        TempFile = CacheFile + ".tmp"
+        with open(TempFile, "w") as outfile:
+            json.dump(Data, outfile)
+        os.replace(TempFile, CacheFile)
+    except Exception as e:
+        if Parameters.DEBUG_MODE is True:
+            StandardFunctions.Print(f"{e.with_traceback(e.__traceback__)}", "Warning")
+    return
+
+
+def FetchLatestVersion(Url: str = URL, Timeout: float = None) -> str:
+    """Requests the version from the package.xml in the repository. Returns None on failure."""
+    if Timeout is None:
+        Timeout = Parameters.UPDATE_CHECK_TIMEOUT
+    return StandardFunctions.ReturnXML_Value_Git(
+        User="APEbbers",
+        Repository="FreeCAD-Ribbon",
+        Branch="main",
+        File="package.xml",
+        ElementName="version",
+        host="https://github.com",
+        url=Url,
+        timeout=Timeout,
+    )
+
+
+def IsNewerVersion(LatestVersion: str, CurrentVersion: str) -> bool:
+    """Compares two versions like "1.11.3" level by level."""
+    if LatestVersion is None or LatestVersion == "" or CurrentVersion is None:
+        return False
+
+    def VersionArray(Version: str) -> list:
+        Result = []
+        for Level in Version.split("."):
+            Number = ""
+            for Character in Level:
+                if Character.isdigit() is False:
+                    break
+                Number = Number + Character
+            Result.append(int(Number) if Number != "" else 0)
+        return Result
+
+    return VersionArray(LatestVersion) > VersionArray(CurrentVersion)
+
+
+class UpdateChecker(QObject):
+    """Gets the latest version in a background thread.
+    "Finished" is emitted in the GUI thread with the latest version, or an empty string on failure."""
+
+    Finished = Signal(str)
+
+    def __init__(self, Url: str = URL, Timeout: float = None, CacheFile: str = CACHE_FILE):
+        super().__init__()
+        self.Url = Url
+        self.Timeout = Timeout
+        self.CacheFile = CacheFile
+        self.Thread = None
+        # Store the result in the GUI thread
+        self.Finished.connect(self.on_Finished)
+        return
+
+    def Start(self, UseCache: bool = True) -> bool:
+        """Emits the stored result when it is still valid, otherwise starts the request.
+
+        Returns:
+            bool: True if a request is started.
+        """
+        if UseCache is True:
+            LatestVersion = ReturnCachedVersion(self.CacheFile)
+            if LatestVersion is not None:
+                self.Finished.emit(LatestVersion)
+                return False
+        if self.Thread is not None and self.Thread.is_alive():
+            return True
+        self.Thread = threading.Thread(target=self.Run, daemon=True)
+        self.Thread.start()
+        return True
+
+    def Run(self):
+        LatestVersion = FetchLatestVersion(self.Url, self.Timeout)
+        # Signals emitted from another thread are delivered in the thread of the receiver
+        if LatestVersion is None:
+            LatestVersion = ""
+        self.Finished.emit(LatestVersion)
+        return
+
+    def on_Finished(self, LatestVersion: str):
+        if LatestVersion != "" and self.Thread is not None:
+            WriteCachedVersion(LatestVersion, self.CacheFile)
+            self.Thread = None
+        return